@@ -2,38 +2,85 @@
 
 from __future__ import absolute_import, print_function
 from ctypes import CDLL, POINTER, byref, CFUNCTYPE, create_string_buffer
-from ctypes import c_int, c_char_p, c_void_p
-# ~ try:
-	# ~ from time import monotonic
-# ~ except ImportError:
-	# ~ from monotonic import monotonic
+from ctypes import c_int, c_char_p, c_void_p, c_size_t, sizeof
+try:
+	from time import monotonic
+except ImportError:
+	from monotonic import monotonic
 try:
 	from selectors import DefaultSelector, EVENT_READ
 except ImportError:
 	from selectors34 import DefaultSelector, EVENT_READ
+from weakref import WeakValueDictionary
 from .version import __version__
-from .define import Interface
+from .define import Interface, TabletTool
 from .device import Device
 from .constant import LogPriority, ContextType, EventType, DeviceCapability
 from .constant import KeyState, Led, ButtonState, PointerAxis
 from .constant import PointerAxisSource, TabletPadRingAxisSource
 from .constant import TabletPadStripAxisSource, TabletToolType
 from .constant import TabletToolProximityState, TabletToolTipState, SwitchState
+from .constant import TabletToolAxis
 from .constant import Switch, ConfigStatus, TapState, TapButtonMap, DragState
 from .constant import DragLockState, SendEventsMode, AccelProfile, ClickMethod
 from .constant import MiddleEmulationState, ScrollMethod, DwtState
-from .event import PointerEvent, KeyboardEvent, TouchEvent, GestureEvent
+from .constant import OverflowPolicy
+from .event import Event, PointerEvent, KeyboardEvent, TouchEvent
+from .event import GestureEvent
 from .event import TabletToolEvent, TabletPadEvent, SwitchEvent
 from .event import DeviceNotifyEvent
+from .metric import Histogram, Registry
+from .profiler import Profiler, _ProfiledLibrary
+from .log import LogQueue
+from .inventory import DeviceInventory
+from .hotplug import HotplugAggregator
+from .shed import LoadShedder
 
 
 __all__ = ('LibInput', 'LogPriority', 'ContextType', 'EventType',
 	'DeviceCapability', 'KeyState', 'Led', 'ButtonState', 'PointerAxis',
 	'PointerAxisSource', 'TabletPadRingAxisSource', 'TabletPadStripAxisSource',
 	'TabletToolType', 'TabletToolProximityState', 'TabletToolTipState',
+	'TabletToolAxis',
 	'SwitchState', 'Switch', 'ConfigStatus', 'TapState', 'TapButtonMap',
 	'DragState', 'DragLockState', 'SendEventsMode', 'AccelProfile',
-	'ClickMethod', 'MiddleEmulationState', 'ScrollMethod', 'DwtState')
+	'ClickMethod', 'MiddleEmulationState', 'ScrollMethod', 'DwtState',
+	'OverflowPolicy')
+
+
+_timing_stages = ('select', 'dispatch', 'get_event', 'wrap', 'consumer')
+
+
+class _NullMetric(object):
+
+	def record(self, *args):
+
+		pass
+
+	inc = observe = record
+
+
+_null_metric = _NullMetric()
+
+
+def _null_clock():
+
+	return 0
+
+
+# The number of contexts with metrics enabled, wrappers are only tracked
+# while there are any.
+_metric_contexts = [0]
+
+
+def _track_live_objects(delta):
+
+	_metric_contexts[0] += delta
+	if not _metric_contexts[0]:
+		Event._live = TabletTool._live = None
+	elif Event._live is None:
+		Event._live = WeakValueDictionary()
+		TabletTool._live = WeakValueDictionary()
 
 
 class LibInput(object):
@@ -43,8 +90,8 @@ class LibInput(object):
 	"""
 
 	_libc = CDLL('libc.so.6')
-	_libc.vsprintf.argtypes = (c_char_p, c_char_p, c_void_p)
-	_libc.vsprintf.restype = c_int
+	_libc.vsnprintf.argtypes = (c_char_p, c_size_t, c_void_p, c_void_p)
+	_libc.vsnprintf.restype = c_int
 	_libudev = CDLL('libudev.so.1')
 	_libudev.udev_new.argtypes = None
 	_libudev.udev_new.restype = c_void_p
@@ -122,6 +169,16 @@ class LibInput(object):
 			self._li = self._libinput.libinput_path_create_context(
 				byref(self._interface), None)
 		self._log_handler = lambda pr, strn: print(pr.name, ': ', strn)
+		self._timings = None
+		self._latency = None
+		self._metrics = None
+		self._profiler = None
+		self._log_queue = None
+		self._device_names = {}
+		self._inventory = DeviceInventory()
+		self._profiles = None
+		self._hotplug = None
+		self._shedder = None
 		self._set_default_log_handler()
 		if debug:
 			self._libinput.libinput_log_set_priority(
@@ -131,18 +188,27 @@ class LibInput(object):
 
 	def __del__(self):
 
+		if self._metrics is not None:
+			_track_live_objects(-1)
 		while self._libinput.libinput_unref(self._li):
 			pass
 
 	def _set_default_log_handler(self):
 
+		string = create_string_buffer(2048)
+
 		def default_log_handler(li, priority, fmt, args):
 
-			string = create_string_buffer(2048)
-			self._libc.vsprintf(string, fmt, args)
-			self._log_handler(LogPriority(priority), string.value.decode())
+			self._libc.vsnprintf(string, sizeof(string), fmt, args)
+			if self._metrics is not None:
+				self._count_log_message(priority, string.value)
+			if self._log_queue is not None:
+				self._log_queue.put(priority, fmt, string.value)
+			else:
+				self._log_handler(
+					LogPriority(priority), string.value.decode())
 
-		CMPFUNC = CFUNCTYPE(None, c_void_p, c_int, c_char_p, c_void_p)
+		CMPFUNC = CFUNCTYPE(None, c_void_p, c_int, c_void_p, c_void_p)
 		self._default_log_handler = CMPFUNC(default_log_handler)
 		self._libinput.libinput_log_set_handler(
 			self._li, self._default_log_handler)
@@ -155,6 +221,8 @@ class LibInput(object):
 			priority (~libinput.constant.LogPriority): Message priority.
 			message (str): The message.
 		Default handler prints messages to stdout.
+		Use :func:`~libinput.log.logger_handler` to forward messages to
+		:mod:`logging`.
 		"""
 
 		return self._log_handler
@@ -164,6 +232,54 @@ class LibInput(object):
 
 		self._log_handler = handler
 
+	def enable_log_queue(self, enable=True, size=1024, rate=10.0, burst=20):
+		"""Enable or disable deferred delivery of log messages.
+
+		By default :attr:`log_handler` is called from within libinput, in
+		the middle of event dispatching. While the queue is enabled, messages
+		are only formatted and queued there, and are handed to
+		:attr:`log_handler` by :meth:`flush_log`, which :attr:`events` and
+		:meth:`dispatch` call right after ``libinput_dispatch`` and whenever
+		they run out of events. Messages are rate limited per format string,
+		see :class:`~libinput.log.LogQueue`.
+
+		Args:
+			enable (bool): :obj:`True` to queue messages, :obj:`False` to
+				deliver queued messages and go back to immediate delivery.
+			size (int): The maximum number of queued messages.
+			rate (float): Messages per second allowed per format string.
+			burst (int): Messages allowed at once per format string.
+		"""
+
+		if enable:
+			if self._log_queue is None:
+				self._log_queue = LogQueue(size, rate, burst)
+		elif self._log_queue is not None:
+			self.flush_log()
+			self._log_queue = None
+
+	@property
+	def log_queue(self):
+		"""The queue of log messages awaiting delivery.
+
+		Returns:
+			~libinput.log.LogQueue: The queue or :obj:`None` if messages are
+			delivered immediately.
+		"""
+
+		return self._log_queue
+
+	def flush_log(self):
+		"""Hand all queued log messages to :attr:`log_handler`.
+
+		Does nothing if the log queue is disabled.
+		"""
+
+		if self._log_queue is None:
+			return
+		for priority, message in self._log_queue.drain():
+			self._log_handler(priority, message)
+
 	def suspend(self):
 		"""Suspend monitoring for new devices and close existing devices.
 
@@ -189,35 +305,533 @@ class LibInput(object):
 		Yields device events that are subclasses of
 		:class:`~libinput.event.Event`.
 
+		If timings are enabled (see :meth:`enable_timings`), the returned
+		iterator records time spent in each stage of the event pump.
+		If latency tracking is enabled (see :meth:`enable_latency`), the age
+		of every event is recorded as it is delivered. If load shedding is
+		enabled (see :meth:`enable_shedding`), events are shed while the
+		consumer is behind.
+
 		Yields:
 			:class:`~libinput.event.Event`: Device event.
 		"""
 
+		if self._timings is None and self._metrics is None:
+			events = self._events()
+		else:
+			events = self._instrumented_events(self._timings, self._metrics)
+		if self._shedder is not None:
+			events = self._shed_events(events, self._shedder, self._metrics)
+		if self._latency is not None:
+			events = self._measured_events(events, self._latency)
+		return events
+
+	def _events(self):
+
 		while True:
+			if self._log_queue is not None:
+				self.flush_log()
 			self._selector.select()
 			self._libinput.libinput_dispatch(self._li)
+			if self._log_queue is not None:
+				self.flush_log()
 			while True:
 				hevent = self._libinput.libinput_get_event(self._li)
 				if not hevent:
 					break
-				type_ = self._libinput.libinput_event_get_type(hevent)
 				self._libinput.libinput_dispatch(self._li)
-				if type_.is_pointer():
-					yield PointerEvent(hevent, self._libinput)
-				elif type_.is_keyboard():
-					yield KeyboardEvent(hevent, self._libinput)
-				elif type_.is_touch():
-					yield TouchEvent(hevent, self._libinput)
-				elif type_.is_gesture():
-					yield GestureEvent(hevent, self._libinput)
-				elif type_.is_tablet_tool():
-					yield TabletToolEvent(hevent, self._libinput)
-				elif type_.is_tablet_pad():
-					yield TabletPadEvent(hevent, self._libinput)
-				elif type_.is_switch():
-					yield SwitchEvent(hevent, self._libinput)
-				elif type_.is_device():
-					yield DeviceNotifyEvent(hevent, self._libinput)
+				yield self._wrap_event(hevent)
+
+	def _instrumented_events(self, timings, metrics):
+
+		if timings is None:
+			clock = _null_clock
+			select = dispatch = get_event = wrap = consumer = _null_metric
+		else:
+			clock = monotonic
+			select, dispatch, get_event, wrap, consumer = (
+				timings[stage] for stage in _timing_stages)
+		if metrics is None:
+			wakeups = dispatches = per_wakeup = _null_metric
+		else:
+			wakeups = metrics['libinput_wakeups_total']
+			dispatches = metrics['libinput_dispatch_calls_total']
+			per_wakeup = metrics['libinput_events_per_wakeup']
+			by_type = metrics['libinput_events_total']
+			get_device = self._libinput.libinput_event_get_device
+		while True:
+			if self._log_queue is not None:
+				self.flush_log()
+			start = clock()
+			self._selector.select()
+			end = clock()
+			select.record((end - start) * 1e6)
+			wakeups.inc()
+			self._libinput.libinput_dispatch(self._li)
+			dispatches.inc()
+			if self._log_queue is not None:
+				self.flush_log()
+			start = clock()
+			dispatch.record((start - end) * 1e6)
+			count = 0
+			while True:
+				hevent = self._libinput.libinput_get_event(self._li)
+				end = clock()
+				get_event.record((end - start) * 1e6)
+				if not hevent:
+					break
+				self._libinput.libinput_dispatch(self._li)
+				dispatches.inc()
+				start = clock()
+				dispatch.record((start - end) * 1e6)
+				event = self._wrap_event(hevent)
+				end = clock()
+				wrap.record((end - start) * 1e6)
+				if metrics is not None:
+					type_ = event.type
+					by_type.inc((type_.name,
+						self._device_name(get_device(hevent), type_)))
+				count += 1
+				yield event
+				start = clock()
+				consumer.record((start - end) * 1e6)
+			per_wakeup.observe(count)
+
+	def _shed_events(self, events, shedder, metrics):
+
+		for event in events:
+			if event is None:
+				yield event
+				continue
+			for event in self._shed(event, shedder, metrics):
+				yield event
+
+	def _shed(self, event, shedder, metrics):
+
+		counts = shedder.dropped, shedder.coalesced, shedder.lagging
+		ready = shedder.feed(event, self.next_event_type() is not None)
+		if metrics is not None:
+			if counts[0] != shedder.dropped:
+				metrics['libinput_events_dropped_total'].inc(
+					('shed',), shedder.dropped - counts[0])
+			if counts[1] != shedder.coalesced:
+				metrics['libinput_events_coalesced_total'].inc(
+					(), shedder.coalesced - counts[1])
+			if counts[2] != shedder.lagging:
+				metrics['libinput_events_lagging_total'].inc(
+					(), shedder.lagging - counts[2])
+		return ready
+
+	def _measured_events(self, events, latency):
+
+		get_device = self._libinput.libinput_event_get_device
+		for event in events:
+			type_ = event.type
+			name = self._device_name(get_device(event._hevent), type_)
+			if not type_.is_device():
+				age = monotonic() * 1e6 - event.time
+				key = name, type_
+				histogram = latency.get(key)
+				if histogram is None:
+					histogram = latency[key] = Histogram(self._latency_bits)
+				histogram.record(age)
+			yield event
+
+	def _device_name(self, hdevice, type_):
+
+		names = self._device_names
+		if type_ == EventType.DEVICE_REMOVED:
+			name = names.pop(hdevice, None)
+		else:
+			name = names.get(hdevice)
+		if name is None:
+			name = Device(hdevice, self._libinput).sysname
+			if type_ != EventType.DEVICE_REMOVED:
+				names[hdevice] = name
+		return name
+
+	def _wrap_event(self, hevent):
+
+		type_ = self._libinput.libinput_event_get_type(hevent)
+		if type_.is_pointer():
+			return PointerEvent(hevent, self._libinput)
+		elif type_.is_keyboard():
+			return KeyboardEvent(hevent, self._libinput)
+		elif type_.is_touch():
+			return TouchEvent(hevent, self._libinput)
+		elif type_.is_gesture():
+			return GestureEvent(hevent, self._libinput)
+		elif type_.is_tablet_tool():
+			return TabletToolEvent(hevent, self._libinput)
+		elif type_.is_tablet_pad():
+			return TabletPadEvent(hevent, self._libinput)
+		elif type_.is_switch():
+			return SwitchEvent(hevent, self._libinput)
+		elif type_.is_device():
+			event = DeviceNotifyEvent(hevent, self._libinput)
+			self._inventory.feed(event)
+			if self._profiles is not None:
+				self._profiles.feed(event)
+			if self._hotplug is not None:
+				self._hotplug.feed(event)
+			return event
+
+	def enable_timings(self, enable=True, significant_bits=7):
+		"""Enable or disable per-stage timing of :attr:`events`.
+
+		While enabled, every iteration of :attr:`events` records how long
+		was spent, in microseconds, in each of the following stages:
+
+		``select``
+			Waiting for the libinput fd to become readable.
+		``dispatch``
+			Calls to ``libinput_dispatch``.
+		``get_event``
+			Calls to ``libinput_get_event``.
+		``wrap``
+			Construction of the :class:`~libinput.event.Event` wrapper.
+		``consumer``
+			Time the consumer spent between receiving an event and asking
+			for the next one.
+
+		Timings are off by default and cost nothing while disabled.
+		The change takes effect the next time :attr:`events` is accessed,
+		iterators already obtained keep their current behavior.
+
+		Args:
+			enable (bool): :obj:`True` to start recording, :obj:`False` to
+				stop recording and discard collected timings.
+			significant_bits (int): Precision of the histograms,
+				see :class:`~libinput.metric.Histogram`.
+		"""
+
+		if enable:
+			if self._timings is None:
+				self._timings = dict((stage, Histogram(significant_bits))
+					for stage in _timing_stages)
+		else:
+			self._timings = None
+
+	@property
+	def timings(self):
+		"""Per-stage timings of the event pump.
+
+		See :meth:`enable_timings` for the list of stages.
+
+		Returns:
+			dict: A mapping of stage names to
+			:class:`~libinput.metric.Histogram` of durations in microseconds,
+			or :obj:`None` if timings are disabled.
+		"""
+
+		return self._timings
+
+	def enable_latency(self, enable=True, significant_bits=7):
+		"""Enable or disable tracking of end-to-end event latency.
+
+		While enabled, every event yielded by :attr:`events` is aged at
+		the moment it is handed to the consumer, i.e. the current
+		``CLOCK_MONOTONIC`` time minus the event's
+		:attr:`~libinput.event.PointerEvent.time`. Ages are kept per
+		device and per event type, see :attr:`latency`
+		and :meth:`latency_snapshot`.
+
+		Latency tracking is off by default. The change takes effect the next
+		time :attr:`events` is accessed.
+
+		Args:
+			enable (bool): :obj:`True` to start tracking, :obj:`False` to
+				stop tracking and discard collected latencies.
+			significant_bits (int): Precision of the histograms,
+				see :class:`~libinput.metric.Histogram`.
+		"""
+
+		if enable:
+			if self._latency is None:
+				self._latency = {}
+				self._latency_bits = significant_bits
+		else:
+			self._latency = None
+
+	@property
+	def latency(self):
+		"""End-to-end event latency.
+
+		Returns:
+			dict: A mapping of (device sysname,
+			:class:`~libinput.constant.EventType`) tuples to
+			:class:`~libinput.metric.Histogram` of event ages in microseconds,
+			or :obj:`None` if latency tracking is disabled.
+		"""
+
+		return self._latency
+
+	def latency_snapshot(self, percentiles=(50, 99)):
+		"""Summarize end-to-end event latency.
+
+		Args:
+			percentiles (~collections.abc.Iterable): Percentiles to include.
+		Returns:
+			dict: A mapping of device sysnames to mappings of event type names
+			to summaries as returned by
+			:meth:`~libinput.metric.Histogram.snapshot`, or :obj:`None` if
+			latency tracking is disabled.
+		"""
+
+		if self._latency is None:
+			return None
+		snapshot = {}
+		for (name, type_), histogram in self._latency.items():
+			snapshot.setdefault(name, {})[type_.name] = histogram.snapshot(
+				percentiles)
+		return snapshot
+
+	def enable_metrics(self, enable=True):
+		"""Enable or disable the metrics maintained by this context.
+
+		While enabled, the following metrics are kept in :attr:`metrics`:
+
+		``libinput_events_total``
+			Events delivered by :attr:`events`, by type and device sysname.
+		``libinput_events_dropped_total``
+			Events lost, by reason. ``kernel`` counts ``SYN_DROPPED``
+			reported by libinput, ``shed`` the events discarded by
+			:meth:`enable_shedding`.
+		``libinput_events_coalesced_total``
+			Events merged into a later one by :meth:`enable_shedding`.
+		``libinput_events_lagging_total``
+			Sheddable events read while the consumer was behind.
+		``libinput_dispatch_calls_total``
+			Calls to ``libinput_dispatch``.
+		``libinput_wakeups_total``
+			Times the libinput fd became readable.
+		``libinput_events_per_wakeup``
+			Summary of events delivered per wakeup.
+		``libinput_live_objects``
+			Event, device and tablet tool wrappers currently holding
+			a reference to a native object, counted across all contexts
+			of the process. Events and tools are only tracked while
+			metrics are enabled on any context, those created before are
+			not counted.
+		``libinput_log_messages_total``
+			Log messages, by :class:`~libinput.constant.LogPriority`.
+
+		Metrics are off by default. The change takes effect the next time
+		:attr:`events` is accessed.
+
+		Args:
+			enable (bool): :obj:`True` to start collecting, :obj:`False` to
+				stop collecting and discard collected metrics.
+		"""
+
+		if not enable:
+			if self._metrics is not None:
+				_track_live_objects(-1)
+			self._metrics = None
+			return
+		if self._metrics is not None:
+			return
+		_track_live_objects(1)
+		metrics = Registry()
+		metrics.counter('libinput_events_total',
+			'Events delivered to the consumer.', ('type', 'device'))
+		metrics.counter('libinput_events_dropped_total',
+			'Events lost before reaching the consumer.', ('reason',))
+		metrics.counter('libinput_events_coalesced_total',
+			'Events merged into a later event by load shedding.')
+		metrics.counter('libinput_events_lagging_total',
+			'Sheddable events read while the consumer was behind.')
+		metrics.counter('libinput_dispatch_calls_total',
+			'Calls to libinput_dispatch.')
+		metrics.counter('libinput_wakeups_total',
+			'Times the libinput fd became readable.')
+		metrics.summary('libinput_events_per_wakeup',
+			'Events delivered per wakeup.')
+		live = metrics.gauge('libinput_live_objects',
+			'Wrappers holding a reference to a native object.', ('kind',))
+		live.set_function(lambda: len(Event._live or ()), ('event',))
+		live.set_function(
+			lambda: sum(Device._wrappers.values()), ('device',))
+		live.set_function(lambda: len(TabletTool._live or ()), ('tool',))
+		metrics.counter('libinput_log_messages_total',
+			'Log messages emitted by libinput.', ('priority',))
+		self._metrics = metrics
+
+	@property
+	def metrics(self):
+		"""Metrics maintained by this context.
+
+		Use :meth:`~libinput.metric.Registry.render` for the Prometheus text
+		format or :meth:`~libinput.metric.Registry.snapshot` for a dict.
+		See :meth:`enable_metrics` for the list of metrics.
+
+		Returns:
+			~libinput.metric.Registry: The metrics or :obj:`None` if
+			metrics are disabled.
+		"""
+
+		return self._metrics
+
+	def _count_log_message(self, priority, message):
+
+		self._metrics['libinput_log_messages_total'].inc(
+			(LogPriority(priority).name,))
+		if b'SYN_DROPPED' in message:
+			self._metrics['libinput_events_dropped_total'].inc(('kernel',))
+
+	def enable_profiling(self, enable=True):
+		"""Enable or disable counting and timing of foreign calls.
+
+		While enabled, every call into libinput and libudev made by this
+		context, and by events, devices and other objects it creates, is
+		recorded by :attr:`profiler`. Objects obtained before profiling was
+		enabled are not profiled, objects obtained while it was enabled stay
+		profiled.
+
+		Profiling adds considerable overhead to every call and is intended
+		for finding out which accessors dominate a handler.
+
+		Args:
+			enable (bool): :obj:`True` to start profiling, :obj:`False` to
+				stop profiling and discard recorded calls.
+		"""
+
+		if enable:
+			if self._profiler is None:
+				self._profiler = Profiler(type(self)._libinput)
+				self._libinput = _ProfiledLibrary(
+					type(self)._libinput, self._profiler)
+				self._libudev = _ProfiledLibrary(
+					type(self)._libudev, self._profiler)
+		elif self._profiler is not None:
+			del self._libinput
+			del self._libudev
+			self._profiler = None
+
+	@property
+	def profiler(self):
+		"""Foreign call profiler of this context.
+
+		Returns:
+			~libinput.profiler.Profiler: The profiler or :obj:`None` if
+			profiling is disabled.
+		"""
+
+		return self._profiler
+
+	@property
+	def devices(self):
+		"""The devices currently present in this context.
+
+		The inventory is updated as
+		:attr:`~libinput.constant.EventType.DEVICE_ADDED` and
+		:attr:`~libinput.constant.EventType.DEVICE_REMOVED` events are read
+		by :attr:`events` or :meth:`dispatch`.
+
+		Returns:
+			~libinput.inventory.DeviceInventory: The device inventory.
+		"""
+
+		return self._inventory
+
+	@property
+	def profiles(self):
+		"""Configuration profiles applied to devices as they are added.
+
+		While set, every :attr:`~libinput.constant.EventType.DEVICE_ADDED`
+		event read by :attr:`events` or :meth:`dispatch` is passed to
+		:meth:`~libinput.profile.ProfileEngine.feed` before it is returned.
+
+		Returns:
+			~libinput.profile.ProfileEngine: The engine or :obj:`None`.
+		"""
+
+		return self._profiles
+
+	@profiles.setter
+	def profiles(self, engine):
+
+		self._profiles = engine
+
+	def enable_hotplug(self, enable=True, window=0.25, max_delay=2.0):
+		"""Enable or disable aggregation of hotplug bursts.
+
+		While enabled, every
+		:attr:`~libinput.constant.EventType.DEVICE_ADDED` and
+		:attr:`~libinput.constant.EventType.DEVICE_REMOVED` event read by
+		:attr:`events` or :meth:`dispatch` is also fed to :attr:`hotplug`,
+		which collapses bursts of them into one
+		:class:`~libinput.hotplug.HotplugDelta`. Poll it when the timeout it
+		suggests expires, e.g.::
+
+			li.enable_hotplug()
+			selector.register(li, EVENT_READ)
+			while True:
+				if selector.select(li.hotplug.timeout()):
+					handle(li.dispatch())
+				delta = li.hotplug.poll()
+				if delta is not None:
+					reconfigure(delta)
+
+		Args:
+			enable (bool): :obj:`True` to aggregate, :obj:`False` to stop
+				and discard the current burst.
+			window (float): Seconds without device events that end a burst.
+			max_delay (float): Seconds after which a burst is delivered even
+				if events keep arriving.
+		"""
+
+		if enable:
+			if self._hotplug is None:
+				self._hotplug = HotplugAggregator(window, max_delay)
+		else:
+			self._hotplug = None
+
+	@property
+	def hotplug(self):
+		"""The hotplug aggregator of this context.
+
+		Returns:
+			~libinput.hotplug.HotplugAggregator: The aggregator or
+			:obj:`None` if hotplug aggregation is disabled.
+		"""
+
+		return self._hotplug
+
+	def enable_shedding(self, enable=True, max_age=0.05, max_backlog=256):
+		"""Enable or disable load shedding.
+
+		While enabled, events read by :attr:`events` or :meth:`dispatch`
+		pass through :attr:`shedder`, which drops motion and merges scroll
+		events while the consumer is behind, see
+		:class:`~libinput.shed.LoadShedder`. Shed events are counted in
+		:attr:`metrics`. The change takes effect the next time
+		:attr:`events` is accessed.
+
+		Args:
+			enable (bool): :obj:`True` to shed, :obj:`False` to deliver
+				every event.
+			max_age (float): Seconds after which an event is late.
+			max_backlog (int): The number of events read without the queue
+				running empty after which the consumer is behind.
+		"""
+
+		if enable:
+			if self._shedder is None:
+				self._shedder = LoadShedder(max_age, max_backlog)
+		else:
+			self._shedder = None
+
+	@property
+	def shedder(self):
+		"""The load shedder of this context.
+
+		Returns:
+			~libinput.shed.LoadShedder: The shedder or :obj:`None` if load
+			shedding is disabled.
+		"""
+
+		return self._shedder
 
 	def next_event_type(self):
 		"""Return the type of the next event in the internal queue.
@@ -236,6 +850,68 @@ class LibInput(object):
 		else:
 			return EventType(type_)
 
+	def fileno(self):
+		"""Return the file descriptor that becomes readable when events are
+		pending.
+
+		This allows a context to be registered with :mod:`selectors` alongside
+		other file descriptors, call :meth:`dispatch` when it becomes
+		readable.
+
+		Returns:
+			int: A file descriptor.
+		"""
+
+		return self._libinput.libinput_get_fd(self._li)
+
+	def dispatch(self):
+		"""Read pending events without blocking.
+
+		Unlike :attr:`events`, this method does not wait for events and
+		records no timings or latency. Events are shed if load shedding is
+		enabled, see :meth:`enable_shedding`, and shed events are the only
+		ones counted in :attr:`metrics`.
+
+		Returns:
+			list: :class:`~libinput.event.Event` subclasses, oldest first.
+		"""
+
+		events = []
+		shedder = self._shedder
+		self._libinput.libinput_dispatch(self._li)
+		if self._log_queue is not None:
+			self.flush_log()
+		while True:
+			hevent = self._libinput.libinput_get_event(self._li)
+			if not hevent:
+				break
+			event = self._wrap_event(hevent)
+			if shedder is None or event is None:
+				events.append(event)
+			else:
+				events.extend(self._shed(event, shedder, self._metrics))
+		return events
+
+	def dispatch_arrays(self, arrays=None):
+		"""Read pending events without blocking into NumPy structured arrays.
+
+		Requires NumPy, see :class:`~libinput.array.EventArrays`.
+
+		Args:
+			arrays (~libinput.array.EventArrays): The arrays to append to,
+				new arrays are created if :obj:`None`.
+		Returns:
+			~libinput.array.EventArrays: The arrays events were appended to.
+		Raises:
+			ImportError
+		"""
+
+		if arrays is None:
+			from .array import EventArrays
+			arrays = EventArrays()
+		arrays.extend(event for event in self.dispatch() if event is not None)
+		return arrays
+
 
 class LibInputPath(LibInput):
 	"""libinput path context.
@@ -313,6 +989,7 @@ class LibInputUdev(LibInput):
 
 	def __del__(self):
 
+		LibInput.__del__(self)
 		self._libudev.udev_unref(self._udev)
 
 	def assign_seat(self, seat):
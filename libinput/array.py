@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import re
+try:
+	import numpy
+except ImportError:
+	numpy = None
+from .record import Encoder, _families
+
+
+_codes = {'B': 'u1', '?': '?', 'H': 'u2', 'I': 'u4', 'i': 'i4', 'Q': 'u8',
+	'd': 'f8'}
+
+
+def _require_numpy():
+
+	if numpy is None:
+		raise ImportError('NumPy is required for event arrays')
+
+
+def _name(family):
+
+	return re.sub(
+		r'(?<!^)(?=[A-Z])', '_', family.record.__name__[:-len('Record')]
+	).lower()
+
+
+_by_name = dict((_name(family), family) for family in set(_families.values()))
+
+
+def _dtype(family):
+
+	fields = []
+	names = iter(family.record._fields)
+	format_ = family.struct.format
+	# Struct.format is bytes before Python 3.7.
+	if not isinstance(format_, str):
+		format_ = format_.decode('ascii')
+	for count, code in re.findall(r'(\d*)(\D)', format_[1:]):
+		if code == 's':
+			fields.append((next(names), 'S' + count))
+		else:
+			for _ in range(int(count or 1)):
+				fields.append((next(names), '<' + _codes[code]))
+	return numpy.dtype(fields)
+
+
+def dtypes():
+	"""Return the structured dtype of every event family.
+
+	Each dtype has the fields of the corresponding :mod:`libinput.record`
+	record and the same packed memory layout, e.g. ``pointer_motion`` has
+	``type``, ``device``, ``time``, ``dx``, ``dy``, ``dx_unaccelerated``
+	and ``dy_unaccelerated``.
+
+	Returns:
+		dict: A mapping of family names to :class:`numpy.dtype`.
+	Raises:
+		ImportError
+	"""
+
+	_require_numpy()
+	return dict((name, _dtype(family)) for name, family in _by_name.items())
+
+
+class EventArrays(object):
+	"""Collects events into NumPy structured arrays, one per event family.
+
+	Events are packed straight into preallocated arrays, which double in size
+	when full. Arrays are looked up by family name, see :func:`dtypes`::
+
+		arrays = EventArrays()
+		for event in li.events:
+			arrays.append(event)
+			if len(arrays) >= 100000:
+				motion = arrays['pointer_motion']
+				velocity = numpy.hypot(motion['dx'], motion['dy'])
+				arrays.clear()
+
+	Use :meth:`~libinput.LibInput.dispatch_arrays` to collect pending events
+	without blocking.
+	"""
+
+	def __init__(self, capacity=1024, encoder=None):
+		"""Initialize empty arrays.
+
+		Args:
+			capacity (int): The initial number of rows of each array.
+			encoder (~libinput.record.Encoder): The encoder assigning device
+				ids, a new one is created if :obj:`None`.
+		Raises:
+			ImportError
+		"""
+
+		_require_numpy()
+		self._capacity = capacity
+		self._encoder = encoder or Encoder()
+		self._columns = {}
+		self._length = 0
+
+	def _allocate(self, family):
+
+		array = numpy.zeros(self._capacity, _dtype(family))
+		column = self._columns[family] = [array, array.view(numpy.uint8), 0]
+		return column
+
+	def _grow(self, column):
+
+		array = numpy.zeros(len(column[0]) * 2, column[0].dtype)
+		array[:column[2]] = column[0][:column[2]]
+		column[0] = array
+		column[1] = array.view(numpy.uint8)
+
+	def append(self, event):
+		"""Add an event.
+
+		Args:
+			event (~libinput.event.Event): Any event.
+		"""
+
+		type_ = event.type
+		family = _families[type_]
+		column = self._columns.get(family)
+		if column is None:
+			column = self._allocate(family)
+		elif column[2] == len(column[0]):
+			self._grow(column)
+		self._encoder._pack(
+			column[1], column[2] * family.struct.size, event, type_)
+		column[2] += 1
+		self._length += 1
+
+	def extend(self, events):
+		"""Add events.
+
+		Args:
+			events (~collections.abc.Iterable): Any events.
+		"""
+
+		for event in events:
+			self.append(event)
+
+	def __len__(self):
+
+		return self._length
+
+	def __getitem__(self, name):
+		"""Return the collected events of a family.
+
+		Args:
+			name (str): A family name, see :func:`dtypes`.
+		Returns:
+			numpy.ndarray: A view of the filled rows, it does not see events
+			added after it was taken.
+		Raises:
+			KeyError
+		"""
+
+		family = _by_name[name]
+		column = self._columns.get(family)
+		if column is None:
+			return numpy.zeros(0, _dtype(family))
+		return column[0][:column[2]]
+
+	def arrays(self):
+		"""Return the collected events of every family seen so far.
+
+		Returns:
+			dict: A mapping of family names to arrays as returned by
+			``arrays[name]``.
+		"""
+
+		return dict((_name(family), array[:length])
+			for family, (array, _, length) in self._columns.items())
+
+	def clear(self):
+		"""Forget collected events, keeping the allocated arrays.
+
+		Views returned earlier are overwritten by new events, copy them
+		first if they are still needed.
+		"""
+
+		for column in self._columns.values():
+			column[2] = 0
+		self._length = 0
@@ -99,7 +99,8 @@ class EventType(Enum):
 
 		if self in {type(self).POINTER_MOTION, type(self).POINTER_BUTTON,
 			type(self).POINTER_MOTION_ABSOLUTE, type(self).POINTER_AXIS,
-			type(self).POINTER_SCROLL_WHEEL,type(self).POINTER_SCROLL_CONTINUOUS}:
+			type(self).POINTER_SCROLL_WHEEL, type(self).POINTER_SCROLL_FINGER,
+			type(self).POINTER_SCROLL_CONTINUOUS}:
 			return True
 		else:
 			return False
@@ -286,6 +287,24 @@ class TabletToolProximityState(Enum):
 		return self.value
 
 
+class TabletToolAxis(Flag):
+
+	X = (1 << 0)
+	Y = (1 << 1)
+	PRESSURE = (1 << 2)
+	DISTANCE = (1 << 3)
+	TILT_X = (1 << 4)
+	TILT_Y = (1 << 5)
+	ROTATION = (1 << 6)
+	SLIDER = (1 << 7)
+	WHEEL = (1 << 8)
+
+	@classmethod
+	def from_param(cls, self):
+
+		return self.value
+
+
 class TabletToolTipState(Enum):
 
 	UP = 0
@@ -445,3 +464,16 @@ class DwtState(Enum):
 	def from_param(cls, self):
 
 		return self.value
+
+
+class OverflowPolicy(Enum):
+
+	OVERWRITE = 0
+	SKIP = auto()
+	BLOCK = auto()
+	COALESCE = auto()
+
+	@classmethod
+	def from_param(cls, self):
+
+		return self.value
@@ -74,10 +74,16 @@ class TabletTool(object):
 	the hardware supports it.
 	"""
 
+	# Live wrappers by id while metrics are enabled, see
+	# LibInput.enable_metrics.
+	_live = None
+
 	def __init__(self, htablettool, libinput):
 
 		self._handle = htablettool
 		self._libinput = libinput
+		if TabletTool._live is not None:
+			TabletTool._live[id(self)] = self
 
 		self._libinput.libinput_tablet_tool_ref.argtypes = (c_void_p,)
 		self._libinput.libinput_tablet_tool_ref.restype = c_void_p
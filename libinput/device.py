@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 from __future__ import absolute_import
+from collections import namedtuple
 from ctypes import c_void_p, c_char_p, c_uint, c_int, c_bool, c_double
 from ctypes import POINTER, string_at, byref, c_uint32, c_float
 from .constant import Led, DeviceCapability, ConfigStatus, TapState
@@ -8,6 +9,19 @@ from .constant import TapButtonMap, DragState, DragLockState, SendEventsMode
 from .constant import AccelProfile, ClickMethod, MiddleEmulationState
 from .constant import ScrollMethod, DwtState
 from .define import TabletPadModeGroup
+try:
+	from enum import Enum
+except ImportError:
+	from aenum import Enum
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+
+# KEY_MAX from linux/input-event-codes.h, buttons start at BTN_MISC.
+_key_max = 0x2ff
+_btn_misc = 0x100
 
 
 class BaseDevice(object):
@@ -18,6 +32,65 @@ class BaseDevice(object):
 		self._libinput = libinput
 
 
+# Settings covered by DeviceConfig.snapshot, in the order they are applied:
+# (section, property, setter, type of the value).
+_config_settings = (
+	('send_events', 'mode', 'set_mode', SendEventsMode),
+	('calibration', 'matrix', 'set_matrix', None),
+	('rotation', 'angle', 'set_angle', int),
+	('left_handed', 'enabled', 'set', bool),
+	('accel', 'profile', 'set_profile', AccelProfile),
+	('accel', 'speed', 'set_speed', float),
+	('tap', 'enabled', 'set_enabled', TapState),
+	('tap', 'button_map', 'set_button_map', TapButtonMap),
+	('tap', 'drag_enabled', 'set_drag_enabled', DragState),
+	('tap', 'drag_lock_enabled', 'set_drag_lock_enabled', DragLockState),
+	('scroll', 'natural_scroll_enabled', 'set_natural_scroll_enabled', bool),
+	('scroll', 'method', 'set_method', ScrollMethod),
+	('scroll', 'button', 'set_button', int),
+	('click', 'method', 'set_method', ClickMethod),
+	('middle_emulation', 'enabled', 'set_enabled', MiddleEmulationState),
+	('dwt', 'enabled', 'set_enabled', DwtState),
+)
+
+
+def _encode_setting(value):
+
+	if isinstance(value, Enum):
+		return value.value if value.name is None else value.name
+	elif isinstance(value, tuple):
+		# Calibration properties return (is set, matrix).
+		return list(value[1])
+	return value
+
+
+def _decode_setting(type_, value):
+
+	if type_ is None:
+		# Round through c_float so a matrix compares equal to the one
+		# libinput stores.
+		return list((c_float * 6)(*value))
+	elif issubclass(type_, Enum):
+		if isinstance(value, type_):
+			return value
+		elif isinstance(value, int):
+			return type_(value)
+		names = value.split('|')
+		value = type_[names[0]]
+		for name in names[1:]:
+			value |= type_[name]
+		return value
+	return type_(value)
+
+
+def _same_setting(type_, value, other):
+
+	# Speeds that went through JSON or a float setter may differ slightly.
+	if type_ is float:
+		return abs(value - other) <= 1e-6
+	return value == other
+
+
 class DeviceConfig(BaseDevice):
 	"""A configuration object.
 	"""
@@ -141,6 +214,99 @@ class DeviceConfig(BaseDevice):
 
 		return self._rotation
 
+	def _sections(self):
+
+		sections = ['send_events', 'scroll', 'click']
+		for section, available in (
+				('calibration', self._calibration.has_matrix),
+				('rotation', self._rotation.is_available),
+				('left_handed', self._left_handed.is_available),
+				('accel', self._accel.is_available),
+				('tap', lambda: self._tap.finger_count > 0),
+				('middle_emulation', self._middle_emulation.is_available),
+				('dwt', self._dwt.is_available)):
+			if available():
+				sections.append(section)
+		return sections
+
+	def snapshot(self):
+		"""Read the whole configuration of this device.
+
+		The snapshot is a dict with a dict per configuration section, named
+		after the properties of this object, e.g. ``'tap'``, that maps
+		the names of the section's properties to their current and default
+		values, e.g. ``'enabled'`` and ``'default_enabled'``. Sections the
+		device does not support are left out. Enumerations are stored by
+		name, so a snapshot only holds strings, numbers, booleans and lists
+		and can be serialized, e.g. with :mod:`json`::
+
+			{'tap': {'enabled': 'ENABLED', 'default_enabled': 'DISABLED',
+				...}, 'accel': {'speed': 0.0, 'default_speed': 0.0, ...}, ...}
+
+		Returns:
+			dict: The configuration, see :meth:`apply`.
+		"""
+
+		sections = self._sections()
+		snapshot = dict((section, {}) for section in sections)
+		for section, name, _, _ in _config_settings:
+			if section not in snapshot:
+				continue
+			config = getattr(self, section)
+			values = snapshot[section]
+			values[name] = _encode_setting(getattr(config, name))
+			values['default_' + name] = _encode_setting(
+				getattr(config, 'default_' + name))
+		return snapshot
+
+	def apply(self, snapshot, current=None):
+		"""Change the configuration of this device to a snapshot.
+
+		Only the settings that differ from the current configuration are
+		set, ``default_`` values and sections or settings missing from
+		``snapshot`` are ignored. A snapshot taken from another device or
+		written by hand may thus be applied as well.
+
+		Args:
+			snapshot (dict): The configuration as returned by
+				:meth:`snapshot`.
+			current (dict): The current configuration of this device, as
+				returned by :meth:`snapshot`. If given, the device is not
+				read to find which settings differ.
+		Returns:
+			dict: A dict with a dict per section, mapping the name of every
+			setting that was set to its
+			:class:`~libinput.constant.ConfigStatus`.
+		Raises:
+			ValueError: If a value is invalid, e.g. an unknown enumeration
+				name. Nothing is set in that case.
+		"""
+
+		sections = self._sections() if current is None else current
+		values = []
+		for section, name, setter, type_ in _config_settings:
+			value = snapshot.get(section, {}).get(name)
+			if value is None or section not in sections:
+				continue
+			try:
+				value = _decode_setting(type_, value)
+			except (KeyError, ValueError, TypeError):
+				raise ValueError('Invalid value {!r} for {}.{}'.format(
+					value, section, name))
+			values.append((section, name, setter, type_, value))
+		statuses = {}
+		for section, name, setter, type_, value in values:
+			config = getattr(self, section)
+			if current is not None and name in current[section]:
+				previous = current[section][name]
+			else:
+				previous = _encode_setting(getattr(config, name))
+			if _same_setting(type_, value, _decode_setting(type_, previous)):
+				continue
+			statuses.setdefault(section, {})[name] = getattr(
+				config, setter)(value)
+		return statuses
+
 
 class DeviceConfigTap(BaseDevice):
 	"""Tapping-related configuration methods.
@@ -1614,10 +1780,161 @@ class DeviceConfigRotation(BaseDevice):
 			self._handle)
 
 
+class CodeBitmap(object):
+	"""An immutable set of key or button codes, stored as a bitmap.
+
+	Membership of a single code is a bit test, :meth:`contains` tests many
+	codes at once. Bitmaps support ``&``, ``|`` and ``-`` to compare
+	devices, e.g. to find the keys two keyboards have in common.
+	"""
+
+	__slots__ = ('_bits',)
+
+	def __init__(self, bits=0):
+		"""Initialize a bitmap.
+
+		Args:
+			bits (int): Bit ``n`` is set if code ``n`` is in the set.
+		"""
+
+		self._bits = bits
+
+	@classmethod
+	def from_codes(cls, codes):
+		"""Create a bitmap from codes.
+
+		Args:
+			codes (~collections.abc.Iterable): Key or button codes.
+		Returns:
+			CodeBitmap: The bitmap.
+		"""
+
+		bits = 0
+		for code in codes:
+			bits |= 1 << code
+		return cls(bits)
+
+	def __int__(self):
+
+		return self._bits
+
+	def __contains__(self, code):
+
+		return code >= 0 and bool(self._bits >> code & 1)
+
+	def __iter__(self):
+
+		bits, code = self._bits, 0
+		while bits:
+			if bits & 1:
+				yield code
+			bits >>= 1
+			code += 1
+
+	def __len__(self):
+
+		return bin(self._bits).count('1')
+
+	def __eq__(self, other):
+
+		if isinstance(other, CodeBitmap):
+			return self._bits == other._bits
+		return NotImplemented
+
+	def __ne__(self, other):
+
+		if isinstance(other, CodeBitmap):
+			return self._bits != other._bits
+		return NotImplemented
+
+	def __hash__(self):
+
+		return hash(self._bits)
+
+	def __and__(self, other):
+
+		return CodeBitmap(self._bits & other._bits)
+
+	def __or__(self, other):
+
+		return CodeBitmap(self._bits | other._bits)
+
+	def __sub__(self, other):
+
+		return CodeBitmap(self._bits & ~other._bits)
+
+	def __repr__(self):
+
+		return '{}({:#x})'.format(type(self).__name__, self._bits)
+
+	def to_bytes(self):
+		"""Return the bitmap in the layout of the kernel's key bitmaps.
+
+		Returns:
+			bytes: ``(KEY_MAX + 1) / 8`` bytes, code ``n`` is bit ``n % 8`` of
+			byte ``n // 8``.
+		"""
+
+		size = (_key_max + 1) // 8
+		return bytes(bytearray(
+			self._bits >> (8 * index) & 0xff for index in range(size)))
+
+	def contains(self, codes):
+		"""Test many codes at once.
+
+		Args:
+			codes: Key or button codes, a NumPy integer array or any
+				iterable.
+		Returns:
+			A :class:`numpy.ndarray` of booleans for an array, otherwise
+			a list of :class:`bool`.
+		"""
+
+		if numpy is not None and isinstance(codes, numpy.ndarray):
+			table = numpy.unpackbits(
+				numpy.frombuffer(self.to_bytes(), numpy.uint8),
+				bitorder='little').astype(bool)
+			inside = (codes >= 0) & (codes <= _key_max)
+			result = numpy.zeros(codes.shape, bool)
+			result[inside] = table[codes[inside]]
+			return result
+		bits = self._bits
+		return [code >= 0 and bool(bits >> code & 1) for code in codes]
+
+
+class DeviceDescriptor(namedtuple('DeviceDescriptor', ('sysname', 'name',
+		'id_vendor', 'id_product', 'size', 'capabilities'))):
+	"""The static properties of a device, read once.
+
+	Attributes:
+		sysname (str): See :attr:`Device.sysname`.
+		name (str): See :attr:`Device.name`.
+		id_vendor (int): See :attr:`Device.id_vendor`.
+		id_product (int): See :attr:`Device.id_product`.
+		size ((float, float)): See :attr:`Device.size`, :obj:`None` if
+			the device does not provide size information.
+		capabilities ((~libinput.constant.DeviceCapability)): See
+			:attr:`Device.capabilities`.
+	"""
+
+	__slots__ = ()
+
+
 class Device(BaseDevice):
 	"""An input device.
+
+	The properties of a device that cannot change while it exists are read
+	once and shared by all :class:`Device` objects of the device, see
+	:attr:`descriptor`.
 	"""
 
+	# Descriptors are keyed by handle and dropped with the last wrapper of
+	# a handle, wrappers hold a reference so the handle cannot be reused
+	# while its descriptor exists.
+	_descriptors = {}
+	_bitmaps = {}
+	_wrappers = {}
+
 	def __init__(self, *args):
 
 		BaseDevice.__init__(self, *args)
@@ -1638,7 +1955,7 @@ class Device(BaseDevice):
 		self._libinput.libinput_device_get_seat.restype = c_void_p
 		self._libinput.libinput_device_set_seat_logical_name.argtypes = (
 			c_void_p, c_char_p)
-		self._libinput.libinput_device_set_seat_logical_name = c_int
+		self._libinput.libinput_device_set_seat_logical_name.restype = c_int
 		self._libinput.libinput_device_get_udev_device.argtypes = (c_void_p,)
 		self._libinput.libinput_device_get_udev_device.restype = c_void_p
 		self._libinput.libinput_device_led_update.argtypes = (c_void_p, Led)
@@ -1651,6 +1968,8 @@ class Device(BaseDevice):
 		self._libinput.libinput_device_get_size.restype = c_int
 
 		self._libinput.libinput_device_ref(self._handle)
+		Device._wrappers[self._handle] = Device._wrappers.get(
+			self._handle, 0) + 1
 
 		hseat = self._libinput.libinput_device_get_seat(self._handle)
 		self._seat = Seat(hseat, self._libinput)
@@ -1661,6 +1980,12 @@ class Device(BaseDevice):
 
 	def __del__(self):
 
+		wrappers = Device._wrappers.pop(self._handle) - 1
+		if wrappers:
+			Device._wrappers[self._handle] = wrappers
+		else:
+			Device._descriptors.pop(self._handle, None)
+			Device._bitmaps.pop(self._handle, None)
 		self._libinput.libinput_device_unref(self._handle)
 
 	def __eq__(self, other):
@@ -1670,6 +1995,55 @@ class Device(BaseDevice):
 		else:
 			return NotImplemented
 
+	@property
+	def descriptor(self):
+		"""The static properties of this device.
+
+		The descriptor is read from libinput on first access and kept while
+		any :class:`Device` object of the device exists, e.g. in
+		:attr:`~libinput.LibInput.devices`. :attr:`sysname`, :attr:`name`,
+		:attr:`id_vendor`, :attr:`id_product`, :attr:`size` and
+		:attr:`capabilities` are served from it.
+
+		Returns:
+			.DeviceDescriptor: The descriptor.
+		"""
+
+		descriptor = self._descriptors.get(self._handle)
+		if descriptor is None:
+			descriptor = self._descriptors[self._handle] = self._describe()
+		return descriptor
+
+	def _describe(self):
+
+		width = c_double(0)
+		height = c_double(0)
+		rc = self._libinput.libinput_device_get_size(
+			self._handle, byref(width), byref(height))
+		return DeviceDescriptor(
+			string_at(self._libinput.libinput_device_get_sysname(
+				self._handle)).decode(),
+			string_at(self._libinput.libinput_device_get_name(
+				self._handle)).decode(),
+			self._libinput.libinput_device_get_id_vendor(self._handle),
+			self._libinput.libinput_device_get_id_product(self._handle),
+			(width.value, height.value) if rc == 0 else None,
+			tuple(cap for cap in DeviceCapability
+				if self._libinput.libinput_device_has_capability(
+					self._handle, cap)))
+
+	def invalidate(self):
+		"""Discard the :attr:`descriptor` of this device.
+
+		The :attr:`~.DevicePointer.buttons` and :attr:`~.DeviceKeyboard.keys`
+		bitmaps are discarded as well. The next access reads the properties
+		from libinput again. :meth:`set_seat_logical_name` calls this
+		method, as the device is removed and added again.
+		"""
+
+		self._descriptors.pop(self._handle, None)
+		self._bitmaps.pop(self._handle, None)
+
 	@property
 	def sysname(self):
 		"""The system name of the device.
@@ -1680,8 +2054,7 @@ class Device(BaseDevice):
 			str: System name of the device.
 		"""
 
-		pchar = self._libinput.libinput_device_get_sysname(self._handle)
-		return string_at(pchar).decode()
+		return self.descriptor.sysname
 
 	@property
 	def name(self):
@@ -1694,8 +2067,7 @@ class Device(BaseDevice):
 			str: The device name.
 		"""
 
-		pchar = self._libinput.libinput_device_get_name(self._handle)
-		return string_at(pchar).decode()
+		return self.descriptor.name
 
 	@property
 	def id_product(self):
@@ -1705,7 +2077,7 @@ class Device(BaseDevice):
 			int: The product ID of this device.
 		"""
 
-		return self._libinput.libinput_device_get_id_product(self._handle)
+		return self.descriptor.id_product
 
 	@property
 	def id_vendor(self):
@@ -1715,7 +2087,7 @@ class Device(BaseDevice):
 			int: The vendor ID of this device.
 		"""
 
-		return self._libinput.libinput_device_get_id_vendor(self._handle)
+		return self.descriptor.id_vendor
 
 	@property
 	def seat(self):
@@ -1757,6 +2129,7 @@ class Device(BaseDevice):
 			AssertionError
 		"""
 
+		self.invalidate()
 		rc = self._libinput.libinput_device_set_seat_logical_name(
 			self._handle, seat.encode())
 		assert rc == 0, 'Cannot assign device to {}'.format(seat)
@@ -1804,11 +2177,7 @@ class Device(BaseDevice):
 			(~libinput.constant.DeviceCapability): Device capabilities.
 		"""
 
-		caps = []
-		for cap in DeviceCapability:
-			if self._libinput.libinput_device_has_capability(self._handle, cap):
-				caps.append(cap)
-		return tuple(caps)
+		return self.descriptor.capabilities
 
 	@property
 	def size(self):
@@ -1824,12 +2193,9 @@ class Device(BaseDevice):
 			AssertionError
 		"""
 
-		width = c_double(0)
-		height = c_double(0)
-		rc = self._libinput.libinput_device_get_size(
-			self._handle, byref(width), byref(height))
-		assert rc == 0, 'This device does not provide size information'
-		return width.value, height.value
+		size = self.descriptor.size
+		assert size is not None, 'This device does not provide size information'
+		return size
 
 	@property
 	def pointer(self):
@@ -1875,6 +2241,25 @@ class Device(BaseDevice):
 		return self._config
 
 
+def _bitmap(device, kind, codes, has, message):
+
+	handle = device._handle
+	bitmaps = Device._bitmaps.get(handle, {})
+	bitmap = bitmaps.get(kind)
+	if bitmap is None:
+		bits = 0
+		for code in codes:
+			rc = has(handle, code)
+			assert rc >= 0, message
+			if rc:
+				bits |= 1 << code
+		bitmap = bitmaps[kind] = CodeBitmap(bits)
+		# Only cache while a Device holds a reference to the handle.
+		if handle in Device._wrappers:
+			Device._bitmaps[handle] = bitmaps
+	return bitmap
+
+
 class DevicePointer(BaseDevice):
 	"""Methods specific to a device with
 	:attr:`~libinput.constant.DeviceCapability.POINTER` capability.
@@ -1907,6 +2292,24 @@ class DevicePointer(BaseDevice):
 		assert rc >= 0, 'This device is not a pointer device'
 		return bool(rc)
 
+	@property
+	def buttons(self):
+		"""All buttons of this device.
+
+		The device is probed once for every button code, the bitmap is
+		shared with all :class:`.Device` objects of the device and kept
+		alongside its :attr:`~.Device.descriptor`.
+
+		Returns:
+			.CodeBitmap: The button codes, see ``input.h``.
+		Raises:
+			AssertionError
+		"""
+
+		return _bitmap(self, 'buttons', range(_btn_misc, _key_max + 1),
+			self._libinput.libinput_device_pointer_has_button,
+			'This device is not a pointer device')
+
 
 class DeviceKeyboard(BaseDevice):
 	"""Methods specific to a device with
@@ -1938,6 +2341,24 @@ class DeviceKeyboard(BaseDevice):
 		assert rc >= 0, 'This device is not a keyboard device'
 		return bool(rc)
 
+	@property
+	def keys(self):
+		"""All keys of this device.
+
+		The device is probed once for every key code, the bitmap is shared
+		with all :class:`.Device` objects of the device and kept alongside
+		its :attr:`~.Device.descriptor`.
+
+		Returns:
+			.CodeBitmap: The key codes, see ``input.h``.
+		Raises:
+			AssertionError
+		"""
+
+		return _bitmap(self, 'keys', range(_key_max + 1),
+			self._libinput.libinput_device_keyboard_has_key,
+			'This device is not a keyboard device')
+
 
 class DeviceTabletPad(BaseDevice):
 	"""Methods specific to a device with
@@ -4,22 +4,39 @@ from __future__ import absolute_import
 from ctypes import c_void_p, c_uint32, c_uint64, c_double, c_bool, c_int, c_int32
 from .constant import EventType, ButtonState, PointerAxis, KeyState
 from .constant import PointerAxisSource, Switch, SwitchState
+from .constant import TabletToolProximityState, TabletToolTipState
+from .constant import TabletPadRingAxisSource, TabletPadStripAxisSource
 from .device import Device
 from .define import TabletTool, TabletPadModeGroup
 
 
 _wrong_prop = 'This property is undefined for events of {} type.'
 _wrong_meth = 'This method is undefined for events of {} type.'
+_scroll_events = {EventType.POINTER_SCROLL_WHEEL,
+	EventType.POINTER_SCROLL_FINGER, EventType.POINTER_SCROLL_CONTINUOUS}
+_axis_events = _scroll_events | {EventType.POINTER_AXIS}
 
 
 class Event(object):
 	"""Base class for device events.
 	"""
 
+	# Live wrappers by id while metrics are enabled, see
+	# LibInput.enable_metrics.
+	_live = None
+	#: Values set by :class:`~libinput.filter.FilterPipeline`, :obj:`None` if
+	#: the event was not filtered.
+	filtered = None
+	#: The number of earlier events merged into this one by
+	#: :class:`~libinput.shed.LoadShedder`.
+	coalesced = 0
+
 	def __init__(self, hevent, libinput):
 
 		self._libinput = libinput
 		self._hevent = hevent
+		if Event._live is not None:
+			Event._live[id(self)] = self
 
 		self._libinput.libinput_event_destroy.argtypes = (c_void_p,)
 		self._libinput.libinput_event_destroy.restype = None
@@ -72,6 +89,9 @@ class PointerEvent(Event):
 	press/release or scroll axis events.
 	"""
 
+	# Values of events merged into this one, by getter and axis.
+	_carried = None
+
 	def __init__(self, *args):
 
 		Event.__init__(self, *args)
@@ -136,10 +156,28 @@ class PointerEvent(Event):
 				c_void_p, PointerAxis)
 		self._libinput \
 			.libinput_event_pointer_get_axis_value_discrete.restype = c_double
+		# Scroll events and their accessors were added in libinput 1.19
+		if hasattr(self._libinput, 'libinput_event_pointer_get_scroll_value'):
+			self._libinput.libinput_event_pointer_get_scroll_value.argtypes = (
+				c_void_p, PointerAxis)
+			self._libinput.libinput_event_pointer_get_scroll_value.restype = (
+				c_double)
+			self._libinput \
+				.libinput_event_pointer_get_scroll_value_v120.argtypes = (
+					c_void_p, PointerAxis)
+			self._libinput \
+				.libinput_event_pointer_get_scroll_value_v120.restype = (
+					c_double)
 
 		self._handle = self._libinput.libinput_event_get_pointer_event(
 			self._hevent)
 
+	def _carry(self, getter, axis, value):
+
+		if self._carried is None:
+			return value
+		return value + self._carried.get((getter, axis), 0)
+
 	@property
 	def time(self):
 		""".. note::
@@ -328,11 +366,15 @@ class PointerEvent(Event):
 		"""Check if the event has a valid value for the given axis.
 
 		If this method returns True for an axis and :meth:`get_axis_value`
-		returns a value of 0, the event is a scroll stop event.
+		or :meth:`get_scroll_value` returns a value of 0, the event is a scroll
+		stop event.
 
 		For pointer events that are not of type
-		:attr:`~libinput.constant.EventType.POINTER_AXIS`, this method raises
-		:exc:`AttributeError`.
+		:attr:`~libinput.constant.EventType.POINTER_AXIS`,
+		:attr:`~libinput.constant.EventType.POINTER_SCROLL_WHEEL`,
+		:attr:`~libinput.constant.EventType.POINTER_SCROLL_FINGER` or
+		:attr:`~libinput.constant.EventType.POINTER_SCROLL_CONTINUOUS`, this
+		method raises :exc:`AttributeError`.
 
 		Args:
 			axis (~libinput.constant.PointerAxis): The axis to check.
@@ -342,7 +384,7 @@ class PointerEvent(Event):
 			AttributeError
 		"""
 
-		if self.type != EventType.POINTER_AXIS:
+		if self.type not in _axis_events:
 			raise AttributeError(_wrong_meth.format(self.type))
 		return self._libinput.libinput_event_pointer_has_axis(
 			self._handle, axis)
@@ -374,8 +416,9 @@ class PointerEvent(Event):
 
 		if self.type != EventType.POINTER_AXIS:
 			raise AttributeError(_wrong_meth.format(self.type))
-		return self._libinput.libinput_event_pointer_get_axis_value(
-			self._handle, axis)
+		return self._carry('get_axis_value', axis,
+			self._libinput.libinput_event_pointer_get_axis_value(
+				self._handle, axis))
 
 	@property
 	def axis_source(self):
@@ -450,8 +493,66 @@ class PointerEvent(Event):
 
 		if self.type != EventType.POINTER_AXIS:
 			raise AttributeError(_wrong_meth.format(self.type))
-		return self._libinput.libinput_event_pointer_get_axis_value_discrete(
-			self._handle, axis)
+		return self._carry('get_axis_value_discrete', axis,
+			self._libinput.libinput_event_pointer_get_axis_value_discrete(
+				self._handle, axis))
+
+	def get_scroll_value(self, axis):
+		"""Return the scroll value of the given axis.
+
+		The value is in the same coordinate space as :attr:`delta`, for
+		:attr:`~libinput.constant.EventType.POINTER_SCROLL_WHEEL` events it is
+		the legacy equivalent of the wheel movement. Use
+		:meth:`get_scroll_value_v120` for the precise movement of a wheel.
+
+		If :meth:`has_axis` returns False for an axis, this method returns 0
+		for that axis.
+
+		For pointer events that are not of type
+		:attr:`~libinput.constant.EventType.POINTER_SCROLL_WHEEL`,
+		:attr:`~libinput.constant.EventType.POINTER_SCROLL_FINGER` or
+		:attr:`~libinput.constant.EventType.POINTER_SCROLL_CONTINUOUS`, this
+		method raises :exc:`AttributeError`.
+
+		Args:
+			axis (~libinput.constant.PointerAxis): The axis who's value to get.
+		Returns:
+			float: The scroll value of this event.
+		Raises:
+			AttributeError
+		"""
+
+		if self.type not in _scroll_events:
+			raise AttributeError(_wrong_meth.format(self.type))
+		return self._carry('get_scroll_value', axis,
+			self._libinput.libinput_event_pointer_get_scroll_value(
+				self._handle, axis))
+
+	def get_scroll_value_v120(self, axis):
+		"""Return the wheel movement of the given axis in 1/120ths of
+		a logical wheel click.
+
+		A value of 120 is one full click of a traditional wheel, high
+		resolution wheels report fractions of it. The value is always
+		a multiple of 1.
+
+		For pointer events that are not of type
+		:attr:`~libinput.constant.EventType.POINTER_SCROLL_WHEEL`, this method
+		raises :exc:`AttributeError`.
+
+		Args:
+			axis (~libinput.constant.PointerAxis): The axis who's value to get.
+		Returns:
+			float: The wheel movement in 1/120ths of a click.
+		Raises:
+			AttributeError
+		"""
+
+		if self.type != EventType.POINTER_SCROLL_WHEEL:
+			raise AttributeError(_wrong_meth.format(self.type))
+		return self._carry('get_scroll_value_v120', axis,
+			self._libinput.libinput_event_pointer_get_scroll_value_v120(
+				self._handle, axis))
 
 
 class KeyboardEvent(Event):
@@ -1420,11 +1521,11 @@ class TabletPadEvent(Event):
 		self._libinput.libinput_event_tablet_pad_get_strip_source.restype = (
 			TabletPadStripAxisSource)
 		self._libinput.libinput_event_tablet_pad_get_button_number.argtypes = (
-			c_void_p)
+			c_void_p,)
 		self._libinput.libinput_event_tablet_pad_get_button_number.restype = (
 			c_uint32)
 		self._libinput.libinput_event_tablet_pad_get_button_state.argtypes = (
-			c_void_p)
+			c_void_p,)
 		self._libinput.libinput_event_tablet_pad_get_button_state.restype = (
 			ButtonState)
 		self._libinput.libinput_event_tablet_pad_get_mode.argtypes = (c_void_p,)
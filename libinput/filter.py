@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import, division
+from abc import ABCMeta, abstractmethod
+from array import array
+from math import pi, sqrt
+from .constant import EventType, TabletToolProximityState
+
+
+_touch_ends = {EventType.TOUCH_UP, EventType.TOUCH_CANCEL}
+
+
+class Filter(ABCMeta('ABC', (object,), {})):
+	"""Base class for filters run by :class:`FilterPipeline`.
+
+	A filter keeps no per-stream state itself: the pipeline allocates a state
+	buffer with :meth:`allocate` for every device, touch point or tool and
+	passes it to :meth:`apply` with every sample.
+	"""
+
+	def allocate(self, channels):
+		"""Return a zeroed state buffer.
+
+		Args:
+			channels (int): The number of channels of a sample.
+		Returns:
+			array.array: The state buffer, its first item is 0 until
+			the first sample was seen.
+		"""
+
+		return array('d', [0.0] * (1 + channels))
+
+	@abstractmethod
+	def apply(self, state, dt, values, relative):
+		"""Filter a sample in place.
+
+		Args:
+			state (array.array): The buffer returned by :meth:`allocate`.
+			dt (float): Seconds since the previous sample, 0 for the first.
+			values (list): The channels, spatial coordinates first.
+			relative (bool): Whether the coordinates are deltas
+				(e.g. :attr:`~libinput.event.PointerEvent.delta`) rather than
+				positions.
+		"""
+
+
+class ExponentialMovingAverage(Filter):
+	"""Smooths every channel with an exponential moving average.
+	"""
+
+	def __init__(self, alpha=0.5):
+		"""Initialize the filter.
+
+		Args:
+			alpha (float): The weight of a new sample in the range (0, 1],
+				lower values smooth more.
+		"""
+
+		self.alpha = alpha
+
+	def apply(self, state, dt, values, relative):
+
+		alpha = self.alpha
+		if not state[0]:
+			state[0] = 1
+		else:
+			for index, value in enumerate(values):
+				values[index] = alpha * value + (1 - alpha) * state[index + 1]
+		for index, value in enumerate(values):
+			state[index + 1] = value
+
+
+class OneEuroFilter(Filter):
+	"""Smooths every channel with the One Euro filter.
+
+	The filter adapts its cutoff frequency to the speed of change: slow
+	movements are smoothed heavily to remove jitter, fast movements are
+	smoothed little to keep latency low. See
+	`One Euro Filter <https://gery.casiez.net/1euro/>`_.
+	"""
+
+	def __init__(self, min_cutoff=1.0, beta=0.0, derivative_cutoff=1.0):
+		"""Initialize the filter.
+
+		Args:
+			min_cutoff (float): The cutoff frequency in Hz at low speeds,
+				lower values remove more jitter.
+			beta (float): How fast the cutoff grows with speed, higher
+				values reduce lag.
+			derivative_cutoff (float): The cutoff frequency in Hz used to
+				smooth the speed.
+		"""
+
+		self.min_cutoff = min_cutoff
+		self.beta = beta
+		self.derivative_cutoff = derivative_cutoff
+
+	def allocate(self, channels):
+
+		return array('d', [0.0] * (1 + 2 * channels))
+
+	@staticmethod
+	def _alpha(cutoff, dt):
+
+		return 1.0 / (1.0 + 1.0 / (2 * pi * cutoff * dt))
+
+	def apply(self, state, dt, values, relative):
+
+		if not state[0] or dt <= 0:
+			if not state[0]:
+				state[0] = 1
+				for index, value in enumerate(values):
+					state[2 * index + 1] = value
+			return
+		derivative_alpha = self._alpha(self.derivative_cutoff, dt)
+		for index, value in enumerate(values):
+			previous = state[2 * index + 1]
+			derivative = (value - previous) / dt
+			derivative = (derivative_alpha * derivative
+				+ (1 - derivative_alpha) * state[2 * index + 2])
+			alpha = self._alpha(
+				self.min_cutoff + self.beta * abs(derivative), dt)
+			value = alpha * value + (1 - alpha) * previous
+			state[2 * index + 1] = values[index] = value
+			state[2 * index + 2] = derivative
+
+
+class DeadZone(Filter):
+	"""Suppresses movements shorter than a threshold.
+
+	Deltas are set to 0 and accumulated until their sum is longer than the
+	threshold, which is then reported at once, so slow movements are delayed
+	rather than lost. Positions stay at the last reported position until
+	they move further than the threshold. Only the two spatial channels are
+	considered.
+	"""
+
+	def __init__(self, threshold):
+		"""Initialize the filter.
+
+		Args:
+			threshold (float): The threshold in the unit of the coordinates.
+		"""
+
+		self.threshold = threshold
+
+	def apply(self, state, dt, values, relative):
+
+		if relative:
+			dx, dy = state[1] + values[0], state[2] + values[1]
+			if sqrt(dx * dx + dy * dy) < self.threshold:
+				state[1], state[2] = dx, dy
+				values[0] = values[1] = 0.0
+			else:
+				state[1] = state[2] = 0.0
+				values[0], values[1] = dx, dy
+			return
+		if (state[0] and sqrt((values[0] - state[1]) ** 2
+				+ (values[1] - state[2]) ** 2) < self.threshold):
+			values[0], values[1] = state[1], state[2]
+			return
+		state[0] = 1
+		state[1], state[2] = values[0], values[1]
+
+
+class VelocityClamp(Filter):
+	"""Limits the speed of movements.
+
+	Movements faster than the limit are shortened along their direction.
+	Only the two spatial channels are considered.
+	"""
+
+	def __init__(self, max_speed):
+		"""Initialize the filter.
+
+		Args:
+			max_speed (float): The maximum speed in units of the coordinates
+				per second.
+		"""
+
+		self.max_speed = max_speed
+
+	def apply(self, state, dt, values, relative):
+
+		if relative:
+			dx, dy = values[0], values[1]
+		elif state[0]:
+			dx, dy = values[0] - state[1], values[1] - state[2]
+		else:
+			dx = dy = 0.0
+		distance = sqrt(dx * dx + dy * dy)
+		limit = self.max_speed * dt
+		if dt > 0 and distance > limit:
+			scale = limit / distance
+			if relative:
+				values[0], values[1] = dx * scale, dy * scale
+			else:
+				values[0] = state[1] + dx * scale
+				values[1] = state[2] + dy * scale
+		state[0] = 1
+		state[1], state[2] = values[0], values[1]
+
+
+class FilterPipeline(object):
+	"""Runs filters over pointer, touch and tablet tool events.
+
+	Filters are chained in the given order per event family: pointer motion
+	deltas (dx, dy), touch positions (x, y) and tablet tool positions and
+	pressure (x, y, pressure). State is kept separately for every device,
+	touch point and tool, and reset when a touch point goes down or a tool
+	enters proximity. It is dropped when the touch point goes up, the tool
+	leaves proximity or the device is removed.
+
+	Filtered values are stored in :attr:`~libinput.event.Event.filtered`,
+	the properties of events still return the values reported by libinput::
+
+		pipeline = FilterPipeline(pointer=[OneEuroFilter(beta=0.01)])
+		for event in pipeline.events(li.events):
+			if event.filtered is not None:
+				dx, dy = event.filtered
+	"""
+
+	def __init__(self, pointer=(), touch=(), tablet=()):
+		"""Initialize a pipeline.
+
+		Args:
+			pointer (~collections.abc.Iterable): :class:`Filter` objects
+				for :attr:`~libinput.constant.EventType.POINTER_MOTION`.
+			touch (~collections.abc.Iterable): :class:`Filter` objects for
+				:attr:`~libinput.constant.EventType.TOUCH_DOWN` and
+				:attr:`~libinput.constant.EventType.TOUCH_MOTION`.
+			tablet (~collections.abc.Iterable): :class:`Filter` objects for
+				tablet tool events.
+		"""
+
+		self._pointer = tuple(pointer)
+		self._touch = tuple(touch)
+		self._tablet = tuple(tablet)
+		self._states = {}
+
+	def reset(self):
+		"""Forget the state of all filters.
+		"""
+
+		self._states.clear()
+
+	def _run(self, key, filters, time, values, relative, fresh=False):
+
+		state = None if fresh else self._states.get(key)
+		if state is None:
+			state = self._states[key] = [time] + [
+				filter_.allocate(len(values)) for filter_ in filters]
+		dt = (time - state[0]) / 1e6
+		state[0] = time
+		for filter_, buffer in zip(filters, state[1:]):
+			filter_.apply(buffer, dt, values, relative)
+		return tuple(values)
+
+	def _evict(self, hdevice):
+
+		for key in list(self._states):
+			if key == hdevice or (
+					isinstance(key, tuple) and key[0] == hdevice):
+				del self._states[key]
+
+	def feed(self, event):
+		"""Filter an event.
+
+		Args:
+			event (~libinput.event.Event): Any event.
+		Returns:
+			tuple: The filtered values, also stored in
+			:attr:`~libinput.event.Event.filtered`, or :obj:`None` if
+			the event has no values to filter.
+		"""
+
+		type_ = event.type
+		libinput, handle = event._libinput, getattr(event, '_handle', None)
+		if type_ == EventType.POINTER_MOTION and self._pointer:
+			key = libinput.libinput_event_get_device(event._hevent)
+			values = self._run(key, self._pointer,
+				libinput.libinput_event_pointer_get_time_usec(handle),
+				[libinput.libinput_event_pointer_get_dx(handle),
+					libinput.libinput_event_pointer_get_dy(handle)], True)
+		elif type_ in {EventType.TOUCH_DOWN, EventType.TOUCH_MOTION} \
+				and self._touch:
+			key = (libinput.libinput_event_get_device(event._hevent),
+				libinput.libinput_event_touch_get_slot(handle))
+			values = self._run(key, self._touch,
+				libinput.libinput_event_touch_get_time_usec(handle),
+				[libinput.libinput_event_touch_get_x(handle),
+					libinput.libinput_event_touch_get_y(handle)], False,
+				type_ == EventType.TOUCH_DOWN)
+		elif type_.is_tablet_tool() and self._tablet:
+			key = (libinput.libinput_event_get_device(event._hevent),
+				libinput.libinput_event_tablet_tool_get_tool(handle))
+			proximity = (type_ == EventType.TABLET_TOOL_PROXIMITY
+				and libinput.libinput_event_tablet_tool_get_proximity_state(
+					handle))
+			values = self._run(key, self._tablet,
+				libinput.libinput_event_tablet_tool_get_time_usec(handle),
+				[libinput.libinput_event_tablet_tool_get_x(handle),
+					libinput.libinput_event_tablet_tool_get_y(handle),
+					libinput.libinput_event_tablet_tool_get_pressure(handle)],
+				False, proximity == TabletToolProximityState.IN)
+			if proximity == TabletToolProximityState.OUT:
+				del self._states[key]
+		else:
+			if type_ in _touch_ends:
+				self._states.pop((libinput.libinput_event_get_device(
+					event._hevent), libinput.libinput_event_touch_get_slot(
+					handle)), None)
+			elif type_ == EventType.DEVICE_REMOVED:
+				self._evict(libinput.libinput_event_get_device(event._hevent))
+			return None
+		event.filtered = values
+		return values
+
+	def events(self, events):
+		"""Filter a stream of events.
+
+		Args:
+			events (~collections.abc.Iterable): Any events, e.g.
+				:attr:`~libinput.LibInput.events`.
+		Yields:
+			~libinput.event.Event: The same events, with
+			:attr:`~libinput.event.Event.filtered` set where applicable.
+		"""
+
+		feed = self.feed
+		for event in events:
+			feed(event)
+			yield event
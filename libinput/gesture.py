@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from collections import namedtuple
+from .constant import EventType
+
+
+class GestureSummary(namedtuple('GestureSummary', ('type', 'finger_count',
+		'finished', 'cancelled', 'time', 'duration', 'updates', 'dx', 'dy',
+		'dx_unaccelerated', 'dy_unaccelerated', 'scale', 'angle'))):
+	"""The state of a gesture sequence.
+
+	Attributes:
+		type (~libinput.constant.EventType): The BEGIN event type of
+			the gesture, e.g.
+			:attr:`~libinput.constant.EventType.GESTURE_PINCH_BEGIN`.
+		finger_count (int): The number of fingers.
+		finished (bool): :obj:`False` for progress snapshots.
+		cancelled (bool): Whether the gesture was cancelled.
+		time (int): The time of the BEGIN event in microseconds.
+		duration (int): Microseconds from BEGIN to the last event seen.
+		updates (int): The number of UPDATE events seen.
+		dx, dy (float): The cumulative delta.
+		dx_unaccelerated, dy_unaccelerated (float): The cumulative
+			unaccelerated delta.
+		scale (float): The current pinch scale, 1.0 for other gestures.
+		angle (float): The summed angle delta in degrees.
+	"""
+
+	__slots__ = ()
+
+
+_begins = {}
+for _begin, _types in (
+		(EventType.GESTURE_SWIPE_BEGIN, (EventType.GESTURE_SWIPE_BEGIN,
+			EventType.GESTURE_SWIPE_UPDATE, EventType.GESTURE_SWIPE_END)),
+		(EventType.GESTURE_PINCH_BEGIN, (EventType.GESTURE_PINCH_BEGIN,
+			EventType.GESTURE_PINCH_UPDATE, EventType.GESTURE_PINCH_END)),
+		(EventType.GESTURE_HOLD_BEGIN, (EventType.GESTURE_HOLD_BEGIN,
+			EventType.GESTURE_HOLD_END))):
+	for _type in _types:
+		_begins[_type] = _begin
+_ends = {EventType.GESTURE_SWIPE_END, EventType.GESTURE_PINCH_END,
+	EventType.GESTURE_HOLD_END}
+
+
+class _Gesture(object):
+
+	__slots__ = ('type', 'finger_count', 'time', 'last', 'updates', 'dx',
+		'dy', 'dx_unaccelerated', 'dy_unaccelerated', 'scale', 'angle',
+		'progress')
+
+	def __init__(self, type_, finger_count, time):
+
+		self.type = type_
+		self.finger_count = finger_count
+		self.time = self.last = self.progress = time
+		self.updates = 0
+		self.dx = self.dy = 0.0
+		self.dx_unaccelerated = self.dy_unaccelerated = 0.0
+		self.scale = 1.0
+		self.angle = 0.0
+
+	def summary(self, finished, cancelled):
+
+		return GestureSummary(self.type, self.finger_count, finished,
+			cancelled, self.time, self.last - self.time, self.updates,
+			self.dx, self.dy, self.dx_unaccelerated, self.dy_unaccelerated,
+			self.scale, self.angle)
+
+
+class GestureAggregator(object):
+	"""Reduces swipe, pinch and hold sequences to one summary each.
+
+	Deltas, scale and angle are accumulated as UPDATE events arrive, so
+	a consumer is only handed a :class:`GestureSummary` when the gesture
+	ends, and optionally progress snapshots at a bounded rate. Gestures on
+	different devices are tracked separately.
+	"""
+
+	def __init__(self, progress=None):
+		"""Initialize an aggregator with no gestures in progress.
+
+		Args:
+			progress (float): If given, also return a progress snapshot from
+				an UPDATE event when at least this many seconds (of event
+				time) passed since the previous one, e.g. ``1 / 30``.
+		"""
+
+		self._interval = None if progress is None else int(progress * 1e6)
+		self._gestures = {}
+
+	@property
+	def active(self):
+		"""The number of gestures in progress.
+
+		Returns:
+			int: Number of gestures.
+		"""
+
+		return len(self._gestures)
+
+	def feed(self, event):
+		"""Process an event.
+
+		Events other than gesture events are ignored.
+
+		Args:
+			event (~libinput.event.Event): Any event.
+		Returns:
+			GestureSummary: A final summary for END events, a progress
+			snapshot when one is due or :obj:`None`.
+		"""
+
+		type_ = event.type
+		begin = _begins.get(type_)
+		if begin is None:
+			return None
+		libinput, handle = event._libinput, event._handle
+		hdevice = libinput.libinput_event_get_device(event._hevent)
+		time = libinput.libinput_event_gesture_get_time_usec(handle)
+		gesture = self._gestures.get(hdevice)
+		if gesture is None or type_ == begin:
+			gesture = self._gestures[hdevice] = _Gesture(begin,
+				libinput.libinput_event_gesture_get_finger_count(handle), time)
+		gesture.last = time
+		if type_ in _ends:
+			del self._gestures[hdevice]
+			if type_ == EventType.GESTURE_PINCH_END:
+				gesture.scale = libinput.libinput_event_gesture_get_scale(
+					handle)
+			return gesture.summary(
+				True, libinput.libinput_event_gesture_get_cancelled(handle))
+		if type_ == begin:
+			return None
+		gesture.updates += 1
+		gesture.dx += libinput.libinput_event_gesture_get_dx(handle)
+		gesture.dy += libinput.libinput_event_gesture_get_dy(handle)
+		gesture.dx_unaccelerated += \
+			libinput.libinput_event_gesture_get_dx_unaccelerated(handle)
+		gesture.dy_unaccelerated += \
+			libinput.libinput_event_gesture_get_dy_unaccelerated(handle)
+		if type_ == EventType.GESTURE_PINCH_UPDATE:
+			gesture.scale = libinput.libinput_event_gesture_get_scale(handle)
+			gesture.angle += libinput.libinput_event_gesture_get_angle_delta(
+				handle)
+		if (self._interval is not None
+				and time - gesture.progress >= self._interval):
+			gesture.progress = time
+			return gesture.summary(False, False)
+		return None
+
+	def summaries(self, events):
+		"""Yield the summaries of a stream of events.
+
+		Args:
+			events (~collections.abc.Iterable): Any events, e.g.
+				:attr:`~libinput.LibInput.events`.
+		Yields:
+			GestureSummary: Final summaries and progress snapshots.
+		"""
+
+		feed = self.feed
+		for event in events:
+			summary = feed(event)
+			if summary is not None:
+				yield summary
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from collections import namedtuple
+try:
+	from time import monotonic
+except ImportError:
+	from monotonic import monotonic
+from .constant import EventType
+
+
+class HotplugDelta(namedtuple('HotplugDelta',
+		('added', 'removed', 'replaced'))):
+	"""The devices that changed during a burst of hotplug events.
+
+	Devices that were added and removed again within the burst appear in
+	neither list.
+
+	Attributes:
+		added (list): The :class:`~libinput.define.Device` objects added.
+		removed (list): The :class:`~libinput.define.Device` objects removed.
+		replaced (list): (removed, added) pairs of
+			:class:`~libinput.define.Device` objects with the same name,
+			vendor and product IDs and capabilities, e.g. a device that was
+			unplugged and plugged in again.
+	"""
+
+	__slots__ = ()
+
+
+def _identity(device):
+
+	descriptor = device.descriptor
+	return (descriptor.name, descriptor.id_vendor, descriptor.id_product,
+		descriptor.capabilities)
+
+
+class HotplugAggregator(object):
+	"""Collapses bursts of device added/removed events into one delta.
+
+	Docking stations and KVM switches add and remove many devices within
+	milliseconds. The aggregator collects
+	:attr:`~libinput.constant.EventType.DEVICE_ADDED` and
+	:attr:`~libinput.constant.EventType.DEVICE_REMOVED` events and hands
+	out a single :class:`HotplugDelta` once no such event arrived for
+	``window`` seconds, so consumers reconfigure once per burst.
+	"""
+
+	def __init__(self, window=0.25, max_delay=2.0, clock=monotonic):
+		"""Initialize an aggregator.
+
+		Args:
+			window (float): Seconds without device events that end a burst.
+			max_delay (float): Seconds after the first event of a burst after
+				which it is delivered even if events keep arriving,
+				:obj:`None` for no limit.
+			clock (~collections.abc.Callable): Returns the current time in
+				seconds.
+		"""
+
+		self.window = window
+		self.max_delay = max_delay
+		self._clock = clock
+		self._added = {}
+		self._removed = {}
+		self._first = self._last = None
+
+	@property
+	def pending(self):
+		"""Whether a burst is in progress.
+
+		Returns:
+			bool: :obj:`True` if device events were fed since the last delta.
+		"""
+
+		return self._last is not None
+
+	def feed(self, event):
+		"""Record an event.
+
+		Args:
+			event (~libinput.event.Event): Any event.
+		Returns:
+			bool: :obj:`True` if the event was a device added or removed
+			event.
+		"""
+
+		type_ = event.type
+		if type_ == EventType.DEVICE_ADDED:
+			device = event.device
+			self._added[device._handle] = device
+		elif type_ == EventType.DEVICE_REMOVED:
+			device = event.device
+			if self._added.pop(device._handle, None) is None:
+				self._removed[device._handle] = device
+		else:
+			return False
+		self._last = self._clock()
+		if self._first is None:
+			self._first = self._last
+		return True
+
+	def timeout(self):
+		"""Return the time until the current burst is due.
+
+		Suitable as the timeout of :meth:`selectors.BaseSelector.select`.
+
+		Returns:
+			float: Seconds until :meth:`poll` returns a delta, 0 if it is
+			due, or :obj:`None` if no burst is in progress.
+		"""
+
+		if self._last is None:
+			return None
+		due = self._last + self.window
+		if self.max_delay is not None:
+			due = min(due, self._first + self.max_delay)
+		return max(0.0, due - self._clock())
+
+	def poll(self):
+		"""Return the delta of the current burst if it is due.
+
+		Returns:
+			HotplugDelta: The delta or :obj:`None` if no burst is due or
+			the burst did not change anything.
+		"""
+
+		if self._last is None or self.timeout() > 0:
+			return None
+		return self.flush()
+
+	def flush(self):
+		"""Return the delta of the current burst without waiting.
+
+		Returns:
+			HotplugDelta: The delta or :obj:`None` if nothing changed.
+		"""
+
+		added, removed = self._added, self._removed
+		self._added, self._removed = {}, {}
+		self._first = self._last = None
+		if not added and not removed:
+			return None
+		unmatched = {}
+		for device in removed.values():
+			unmatched.setdefault(_identity(device), []).append(device)
+		delta = HotplugDelta([], [], [])
+		for device in added.values():
+			candidates = unmatched.get(_identity(device))
+			if candidates:
+				delta.replaced.append((candidates.pop(0), device))
+			else:
+				delta.added.append(device)
+		replaced = set(id(old) for old, _ in delta.replaced)
+		delta.removed.extend(device for device in removed.values()
+			if id(device) not in replaced)
+		return delta
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from .constant import EventType, DeviceCapability
+
+
+class DeviceEntry(object):
+	"""A device known to a :class:`DeviceInventory`.
+
+	The static properties of the device are taken from its
+	:attr:`~libinput.define.Device.descriptor` when the device is added.
+
+	Attributes:
+		device (~libinput.define.Device): The device, kept referenced while
+			it is in the inventory.
+		sysname (str): See :attr:`~libinput.define.Device.sysname`.
+		name (str): See :attr:`~libinput.define.Device.name`.
+		id_vendor (int): See :attr:`~libinput.define.Device.id_vendor`.
+		id_product (int): See :attr:`~libinput.define.Device.id_product`.
+		seat (str): The physical name of the seat of the device.
+		logical_seat (str): The logical name of the seat of the device.
+		capabilities (frozenset): The
+			:class:`~libinput.constant.DeviceCapability` of the device.
+		size ((float, float)): See :attr:`~libinput.define.Device.size`,
+			:obj:`None` if the device does not provide size information.
+	"""
+
+	__slots__ = ('device', 'sysname', 'name', 'id_vendor', 'id_product',
+		'seat', 'logical_seat', 'capabilities', 'size')
+
+	def __init__(self, device):
+
+		descriptor = device.descriptor
+		self.device = device
+		self.sysname = descriptor.sysname
+		self.name = descriptor.name
+		self.id_vendor = descriptor.id_vendor
+		self.id_product = descriptor.id_product
+		self.seat = device.seat.physical_name
+		self.logical_seat = device.seat.logical_name
+		self.capabilities = frozenset(descriptor.capabilities)
+		self.size = descriptor.size
+
+	def __repr__(self):
+
+		return '<{} {} {!r}>'.format(
+			type(self).__name__, self.sysname, self.name)
+
+	def has_capability(self, capability):
+		"""Check if the device has a capability.
+
+		Args:
+			capability (~libinput.constant.DeviceCapability): The capability.
+		Returns:
+			bool: :obj:`True` if the device has the capability.
+		"""
+
+		return capability in self.capabilities
+
+	def has_button(self, button):
+		"""Check if the device has a given button.
+
+		Like :meth:`~libinput.define.DevicePointer.has_button`, but answered
+		from :attr:`~libinput.define.DevicePointer.buttons` and devices
+		without :attr:`~libinput.constant.DeviceCapability.POINTER`
+		capability have no buttons.
+
+		Args:
+			button (int): Button to check for, see ``input.h`` for button
+				definitions.
+		Returns:
+			bool: :obj:`True` if the device has this button.
+		"""
+
+		return (DeviceCapability.POINTER in self.capabilities
+			and button in self.device.pointer.buttons)
+
+	def has_key(self, key):
+		"""Check if the device has a given key.
+
+		Like :meth:`~libinput.define.DeviceKeyboard.has_key`, but answered
+		from :attr:`~libinput.define.DeviceKeyboard.keys` and devices
+		without :attr:`~libinput.constant.DeviceCapability.KEYBOARD`
+		capability have no keys.
+
+		Args:
+			key (int): Key to check for, see ``input.h`` for key definitions.
+		Returns:
+			bool: :obj:`True` if the device has this key.
+		"""
+
+		return (DeviceCapability.KEYBOARD in self.capabilities
+			and key in self.device.keyboard.keys)
+
+
+def _index(index, key, handle, entry):
+
+	bucket = index.get(key)
+	if bucket is None:
+		bucket = index[key] = {}
+	bucket[handle] = entry
+
+
+def _unindex(index, key, handle):
+
+	bucket = index[key]
+	del bucket[handle]
+	if not bucket:
+		del index[key]
+
+
+class DeviceInventory(object):
+	"""The devices currently present in a libinput context.
+
+	The inventory is kept up to date from
+	:attr:`~libinput.constant.EventType.DEVICE_ADDED` and
+	:attr:`~libinput.constant.EventType.DEVICE_REMOVED` events and indexes
+	devices by sysname, (vendor, product), seat and capability, so queries
+	are dictionary lookups rather than calls into libinput::
+
+		for entry in li.devices.find(DeviceCapability.TOUCH, seat='seat0'):
+			print(entry.sysname, entry.size)
+
+	The inventory of a context is available as
+	:attr:`~libinput.LibInput.devices`, it is updated as events are read.
+	"""
+
+	def __init__(self):
+
+		self._entries = {}
+		self._by_sysname = {}
+		self._by_id = {}
+		self._by_seat = {}
+		self._by_capability = {}
+
+	def __len__(self):
+
+		return len(self._entries)
+
+	def __iter__(self):
+
+		return iter(list(self._entries.values()))
+
+	def __contains__(self, sysname):
+
+		return sysname in self._by_sysname
+
+	def feed(self, event):
+		"""Update the inventory from an event.
+
+		Args:
+			event (~libinput.event.Event): Any event, only
+				:attr:`~libinput.constant.EventType.DEVICE_ADDED` and
+				:attr:`~libinput.constant.EventType.DEVICE_REMOVED` events
+				change the inventory.
+		Returns:
+			DeviceEntry: The entry added or removed, :obj:`None` for other
+			events.
+		"""
+
+		type_ = event.type
+		if type_ == EventType.DEVICE_ADDED:
+			return self.add(event.device)
+		elif type_ == EventType.DEVICE_REMOVED:
+			return self.remove(
+				event._libinput.libinput_event_get_device(event._hevent))
+		return None
+
+	def add(self, device):
+		"""Add a device.
+
+		Adding a device that is already present returns its entry.
+
+		Args:
+			device (~libinput.define.Device): The device.
+		Returns:
+			DeviceEntry: The entry of the device.
+		"""
+
+		handle = device._handle
+		entry = self._entries.get(handle)
+		if entry is not None:
+			return entry
+		entry = self._entries[handle] = DeviceEntry(device)
+		self._by_sysname[entry.sysname] = entry
+		_index(self._by_id, (entry.id_vendor, entry.id_product), handle, entry)
+		_index(self._by_id, (entry.id_vendor, None), handle, entry)
+		_index(self._by_seat, entry.seat, handle, entry)
+		for capability in entry.capabilities:
+			_index(self._by_capability, capability, handle, entry)
+		return entry
+
+	def remove(self, device):
+		"""Remove a device.
+
+		Args:
+			device (~libinput.define.Device): The device or its handle.
+		Returns:
+			DeviceEntry: The entry of the device or :obj:`None` if it was
+			not present.
+		"""
+
+		handle = getattr(device, '_handle', device)
+		entry = self._entries.pop(handle, None)
+		if entry is None:
+			return None
+		if self._by_sysname.get(entry.sysname) is entry:
+			del self._by_sysname[entry.sysname]
+		_unindex(self._by_id, (entry.id_vendor, entry.id_product), handle)
+		_unindex(self._by_id, (entry.id_vendor, None), handle)
+		_unindex(self._by_seat, entry.seat, handle)
+		for capability in entry.capabilities:
+			_unindex(self._by_capability, capability, handle)
+		return entry
+
+	def clear(self):
+		"""Remove all devices.
+		"""
+
+		for index in (self._entries, self._by_sysname, self._by_id,
+				self._by_seat, self._by_capability):
+			index.clear()
+
+	def get(self, sysname):
+		"""Look up a device by sysname.
+
+		Args:
+			sysname (str): The system name, e.g. ``'event3'``.
+		Returns:
+			DeviceEntry: The entry or :obj:`None` if no such device is present.
+		"""
+
+		return self._by_sysname.get(sysname)
+
+	def entry(self, device):
+		"""Look up a device.
+
+		Args:
+			device (~libinput.define.Device): The device or its handle, e.g.
+				the :attr:`~libinput.event.Event.device` of an event.
+		Returns:
+			DeviceEntry: The entry or :obj:`None` if the device is not present.
+		"""
+
+		return self._entries.get(getattr(device, '_handle', device))
+
+	def find(self, capability=None, seat=None, id_vendor=None,
+			id_product=None):
+		"""Find devices matching all of the given criteria.
+
+		Args:
+			capability (~libinput.constant.DeviceCapability): A capability
+				the devices must have.
+			seat (str): The physical seat name, e.g. ``'seat0'``.
+			id_vendor (int): The vendor ID.
+			id_product (int): The product ID, only used together with
+				``id_vendor``.
+		Returns:
+			list: The matching :class:`DeviceEntry` objects.
+		"""
+
+		buckets = []
+		if capability is not None:
+			buckets.append(self._by_capability.get(capability, {}))
+		if seat is not None:
+			buckets.append(self._by_seat.get(seat, {}))
+		if id_vendor is not None:
+			buckets.append(self._by_id.get((id_vendor, id_product), {}))
+		if not buckets:
+			return list(self._entries.values())
+		buckets.sort(key=len)
+		first, rest = buckets[0], buckets[1:]
+		return [entry for handle, entry in first.items()
+			if all(handle in bucket for bucket in rest)]
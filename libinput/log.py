@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import logging
+from collections import deque
+try:
+	from time import monotonic
+except ImportError:
+	from monotonic import monotonic
+from .constant import LogPriority
+
+
+_levels = {
+	LogPriority.DEBUG: logging.DEBUG,
+	LogPriority.INFO: logging.INFO,
+	LogPriority.ERROR: logging.ERROR}
+
+
+def logger_handler(logger=None):
+	"""Return a log handler that forwards messages to :mod:`logging`.
+
+	The returned callable can be assigned to
+	:attr:`~libinput.LibInput.log_handler`. Message priorities are mapped to
+	the :mod:`logging` levels of the same name.
+
+	Args:
+		logger (logging.Logger): The logger to forward to, defaults to
+			the ``libinput`` logger.
+	Returns:
+		~collections.abc.Callable: A log handler.
+	"""
+
+	if logger is None:
+		logger = logging.getLogger('libinput')
+
+	def handler(priority, message):
+
+		logger.log(_levels[priority], message.rstrip('\n'))
+
+	return handler
+
+
+class LogQueue(object):
+	"""A bounded queue of libinput log messages.
+
+	Messages are rate limited per format string with a token bucket: each
+	format string may emit ``burst`` messages at once and ``rate`` messages
+	per second after that, further messages are suppressed and counted.
+	When the queue is full the oldest message is discarded.
+
+	Use :meth:`~libinput.LibInput.enable_log_queue` to obtain a queue
+	attached to a context.
+	"""
+
+	def __init__(self, size=1024, rate=10.0, burst=20):
+		"""Initialize an empty queue.
+
+		Args:
+			size (int): The maximum number of queued messages.
+			rate (float): Messages per second allowed per format string.
+			burst (int): Messages allowed at once per format string.
+		"""
+
+		self._queue = deque(maxlen=size)
+		self._rate = rate
+		self._burst = burst
+		self._buckets = {}
+		self._dropped = 0
+		self._suppressed = 0
+
+	def put(self, priority, template, message):
+		"""Queue a message, unless it is rate limited.
+
+		Args:
+			priority (int): The message priority.
+			template (int): A key identifying the format string.
+			message (bytes): The formatted message.
+		Returns:
+			bool: :obj:`True` if the message was queued, :obj:`False` if it
+			was suppressed.
+		"""
+
+		now = monotonic()
+		bucket = self._buckets.get(template)
+		if bucket is None:
+			bucket = self._buckets[template] = [self._burst, now, 0]
+		tokens = min(self._burst, bucket[0] + (now - bucket[1]) * self._rate)
+		bucket[1] = now
+		if tokens < 1:
+			bucket[0] = tokens
+			bucket[2] += 1
+			self._suppressed += 1
+			return False
+		bucket[0] = tokens - 1
+		if len(self._queue) == self._queue.maxlen:
+			self._dropped += 1
+		self._queue.append((priority, message, bucket[2]))
+		bucket[2] = 0
+		return True
+
+	def drain(self):
+		"""Remove and yield all queued messages, oldest first.
+
+		If messages with the same format string were suppressed before
+		a message, a note with their number is appended to it.
+
+		Yields:
+			(~libinput.constant.LogPriority, str): Message priority and
+			the message.
+		"""
+
+		queue = self._queue
+		while queue:
+			priority, message, suppressed = queue.popleft()
+			message = message.decode('utf-8', 'replace')
+			if suppressed:
+				message = '{} ({} similar messages suppressed)\n'.format(
+					message.rstrip('\n'), suppressed)
+			yield LogPriority(priority), message
+
+	def __len__(self):
+
+		return len(self._queue)
+
+	@property
+	def dropped(self):
+		"""The number of messages discarded because the queue was full.
+
+		Returns:
+			int: Number of messages.
+		"""
+
+		return self._dropped
+
+	@property
+	def suppressed(self):
+		"""The number of messages suppressed by rate limiting.
+
+		Returns:
+			int: Number of messages.
+		"""
+
+		return self._suppressed
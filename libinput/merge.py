@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from heapq import heappush, heappop
+from itertools import count
+try:
+	from time import monotonic
+except ImportError:
+	from monotonic import monotonic
+try:
+	from selectors import DefaultSelector, EVENT_READ
+except ImportError:
+	from selectors34 import DefaultSelector, EVENT_READ
+
+
+def _time(item, previous):
+
+	# Device added/removed events carry no time, keep them in place.
+	time = getattr(item, 'time', None)
+	return time if time else previous
+
+
+def merge(sources, window=0.005):
+	"""Merge events or records of several sources in time order.
+
+	This is a k-way merge over a heap that tolerates timestamps going
+	backwards by up to ``window`` within a source: an item is only yielded
+	once every source that is not exhausted has produced an item at least
+	``window`` later. Items without a time, such as
+	:class:`~libinput.event.DeviceNotifyEvent`, keep their position within
+	their source. Items that arrive later than the window allows are
+	yielded as soon as possible.
+
+	Sources are read lazily, when their next item is needed to decide what
+	comes first, so they may be recordings, e.g. the records returned by
+	:func:`~libinput.record.decode_many`, or generators. Use
+	:class:`ContextMerger` for live contexts, which must not be waited on
+	one at a time.
+
+	Args:
+		sources (~collections.abc.Iterable): Iterables of
+			:class:`~libinput.event.Event` objects or records.
+		window (float): The reorder window in seconds.
+	Yields:
+		The items of all sources, ordered by their ``time``.
+	"""
+
+	window = int(window * 1e6)
+	iterators = [iter(source) for source in sources]
+	high = [0] * len(iterators)
+	active = set(range(len(iterators)))
+	heap = []
+	sequence = count()
+
+	def pull(index):
+
+		try:
+			item = next(iterators[index])
+		except StopIteration:
+			active.discard(index)
+			return
+		time = _time(item, high[index])
+		if time > high[index]:
+			high[index] = time
+		heappush(heap, (time, next(sequence), item))
+
+	for index in range(len(iterators)):
+		pull(index)
+	while heap or active:
+		if active:
+			lagging = min(active, key=high.__getitem__)
+			if not heap or heap[0][0] > high[lagging] - window:
+				pull(lagging)
+				continue
+		yield heappop(heap)[2]
+
+
+class ContextMerger(object):
+	"""Merges the events of several live contexts in time order.
+
+	Devices may be spread over several contexts, e.g. one
+	:class:`~libinput.LibInputPath` per device for isolation. Events are
+	read from whichever context has any, held back for ``window`` seconds
+	after their timestamp and released in time order, so events delivered
+	by different contexts, or out of order by one, are put back in order as
+	long as they are not more than ``window`` late. Event times are compared
+	with ``CLOCK_MONOTONIC``, the clock libinput uses.
+
+	Recordings, e.g. records decoded with
+	:func:`~libinput.record.decode_many` or read from a
+	:class:`~libinput.ring.RingReader`, are combined with live contexts by
+	passing :meth:`events` to :func:`merge` as one source among them::
+
+		merger = ContextMerger([first, second])
+		for item in merge([merger.events(), decode_many(recording)]):
+			handle(item)
+
+	Their times must be taken with ``CLOCK_MONOTONIC`` since the same boot.
+	A recorded item is yielded once the live events have passed its time by
+	``window``, or once every other source is exhausted.
+	"""
+
+	def __init__(self, contexts, window=0.005, clock=monotonic):
+		"""Initialize a merger.
+
+		Args:
+			contexts (~collections.abc.Iterable): The
+				:class:`~libinput.LibInput` contexts.
+			window (float): The reorder window in seconds, added to the
+				latency of every event.
+			clock (~collections.abc.Callable): Returns ``CLOCK_MONOTONIC``
+				in seconds.
+		"""
+
+		self._contexts = tuple(contexts)
+		self._window = int(window * 1e6)
+		self._clock = clock
+		self._selector = DefaultSelector()
+		for index, li in enumerate(self._contexts):
+			self._selector.register(li, EVENT_READ, index)
+		self._high = [0] * len(self._contexts)
+		self._heap = []
+		self._sequence = count()
+		self._last = 0
+		self.late = 0
+
+	@property
+	def pending(self):
+		"""The number of events held back.
+
+		Returns:
+			int: Number of events.
+		"""
+
+		return len(self._heap)
+
+	def _now(self):
+
+		return int(self._clock() * 1e6)
+
+	def dispatch(self, timeout=0):
+		"""Read the contexts and return the events that are due.
+
+		Args:
+			timeout (float): Seconds to wait for events if none are due,
+				0 does not wait and :obj:`None` waits indefinitely.
+		Returns:
+			list: :class:`~libinput.event.Event` objects in time order.
+		"""
+
+		heap = self._heap
+		if heap:
+			due = (heap[0][0] + self._window - self._now()) / 1e6
+			timeout = max(0, due if timeout is None else min(timeout, due))
+		high = self._high
+		for key, _ in self._selector.select(timeout):
+			index = key.data
+			for event in key.fileobj.dispatch():
+				time = _time(event, high[index] or self._now())
+				if time > high[index]:
+					high[index] = time
+				heappush(heap, (time, next(self._sequence), event))
+		limit = self._now() - self._window
+		events = []
+		while heap and heap[0][0] <= limit:
+			time, _, event = heappop(heap)
+			if time < self._last:
+				self.late += 1
+			else:
+				self._last = time
+			events.append(event)
+		return events
+
+	def flush(self):
+		"""Return all held back events without waiting.
+
+		Returns:
+			list: :class:`~libinput.event.Event` objects in time order.
+		"""
+
+		heap = self._heap
+		events = [heappop(heap)[2] for _ in range(len(heap))]
+		return events
+
+	def events(self):
+		"""Yield the events of all contexts in time order as they are due.
+
+		Yields:
+			~libinput.event.Event: Events.
+		"""
+
+		while True:
+			for event in self.dispatch(None):
+				yield event
+
+	def close(self):
+		"""Stop watching the contexts.
+		"""
+
+		self._selector.close()
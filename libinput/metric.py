@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import, division
+
+
+class Histogram(object):
+	"""A log-linear histogram of non-negative integer values.
+
+	Values are counted in buckets whose width grows with magnitude, so that
+	every recorded value is represented with a bounded relative error
+	(about ``1 / 2 ** (significant_bits - 1)``) while the memory footprint
+	stays proportional to the logarithm of the largest value seen. Recording
+	a value is a handful of integer operations, cheap enough to be done for
+	every event.
+	"""
+
+	def __init__(self, significant_bits=7):
+		"""Initialize an empty histogram.
+
+		Args:
+			significant_bits (int): The number of significant bits preserved
+				for every value. Values below ``2 ** significant_bits`` are
+				counted exactly.
+		"""
+
+		self._bits = significant_bits
+		self._half = 1 << (significant_bits - 1)
+		self._linear = 1 << significant_bits
+		self._counts = [0] * self._linear
+		self._count = 0
+		self._total = 0
+		self._min = None
+		self._max = None
+
+	def _index(self, value):
+
+		if value < self._linear:
+			return value
+		shift = value.bit_length() - self._bits
+		return shift * self._half + (value >> shift)
+
+	def _bounds(self, index):
+
+		if index < self._linear:
+			return index, index
+		shift = index // self._half - 1
+		mantissa = index - shift * self._half
+		return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+	def record(self, value):
+		"""Count a single value.
+
+		Args:
+			value (int): The value to record, negative values are clamped
+				to 0.
+		"""
+
+		value = int(value)
+		if value < 0:
+			value = 0
+		index = self._index(value)
+		counts = self._counts
+		if index >= len(counts):
+			counts.extend([0] * (index + 1 - len(counts)))
+		counts[index] += 1
+		self._count += 1
+		self._total += value
+		if self._min is None or value < self._min:
+			self._min = value
+		if self._max is None or value > self._max:
+			self._max = value
+
+	def merge(self, other):
+		"""Add all values counted by another histogram to this one.
+
+		Args:
+			other (Histogram): A histogram with the same number of
+				significant bits.
+		Raises:
+			ValueError
+		"""
+
+		if other._bits != self._bits:
+			raise ValueError('Cannot merge histograms of different precision')
+		counts = self._counts
+		if len(other._counts) > len(counts):
+			counts.extend([0] * (len(other._counts) - len(counts)))
+		for index, count in enumerate(other._counts):
+			counts[index] += count
+		self._count += other._count
+		self._total += other._total
+		for value in (other._min, other._max):
+			if value is None:
+				continue
+			if self._min is None or value < self._min:
+				self._min = value
+			if self._max is None or value > self._max:
+				self._max = value
+
+	def reset(self):
+		"""Forget all recorded values.
+		"""
+
+		self._counts = [0] * self._linear
+		self._count = 0
+		self._total = 0
+		self._min = None
+		self._max = None
+
+	@property
+	def count(self):
+		"""The number of recorded values.
+
+		Returns:
+			int: Number of values.
+		"""
+
+		return self._count
+
+	@property
+	def min(self):
+		"""The smallest recorded value.
+
+		Returns:
+			int: The exact minimum or :obj:`None` if the histogram is empty.
+		"""
+
+		return self._min
+
+	@property
+	def max(self):
+		"""The largest recorded value.
+
+		Returns:
+			int: The exact maximum or :obj:`None` if the histogram is empty.
+		"""
+
+		return self._max
+
+	@property
+	def mean(self):
+		"""The arithmetic mean of recorded values.
+
+		Returns:
+			float: The exact mean or :obj:`None` if the histogram is empty.
+		"""
+
+		if not self._count:
+			return None
+		return self._total / self._count
+
+	def percentile(self, percent):
+		"""Return the value below which the given percentage of recorded
+		values falls.
+
+		The result is the upper bound of the bucket the percentile falls
+		into, clamped to the exact minimum and maximum.
+
+		Args:
+			percent (float): Percentile in the range [0, 100].
+		Returns:
+			int: The percentile value or :obj:`None` if the histogram
+			is empty.
+		"""
+
+		if not self._count:
+			return None
+		rank = max(1, int(round(self._count * percent / 100.0)))
+		seen = 0
+		for index, count in enumerate(self._counts):
+			seen += count
+			if seen >= rank:
+				value = self._bounds(index)[1]
+				return max(self._min, min(value, self._max))
+		return self._max
+
+	def snapshot(self, percentiles=(50, 90, 99, 99.9)):
+		"""Summarize recorded values.
+
+		Args:
+			percentiles (~collections.abc.Iterable): Percentiles to include.
+		Returns:
+			dict: A mapping with ``count``, ``min``, ``max``, ``mean`` keys
+			and a ``pNN`` key for each requested percentile.
+		"""
+
+		summary = {
+			'count': self._count,
+			'min': self._min,
+			'max': self._max,
+			'mean': self.mean}
+		for percent in percentiles:
+			key = 'p{}'.format(percent).replace('.', '_')
+			summary[key] = self.percentile(percent)
+		return summary
+
+
+def _escape(value):
+
+	return str(value).replace('\\', '\\\\').replace('\n', '\\n') \
+		.replace('"', '\\"')
+
+
+def _format_labels(labelnames, labels, extra=()):
+
+	pairs = list(zip(labelnames, labels)) + list(extra)
+	if not pairs:
+		return ''
+	return '{' + ','.join(
+		'{}="{}"'.format(name, _escape(value)) for name, value in pairs) + '}'
+
+
+class Counter(object):
+	"""A monotonically increasing value, optionally split by labels.
+
+	Label values are passed as a tuple in the order of ``labelnames``.
+	"""
+
+	type = 'counter'
+
+	def __init__(self, name, documentation, labelnames=()):
+
+		self.name = name
+		self.documentation = documentation
+		self.labelnames = tuple(labelnames)
+		self._values = {}
+
+	def inc(self, labels=(), amount=1):
+		"""Increase the value.
+
+		Args:
+			labels (tuple): Label values.
+			amount (int): The amount to add.
+		"""
+
+		self._values[labels] = self._values.get(labels, 0) + amount
+
+	def get(self, labels=()):
+		"""Return the current value.
+
+		Args:
+			labels (tuple): Label values.
+		Returns:
+			int: The current value, 0 if never set.
+		"""
+
+		return self._values.get(labels, 0)
+
+	def reset(self):
+		"""Forget all values.
+		"""
+
+		self._values.clear()
+
+	def _collect(self):
+
+		return sorted(self._values.items(), key=lambda item: str(item[0]))
+
+	def _render(self):
+
+		for labels, value in self._collect():
+			yield self.name + _format_labels(self.labelnames, labels), value
+
+	def _snapshot(self):
+
+		return dict(self._collect())
+
+
+class Gauge(Counter):
+	"""A value that can go up and down, optionally split by labels.
+
+	Instead of being set explicitly, a value can also be provided by
+	a function which is called every time the gauge is collected.
+	"""
+
+	type = 'gauge'
+
+	def set(self, value, labels=()):
+		"""Set the value.
+
+		Args:
+			value (float): The new value.
+			labels (tuple): Label values.
+		"""
+
+		self._values[labels] = value
+
+	def dec(self, labels=(), amount=1):
+		"""Decrease the value.
+
+		Args:
+			labels (tuple): Label values.
+			amount (int): The amount to subtract.
+		"""
+
+		self._values[labels] = self._values.get(labels, 0) - amount
+
+	def set_function(self, function, labels=()):
+		"""Provide the value by calling ``function`` on collection.
+
+		Args:
+			function (~collections.abc.Callable): A callable taking no
+				arguments and returning the current value.
+			labels (tuple): Label values.
+		"""
+
+		self._values[labels] = function
+
+	def reset(self):
+		"""Forget all values, except the ones provided by functions.
+		"""
+
+		for labels, value in list(self._values.items()):
+			if not callable(value):
+				del self._values[labels]
+
+	def get(self, labels=()):
+
+		value = self._values.get(labels, 0)
+		return value() if callable(value) else value
+
+	def _collect(self):
+
+		return [(labels, value() if callable(value) else value)
+			for labels, value in Counter._collect(self)]
+
+
+class Summary(Counter):
+	"""A distribution of observed values, optionally split by labels.
+
+	Every label combination is backed by a :class:`Histogram` and rendered
+	as quantiles, sum and count.
+	"""
+
+	type = 'summary'
+
+	def __init__(self, name, documentation, labelnames=(),
+			quantiles=(0.5, 0.9, 0.99), significant_bits=7):
+
+		Counter.__init__(self, name, documentation, labelnames)
+		self.quantiles = tuple(quantiles)
+		self._bits = significant_bits
+
+	def observe(self, value, labels=()):
+		"""Record an observed value.
+
+		Args:
+			value (int): The observed value.
+			labels (tuple): Label values.
+		"""
+
+		histogram = self._values.get(labels)
+		if histogram is None:
+			histogram = self._values[labels] = Histogram(self._bits)
+		histogram.record(value)
+
+	def get(self, labels=()):
+		"""Return the histogram of observed values.
+
+		Args:
+			labels (tuple): Label values.
+		Returns:
+			Histogram: The histogram or :obj:`None` if nothing was observed.
+		"""
+
+		return self._values.get(labels)
+
+	def _render(self):
+
+		for labels, histogram in self._collect():
+			for quantile in self.quantiles:
+				yield self.name + _format_labels(
+					self.labelnames, labels, (('quantile', quantile),)), \
+					histogram.percentile(quantile * 100)
+			yield self.name + '_sum' + _format_labels(
+				self.labelnames, labels), histogram._total
+			yield self.name + '_count' + _format_labels(
+				self.labelnames, labels), histogram.count
+
+	def _snapshot(self):
+
+		return dict((labels, histogram.snapshot(
+			[quantile * 100 for quantile in self.quantiles]))
+			for labels, histogram in self._collect())
+
+
+class Registry(object):
+	"""A collection of named metrics.
+
+	Metrics are created with :meth:`counter`, :meth:`gauge` and
+	:meth:`summary` and looked up by name with ``registry[name]``.
+	"""
+
+	def __init__(self):
+
+		self._metrics = {}
+
+	def _add(self, metric):
+
+		if metric.name in self._metrics:
+			raise ValueError('Duplicate metric {}'.format(metric.name))
+		self._metrics[metric.name] = metric
+		return metric
+
+	def counter(self, name, documentation, labelnames=()):
+		"""Create and register a :class:`Counter`.
+
+		Returns:
+			Counter: The new metric.
+		Raises:
+			ValueError
+		"""
+
+		return self._add(Counter(name, documentation, labelnames))
+
+	def gauge(self, name, documentation, labelnames=()):
+		"""Create and register a :class:`Gauge`.
+
+		Returns:
+			Gauge: The new metric.
+		Raises:
+			ValueError
+		"""
+
+		return self._add(Gauge(name, documentation, labelnames))
+
+	def summary(self, name, documentation, labelnames=(), **kwargs):
+		"""Create and register a :class:`Summary`.
+
+		Returns:
+			Summary: The new metric.
+		Raises:
+			ValueError
+		"""
+
+		return self._add(Summary(name, documentation, labelnames, **kwargs))
+
+	def __getitem__(self, name):
+
+		return self._metrics[name]
+
+	def __contains__(self, name):
+
+		return name in self._metrics
+
+	def __iter__(self):
+
+		return iter(sorted(self._metrics))
+
+	def reset(self):
+		"""Reset every registered metric.
+		"""
+
+		for metric in self._metrics.values():
+			metric.reset()
+
+	def render(self):
+		"""Render all metrics in the Prometheus text exposition format.
+
+		Returns:
+			str: The exposition, one sample per line.
+		"""
+
+		lines = []
+		for name in self:
+			metric = self._metrics[name]
+			lines.append('# HELP {} {}'.format(
+				name, metric.documentation.replace('\\', '\\\\')
+				.replace('\n', '\\n')))
+			lines.append('# TYPE {} {}'.format(name, metric.type))
+			for sample, value in metric._render():
+				lines.append('{} {}'.format(sample, value))
+		return '\n'.join(lines) + '\n'
+
+	def snapshot(self):
+		"""Return the current value of all metrics.
+
+		Returns:
+			dict: A mapping of metric names to mappings of label value tuples
+			to values. :class:`Summary` values are summaries as returned by
+			:meth:`Histogram.snapshot`.
+		"""
+
+		return dict((name, self._metrics[name]._snapshot()) for name in self)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import multiprocessing
+try:
+	from queue import Empty
+except ImportError:
+	from Queue import Empty
+try:
+	from selectors import DefaultSelector, EVENT_READ
+except ImportError:
+	from selectors34 import DefaultSelector, EVENT_READ
+from . import LibInput
+from .constant import ContextType
+from .record import Encoder, decode_many
+
+
+def _worker(seat, queue, stop, interval):
+
+	li = LibInput(ContextType.UDEV)
+	li.assign_seat(seat)
+	encoder = Encoder()
+	selector = DefaultSelector()
+	selector.register(li, EVENT_READ)
+	try:
+		while not stop.is_set():
+			if not selector.select(interval):
+				continue
+			events = [event for event in li.dispatch() if event is not None]
+			if events:
+				queue.put((seat, bytes(encoder.encode_many(events))))
+	except KeyboardInterrupt:
+		pass
+	finally:
+		selector.close()
+
+
+class SeatManager(object):
+	"""Runs a udev context per seat and merges their events.
+
+	A context can only be assigned a single seat, so serving several seats
+	takes several contexts. By default all contexts are polled by a single
+	selector in the calling process. Events of the seats that are ready at
+	the same time are interleaved round-robin, at most ``quantum`` events of
+	a seat at a time, starting with a different seat every round, so a busy
+	seat cannot starve the others::
+
+		manager = SeatManager(['seat0', 'seat1'])
+		for seat, event in manager.events():
+			print(seat, event.type)
+
+	With ``processes`` every seat is served by a worker process instead,
+	which sends its events back through a shared queue as
+	:mod:`libinput.record` records. Records rather than
+	:class:`~libinput.event.Event` objects are then returned, device ids
+	in the records are unique per seat.
+	"""
+
+	def __init__(self, seats, processes=False, quantum=32, interval=0.25):
+		"""Create a context, or start a worker process, for every seat.
+
+		Args:
+			seats (~collections.abc.Iterable): Seat names, e.g.
+				``['seat0', 'seat1']``.
+			processes (bool): Serve every seat in a worker process.
+			quantum (int): The number of events of a seat returned before
+				the next seat's turn.
+			interval (float): Seconds between checks whether a worker process
+				should stop.
+		"""
+
+		self._seats = tuple(seats)
+		self._quantum = quantum
+		self._interval = interval
+		self._start = 0
+		self._contexts = {}
+		self._workers = []
+		self._selector = None
+		self._queue = None
+		if processes:
+			self._queue = multiprocessing.Queue()
+			self._stop = multiprocessing.Event()
+			for seat in self._seats:
+				worker = multiprocessing.Process(target=_worker,
+					args=(seat, self._queue, self._stop, interval),
+					name='libinput-{}'.format(seat))
+				worker.daemon = True
+				worker.start()
+				self._workers.append(worker)
+		else:
+			self._selector = DefaultSelector()
+			for seat in self._seats:
+				li = LibInput(ContextType.UDEV)
+				li.assign_seat(seat)
+				self._contexts[seat] = li
+				self._selector.register(li, EVENT_READ, seat)
+
+	@property
+	def seats(self):
+		"""The managed seats.
+
+		Returns:
+			tuple: Seat names.
+		"""
+
+		return self._seats
+
+	@property
+	def contexts(self):
+		"""The context of every seat, empty when worker processes are used.
+
+		Returns:
+			dict: A mapping of seat names to :class:`~libinput.LibInput`.
+		"""
+
+		return dict(self._contexts)
+
+	def dispatch(self, timeout=0):
+		"""Wait for and read events of any seat.
+
+		Args:
+			timeout (float): Seconds to wait for events, 0 does not wait and
+				:obj:`None` waits indefinitely.
+		Returns:
+			list: (seat, event) tuples, where event is an
+			:class:`~libinput.event.Event` or, with worker processes,
+			a record as returned by :func:`~libinput.record.decode`.
+		"""
+
+		if self._queue is not None:
+			return self._receive(timeout)
+		batches = []
+		for key, _ in self._selector.select(timeout):
+			events = [event for event in key.fileobj.dispatch()
+				if event is not None]
+			if events:
+				batches.append((key.data, events))
+		if len(batches) < 2:
+			return [(seat, event) for seat, events in batches
+				for event in events]
+		# Rotate the seat served first so ties do not always favor one seat.
+		self._start = (self._start + 1) % len(batches)
+		batches = batches[self._start:] + batches[:self._start]
+		merged = []
+		quantum = self._quantum
+		offset = 0
+		while batches:
+			for seat, events in batches:
+				merged.extend(
+					(seat, event) for event in events[offset:offset + quantum])
+			offset += quantum
+			batches = [batch for batch in batches if len(batch[1]) > offset]
+		return merged
+
+	def _receive(self, timeout):
+
+		merged = []
+		try:
+			item = self._queue.get(timeout != 0, timeout)
+			while True:
+				seat, buffer = item
+				merged.extend((seat, record) for record in decode_many(buffer))
+				item = self._queue.get_nowait()
+		except Empty:
+			pass
+		return merged
+
+	def events(self):
+		"""Yield the events of all seats as they arrive.
+
+		Yields:
+			(str, ~libinput.event.Event): The seat name and the event, see
+			:meth:`dispatch`.
+		"""
+
+		while True:
+			for item in self.dispatch(None):
+				yield item
+
+	def close(self):
+		"""Stop the worker processes and release the contexts.
+		"""
+
+		if self._queue is not None:
+			self._stop.set()
+			# A worker only exits once the events it queued were read.
+			while any(worker.is_alive() for worker in self._workers):
+				self._receive(self._interval)
+			for worker in self._workers:
+				worker.join()
+			self._workers = []
+			self._queue.close()
+			self._queue = None
+		if self._selector is not None:
+			self._selector.close()
+			self._selector = None
+			self._contexts.clear()
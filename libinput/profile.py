@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import logging
+from fnmatch import fnmatchcase
+from .constant import EventType
+from .device import _config_settings, _decode_setting
+
+
+_logger = logging.getLogger(__name__)
+_types = dict(((section, name), type_)
+	for section, name, _, type_ in _config_settings)
+
+
+class Rule(object):
+	"""A configuration applied to the devices matching all given criteria.
+
+	Criteria that are not given match any device, a rule without criteria
+	thus matches every device.
+	"""
+
+	def __init__(self, config, name=None, id_vendor=None, id_product=None,
+			sysname=None, capabilities=()):
+		"""Initialize a rule.
+
+		Args:
+			config (dict): The configuration to apply, in the format of
+				:meth:`~libinput.define.DeviceConfig.snapshot`, e.g.
+				``{'accel': {'speed': 0.5}, 'tap': {'enabled': 'ENABLED'}}``.
+			name (str): The device name, may contain :mod:`fnmatch`
+				wildcards, e.g. ``'*Touchpad*'``.
+			id_vendor (int): The vendor ID.
+			id_product (int): The product ID.
+			sysname (str): The system name, may contain wildcards.
+			capabilities (~collections.abc.Iterable): The
+				:class:`~libinput.constant.DeviceCapability` the device must
+				all have.
+		"""
+
+		self.config = config
+		self.name = name
+		self.id_vendor = id_vendor
+		self.id_product = id_product
+		self.sysname = sysname
+		self.capabilities = frozenset(capabilities)
+
+	def matches(self, descriptor):
+		"""Check if the rule matches a device.
+
+		Args:
+			descriptor (~libinput.define.DeviceDescriptor): The
+				:attr:`~libinput.define.Device.descriptor` of the device.
+		Returns:
+			bool: :obj:`True` if all criteria match.
+		"""
+
+		return ((self.id_vendor is None
+				or self.id_vendor == descriptor.id_vendor)
+			and (self.id_product is None
+				or self.id_product == descriptor.id_product)
+			and (self.name is None or fnmatchcase(descriptor.name, self.name))
+			and (self.sysname is None
+				or fnmatchcase(descriptor.sysname, self.sysname))
+			and self.capabilities.issubset(descriptor.capabilities))
+
+
+def _is_pattern(string):
+
+	return any(char in string for char in '*?[')
+
+
+def _validate(config):
+
+	if not isinstance(config, dict):
+		raise ValueError('A rule config must be a dict of sections')
+	for section, values in config.items():
+		if not isinstance(values, dict):
+			raise ValueError('Section {} must be a dict'.format(section))
+		for name, value in values.items():
+			key = (section, name[len('default_'):]
+				if name.startswith('default_') else name)
+			if key not in _types:
+				raise ValueError('Unknown setting {}.{}'.format(section, name))
+			if value is None:
+				continue
+			try:
+				_decode_setting(_types[key], value)
+			except (KeyError, ValueError, TypeError):
+				raise ValueError('Invalid value {!r} for {}.{}'.format(
+					value, section, name))
+
+
+def _merge(configs):
+
+	merged = {}
+	for config in configs:
+		for section, values in config.items():
+			merged.setdefault(section, {}).update(values)
+	return merged
+
+
+class ProfileEngine(object):
+	"""Applies configuration rules to devices as they are added.
+
+	Rules are indexed by their most selective criterion, so only the rules
+	that can match a device are tested. The configurations of all matching
+	rules are merged in the order the rules were given, later rules taking
+	precedence, and applied with
+	:meth:`~libinput.define.DeviceConfig.apply`.
+
+	Results are cached per device identity, i.e. name, vendor and product
+	IDs and capabilities, and sysname if any rule matches on it. Devices
+	always start out with their default configuration, so when a known
+	device is plugged in again the cached defaults stand in for reading its
+	configuration and only the setters are called::
+
+		engine = ProfileEngine([
+			Rule({'tap': {'enabled': 'ENABLED'}},
+				capabilities=[DeviceCapability.POINTER], name='*Touchpad*'),
+			Rule({'accel': {'speed': -0.5}}, id_vendor=0x046d)])
+		li.profiles = engine
+
+	A device the rules fail to apply to, e.g. because it was unplugged
+	meanwhile, is logged to the ``libinput.profile`` :mod:`logging` logger
+	and does not stop the events.
+
+	Attributes:
+		applied (dict): The statuses of the last :meth:`feed` per device
+			sysname, while the device is present.
+	"""
+
+	def __init__(self, rules=()):
+		"""Initialize an engine.
+
+		Args:
+			rules (~collections.abc.Iterable): :class:`Rule` objects.
+		Raises:
+			ValueError: If the config of a rule is invalid, see :meth:`add`.
+		"""
+
+		self._rules = []
+		self._by_id = {}
+		self._by_sysname = {}
+		self._by_name = {}
+		self._by_capability = {}
+		self._other = []
+		self._uses_sysname = False
+		self._profiles = {}
+		self._defaults = {}
+		self.applied = {}
+		for rule in rules:
+			self.add(rule)
+
+	@property
+	def rules(self):
+		"""The rules, in order of precedence.
+
+		Returns:
+			tuple: :class:`Rule` objects.
+		"""
+
+		return tuple(self._rules)
+
+	def add(self, rule):
+		"""Add a rule, taking precedence over the rules added before.
+
+		Args:
+			rule (Rule): The rule.
+		Raises:
+			ValueError: If the config of the rule names an unknown section or
+				setting or holds an invalid value, e.g. an unknown
+				enumeration name.
+		"""
+
+		_validate(rule.config)
+		index = len(self._rules)
+		self._rules.append(rule)
+		if rule.id_vendor is not None and rule.id_product is not None:
+			self._by_id.setdefault(
+				(rule.id_vendor, rule.id_product), []).append(index)
+		elif rule.sysname is not None and not _is_pattern(rule.sysname):
+			self._by_sysname.setdefault(rule.sysname, []).append(index)
+		elif rule.name is not None and not _is_pattern(rule.name):
+			self._by_name.setdefault(rule.name, []).append(index)
+		elif rule.capabilities:
+			# Any capability of the rule does, all are tested on a match.
+			capability = min(rule.capabilities, key=lambda cap: cap.value)
+			self._by_capability.setdefault(capability, []).append(index)
+		else:
+			self._other.append(index)
+		if rule.sysname is not None:
+			self._uses_sysname = True
+		self._profiles.clear()
+
+	def _identity(self, descriptor):
+
+		return (descriptor.name, descriptor.id_vendor, descriptor.id_product,
+			descriptor.capabilities,
+			descriptor.sysname if self._uses_sysname else None)
+
+	def match(self, device):
+		"""Return the merged configuration of the rules matching a device.
+
+		Args:
+			device (~libinput.define.Device): The device.
+		Returns:
+			dict: The configuration, empty if no rule matches.
+		"""
+
+		descriptor = device.descriptor
+		identity = self._identity(descriptor)
+		profile = self._profiles.get(identity)
+		if profile is None:
+			candidates = set(self._other)
+			candidates.update(self._by_id.get(
+				(descriptor.id_vendor, descriptor.id_product), ()))
+			candidates.update(self._by_sysname.get(descriptor.sysname, ()))
+			candidates.update(self._by_name.get(descriptor.name, ()))
+			for capability in descriptor.capabilities:
+				candidates.update(self._by_capability.get(capability, ()))
+			profile = self._profiles[identity] = _merge(
+				self._rules[index].config for index in sorted(candidates)
+				if self._rules[index].matches(descriptor))
+		return profile
+
+	def apply(self, device):
+		"""Apply the matching rules to a device.
+
+		The device is expected to have its default configuration unless it
+		was not seen before, see :class:`ProfileEngine`.
+
+		Args:
+			device (~libinput.define.Device): The device.
+		Returns:
+			dict: The statuses returned by
+			:meth:`~libinput.define.DeviceConfig.apply`.
+		"""
+
+		profile = self.match(device)
+		if not profile:
+			return {}
+		identity = self._identity(device.descriptor)
+		defaults = self._defaults.get(identity)
+		if defaults is None:
+			snapshot = device.config.snapshot()
+			defaults = self._defaults[identity] = dict(
+				(section, dict((name[len('default_'):], value)
+					for name, value in values.items()
+					if name.startswith('default_')))
+				for section, values in snapshot.items())
+			current = snapshot
+		else:
+			current = defaults
+		return device.config.apply(profile, current)
+
+	def feed(self, event):
+		"""Apply the matching rules to the device of a
+		:attr:`~libinput.constant.EventType.DEVICE_ADDED` event.
+
+		The statuses are also kept in :attr:`applied` until the device is
+		removed.
+
+		Args:
+			event (~libinput.event.Event): Any event.
+		Returns:
+			dict: The statuses for
+			:attr:`~libinput.constant.EventType.DEVICE_ADDED` events, empty
+			if the rules failed to apply, otherwise :obj:`None`.
+		"""
+
+		type_ = event.type
+		if type_ == EventType.DEVICE_ADDED:
+			device = event.device
+			try:
+				statuses = self.apply(device)
+			except Exception:
+				_logger.exception(
+					'Failed to apply profile to %s', device.sysname)
+				statuses = {}
+			self.applied[device.sysname] = statuses
+			return statuses
+		elif type_ == EventType.DEVICE_REMOVED:
+			self.applied.pop(event.device.sysname, None)
+		return None
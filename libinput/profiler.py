@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import sys
+try:
+	from time import perf_counter
+except ImportError:
+	from monotonic import monotonic as perf_counter
+from .event import Event
+
+
+class Profiler(object):
+	"""Counts and times foreign calls into libinput and libudev.
+
+	Every call is attributed to the function name, to the wrapper property
+	or method that issued it (e.g. ``PointerEvent.delta``) and, for calls
+	issued by an :class:`~libinput.event.Event`, to the event type.
+
+	Use :meth:`~libinput.LibInput.enable_profiling` to obtain a profiler
+	attached to a context.
+	"""
+
+	def __init__(self, libinput):
+
+		self._get_type = libinput.libinput_event_get_type
+		self._stats = {}
+
+	def _scope(self, frame):
+
+		owner = frame.f_locals.get('self')
+		if owner is None:
+			return None, frame.f_code.co_name
+		scope = '{}.{}'.format(type(owner).__name__, frame.f_code.co_name)
+		if isinstance(owner, Event):
+			return self._get_type(owner._hevent), scope
+		return None, scope
+
+	def _record(self, key, elapsed):
+
+		stat = self._stats.get(key)
+		if stat is None:
+			self._stats[key] = [1, elapsed]
+		else:
+			stat[0] += 1
+			stat[1] += elapsed
+
+	def reset(self):
+		"""Forget all recorded calls.
+		"""
+
+		self._stats.clear()
+
+	def _group(self, index, top):
+
+		groups = {}
+		for key, (calls, elapsed) in self._stats.items():
+			functions = groups.setdefault(key[index], {})
+			stat = functions.setdefault(key[2], [0, 0.0])
+			stat[0] += calls
+			stat[1] += elapsed
+		return dict((group, self._rank(functions, top))
+			for group, functions in groups.items())
+
+	@staticmethod
+	def _rank(functions, top):
+
+		ranked = sorted(((name, calls, elapsed)
+			for name, (calls, elapsed) in functions.items()),
+			key=lambda stat: stat[2], reverse=True)
+		return ranked[:top] if top else ranked
+
+	def functions(self, top=None):
+		"""Return the most expensive foreign functions.
+
+		Args:
+			top (int): Limit the result to this many functions.
+		Returns:
+			list: (function name, number of calls, total seconds) tuples,
+			most expensive first.
+		"""
+
+		functions = {}
+		for (_, _, name), (calls, elapsed) in self._stats.items():
+			stat = functions.setdefault(name, [0, 0.0])
+			stat[0] += calls
+			stat[1] += elapsed
+		return self._rank(functions, top)
+
+	def by_event_type(self, top=None):
+		"""Return the most expensive foreign functions per event type.
+
+		Calls not issued by an event are grouped under :obj:`None`.
+
+		Args:
+			top (int): Limit each group to this many functions.
+		Returns:
+			dict: A mapping of :class:`~libinput.constant.EventType` to
+			lists as returned by :meth:`functions`.
+		"""
+
+		return self._group(0, top)
+
+	def by_property(self, top=None):
+		"""Return the most expensive foreign functions per property
+		or method.
+
+		Args:
+			top (int): Limit each group to this many functions.
+		Returns:
+			dict: A mapping of ``'Class.attribute'`` names to lists as
+			returned by :meth:`functions`.
+		"""
+
+		return self._group(1, top)
+
+	def report(self, top=10):
+		"""Format the most expensive foreign functions overall and
+		per property as text.
+
+		Args:
+			top (int): Number of functions to list per section.
+		Returns:
+			str: A human readable report.
+		"""
+
+		lines = ['{:>10} {:>12}  {}'.format('calls', 'usec', 'function')]
+		for name, calls, elapsed in self.functions(top):
+			lines.append('{:>10} {:>12.1f}  {}'.format(
+				calls, elapsed * 1e6, name))
+		properties = self.by_property(top)
+		ranked = sorted(properties, reverse=True,
+			key=lambda scope: sum(stat[2] for stat in properties[scope]))
+		for scope in ranked[:top]:
+			lines.append('')
+			lines.append(scope)
+			for name, calls, elapsed in properties[scope]:
+				lines.append('{:>10} {:>12.1f}  {}'.format(
+					calls, elapsed * 1e6, name))
+		return '\n'.join(lines)
+
+
+class _ProfiledFunction(object):
+
+	def __init__(self, function, name, profiler):
+
+		object.__setattr__(self, '_function', function)
+		object.__setattr__(self, '_name', name)
+		object.__setattr__(self, '_profiler', profiler)
+
+	def __getattr__(self, name):
+
+		return getattr(self._function, name)
+
+	def __setattr__(self, name, value):
+
+		setattr(self._function, name, value)
+
+	def __call__(self, *args):
+
+		# Attribution is resolved before the call, the call may destroy
+		# the object being inspected.
+		type_, scope = self._profiler._scope(sys._getframe(1))
+		start = perf_counter()
+		try:
+			return self._function(*args)
+		finally:
+			self._profiler._record(
+				(type_, scope, self._name), perf_counter() - start)
+
+
+class _ProfiledLibrary(object):
+
+	def __init__(self, library, profiler):
+
+		object.__setattr__(self, '_library', library)
+		object.__setattr__(self, '_profiler', profiler)
+
+	def __getattr__(self, name):
+
+		function = _ProfiledFunction(
+			getattr(self._library, name), name, self._profiler)
+		object.__setattr__(self, name, function)
+		return function
+
+	def __setattr__(self, name, value):
+
+		setattr(self._library, name, value)
+		self.__dict__.pop(name, None)
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import os
+import fcntl
+import threading
+from collections import deque
+from errno import EAGAIN, EINTR
+try:
+	from selectors import DefaultSelector, EVENT_READ
+except ImportError:
+	from selectors34 import DefaultSelector, EVENT_READ
+from .constant import EventType, OverflowPolicy
+from .record import Encoder, decode_many
+
+
+def _coalesce(queue, record):
+
+	queued = queue[-1]
+	type_ = record.type
+	if queued.type != type_ or queued.device != record.device:
+		return False
+	if type_ == EventType.POINTER_MOTION:
+		queue[-1] = record._replace(dx=queued.dx + record.dx,
+			dy=queued.dy + record.dy,
+			dx_unaccelerated=queued.dx_unaccelerated + record.dx_unaccelerated,
+			dy_unaccelerated=queued.dy_unaccelerated + record.dy_unaccelerated)
+		return True
+	elif type_ == EventType.POINTER_MOTION_ABSOLUTE:
+		queue[-1] = record
+		return True
+	return False
+
+
+def _coalesce_frame(queue, group):
+
+	# A frame group is the touch motion of a device up to its frame. It
+	# replaces the last queued group if that moved every touch point it
+	# moves, so no position and no frame boundary is lost.
+	frame = group[-1]
+	queued = queue[-1]
+	if queued.type != EventType.TOUCH_FRAME or queued.device != frame.device:
+		return False
+	slots = {}
+	index = len(queue) - 1
+	while index > 0:
+		queued = queue[index - 1]
+		if (queued.type != EventType.TOUCH_MOTION
+				or queued.device != frame.device):
+			break
+		index -= 1
+		slots.setdefault(queued.slot, index)
+	if not slots or any(record.slot not in slots for record in group[:-1]):
+		return False
+	for record in group[:-1]:
+		queue[slots[record.slot]] = record
+	queue[-1] = frame
+	return True
+
+
+_touch_group = frozenset((EventType.TOUCH_MOTION, EventType.TOUCH_FRAME))
+
+
+class EventPump(object):
+	"""Reads a context on a background thread.
+
+	The thread waits for and dispatches events and takes a snapshot of
+	every event as a :mod:`libinput.record` record, so no native object is
+	shared between threads. Records are handed to the consumer through
+	a bounded queue and :meth:`fileno` becomes readable whenever the queue
+	is no longer empty. It can be watched by the main loop of a toolkit, so
+	its thread never blocks on libinput::
+
+		pump = EventPump(li)
+		loop.add_reader(pump.fileno(), lambda: handle(pump.get()))
+
+	With Qt a :class:`QSocketNotifier` and with GLib
+	:func:`GLib.io_add_watch` serve the same purpose.
+
+	When the consumer falls ``size`` records behind, ``policy`` decides what
+	happens to new records:
+
+	:attr:`~libinput.constant.OverflowPolicy.BLOCK`
+		The thread stops reading until the consumer catches up, and
+		libinput queues events meanwhile.
+	:attr:`~libinput.constant.OverflowPolicy.OVERWRITE`
+		The oldest queued record is discarded.
+	:attr:`~libinput.constant.OverflowPolicy.SKIP`
+		The new record is discarded.
+	:attr:`~libinput.constant.OverflowPolicy.COALESCE`
+		Pointer motion is merged into queued motion of the same device
+		that is last in the queue, relative motion is summed. The touch
+		motion of a frame replaces the last queued frame of the same
+		device if that moved the same touch points. Other records block as
+		with :attr:`~libinput.constant.OverflowPolicy.BLOCK`, so no button,
+		key, switch or touch frame is lost.
+
+	Records coalesced into another do not count as dropped.
+	"""
+
+	def __init__(self, li, size=1024, policy=OverflowPolicy.BLOCK,
+			interval=0.25):
+		"""Start the thread.
+
+		Args:
+			li (~libinput.LibInput): The context to read. It must not be
+				read by any other thread while the pump runs.
+			size (int): The maximum number of queued records.
+			policy (~libinput.constant.OverflowPolicy): What to do when the
+				queue is full.
+			interval (float): Seconds between checks whether the thread
+				should stop.
+		"""
+
+		self._li = li
+		self._size = size
+		self._policy = policy
+		self._interval = interval
+		self._queue = deque()
+		self._lock = threading.Lock()
+		self._space = threading.Condition(self._lock)
+		self._signalled = False
+		self._dropped = 0
+		self._coalesced = 0
+		self._error = None
+		self._wakeup, self._notify = os.pipe()
+		fcntl.fcntl(self._wakeup, fcntl.F_SETFL,
+			fcntl.fcntl(self._wakeup, fcntl.F_GETFL) | os.O_NONBLOCK)
+		self._stop = threading.Event()
+		self._thread = threading.Thread(
+			target=self._run, name='libinput-pump')
+		self._thread.daemon = True
+		self._thread.start()
+
+	@property
+	def dropped(self):
+		"""The number of records discarded because the queue was full.
+
+		Returns:
+			int: Number of records.
+		"""
+
+		return self._dropped
+
+	@property
+	def coalesced(self):
+		"""The number of records merged into a queued record.
+
+		Returns:
+			int: Number of records.
+		"""
+
+		return self._coalesced
+
+	@property
+	def pending(self):
+		"""The number of queued records.
+
+		Returns:
+			int: Number of records.
+		"""
+
+		return len(self._queue)
+
+	def fileno(self):
+		"""Return the file descriptor that becomes readable when records are
+		queued.
+
+		Returns:
+			int: A file descriptor.
+		"""
+
+		return self._wakeup
+
+	def _run(self):
+
+		encoder = Encoder()
+		selector = DefaultSelector()
+		selector.register(self._li, EVENT_READ)
+		try:
+			while not self._stop.is_set():
+				if not selector.select(self._interval):
+					continue
+				events = [event for event in self._li.dispatch()
+					if event is not None]
+				if events:
+					self._put(decode_many(encoder.encode_many(events)))
+		except Exception as error:
+			self._error = error
+			os.write(self._notify, b'\0')
+		finally:
+			selector.close()
+
+	def _put(self, records):
+
+		queue = self._queue
+		coalesce = self._policy == OverflowPolicy.COALESCE
+		# Touch motion is held back until its frame shows whether the
+		# whole group can be coalesced.
+		group = []
+		with self._lock:
+			for record in records:
+				type_ = record.type
+				if group and (record.device != group[0].device
+						or type_ not in _touch_group):
+					if not self._append_all(group):
+						return
+					group = []
+				if group or (coalesce and type_ == EventType.TOUCH_MOTION
+						and len(queue) >= self._size):
+					group.append(record)
+					if type_ != EventType.TOUCH_FRAME:
+						continue
+					if _coalesce_frame(queue, group):
+						self._coalesced += len(group)
+					elif not self._append_all(group):
+						return
+					group = []
+				elif not self._append(record):
+					return
+			if not self._append_all(group):
+				return
+			self._wake()
+
+	def _append_all(self, records):
+
+		for record in records:
+			if not self._append(record):
+				return False
+		return True
+
+	def _append(self, record):
+
+		# Called with the lock held, returns False once the pump stops.
+		queue = self._queue
+		policy = self._policy
+		if len(queue) >= self._size:
+			if policy == OverflowPolicy.OVERWRITE:
+				queue.popleft()
+				self._dropped += 1
+			elif policy == OverflowPolicy.SKIP:
+				self._dropped += 1
+				return True
+			elif (policy == OverflowPolicy.COALESCE
+					and _coalesce(queue, record)):
+				self._coalesced += 1
+				return True
+			else:
+				while (len(queue) >= self._size
+						and not self._stop.is_set()):
+					self._wake()
+					self._space.wait(self._interval)
+				if self._stop.is_set():
+					return False
+		queue.append(record)
+		return True
+
+	def _wake(self):
+
+		# Called with the lock held, the consumer clears the flag once it
+		# emptied the pipe.
+		if self._queue and not self._signalled:
+			self._signalled = True
+			os.write(self._notify, b'\0')
+
+	def get(self, timeout=0):
+		"""Return all queued records.
+
+		Args:
+			timeout (float): Seconds to wait for records if none are queued,
+				0 does not wait and :obj:`None` waits indefinitely.
+		Returns:
+			list: Records as returned by :func:`~libinput.record.decode`,
+			oldest first.
+		Raises:
+			Exception: The error that stopped the thread, if any.
+		"""
+
+		if not self._queue and timeout != 0:
+			selector = DefaultSelector()
+			selector.register(self._wakeup, EVENT_READ)
+			try:
+				selector.select(timeout)
+			finally:
+				selector.close()
+		# The pipe is emptied before the queue, so records queued in between
+		# are either taken now or signalled again.
+		try:
+			while os.read(self._wakeup, 4096):
+				pass
+		except OSError as error:
+			if error.errno not in (EAGAIN, EINTR):
+				raise
+		with self._lock:
+			records = list(self._queue)
+			self._queue.clear()
+			self._signalled = False
+			self._space.notify()
+		if not records and self._error is not None:
+			raise self._error
+		return records
+
+	def events(self):
+		"""Yield the records as they are queued.
+
+		Yields:
+			A record as returned by :func:`~libinput.record.decode`.
+		"""
+
+		while True:
+			for record in self.get(None):
+				yield record
+
+	def close(self):
+		"""Stop the thread and release the wakeup file descriptors.
+
+		Queued records are discarded.
+		"""
+
+		if self._thread is None:
+			return
+		self._stop.set()
+		with self._lock:
+			self._space.notify()
+		self._thread.join()
+		self._thread = None
+		os.close(self._wakeup)
+		os.close(self._notify)
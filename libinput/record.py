@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from collections import namedtuple
+from struct import Struct
+from .constant import EventType, PointerAxis, TabletToolAxis
+from .define import TabletTool
+
+
+_header = '<HIQ'
+_type = Struct('<H')
+
+
+class _Family(object):
+
+	def __init__(self, name, fields, payload, extract, convert=None):
+
+		self.record = namedtuple(name, ('type', 'device', 'time') + fields)
+		self.struct = Struct(_header + payload)
+		self.extract = extract
+		self.convert = convert
+
+
+def _device(event, type_):
+
+	sysname = event.device.sysname.encode()
+	return 0, sysname
+
+
+def _device_convert(values):
+
+	return values[:3] + (values[3].rstrip(b'\0').decode(),)
+
+
+def _keyboard(event, type_):
+
+	lib, handle = event._libinput, event._handle
+	return (lib.libinput_event_keyboard_get_time_usec(handle),
+		lib.libinput_event_keyboard_get_key(handle),
+		lib.libinput_event_keyboard_get_key_state(handle).value,
+		lib.libinput_event_keyboard_get_seat_key_count(handle))
+
+
+def _pointer_motion(event, type_):
+
+	lib, handle = event._libinput, event._handle
+	return (lib.libinput_event_pointer_get_time_usec(handle),
+		lib.libinput_event_pointer_get_dx(handle),
+		lib.libinput_event_pointer_get_dy(handle),
+		lib.libinput_event_pointer_get_dx_unaccelerated(handle),
+		lib.libinput_event_pointer_get_dy_unaccelerated(handle))
+
+
+def _pointer_absolute(event, type_):
+
+	lib, handle = event._libinput, event._handle
+	return (lib.libinput_event_pointer_get_time_usec(handle),
+		lib.libinput_event_pointer_get_absolute_x(handle),
+		lib.libinput_event_pointer_get_absolute_y(handle))
+
+
+def _pointer_button(event, type_):
+
+	lib, handle = event._libinput, event._handle
+	return (lib.libinput_event_pointer_get_time_usec(handle),
+		lib.libinput_event_pointer_get_button(handle),
+		lib.libinput_event_pointer_get_button_state(handle).value,
+		lib.libinput_event_pointer_get_seat_button_count(handle))
+
+
+_scroll_sources = {
+	EventType.POINTER_SCROLL_WHEEL: 1,
+	EventType.POINTER_SCROLL_FINGER: 2,
+	EventType.POINTER_SCROLL_CONTINUOUS: 3}
+
+
+def _pointer_axis(event, type_):
+
+	lib, handle = event._libinput, event._handle
+	vertical = horizontal = vertical_discrete = horizontal_discrete = 0.0
+	has_vertical = lib.libinput_event_pointer_has_axis(
+		handle, PointerAxis.SCROLL_VERTICAL)
+	has_horizontal = lib.libinput_event_pointer_has_axis(
+		handle, PointerAxis.SCROLL_HORIZONTAL)
+	# The values are read through the event, so the values of events merged
+	# into it by a LoadShedder are included.
+	if type_ == EventType.POINTER_AXIS:
+		source = lib.libinput_event_pointer_get_axis_source(handle).value
+		value = event.get_axis_value
+		discrete = event.get_axis_value_discrete
+	else:
+		# Scroll events carry the scroll value and, for wheels, the wheel
+		# movement in 1/120ths of a click in place of the discrete value.
+		source = _scroll_sources[type_]
+		value = event.get_scroll_value
+		if type_ == EventType.POINTER_SCROLL_WHEEL:
+			discrete = event.get_scroll_value_v120
+		else:
+			discrete = None
+	if has_vertical:
+		vertical = value(PointerAxis.SCROLL_VERTICAL)
+		if discrete is not None:
+			vertical_discrete = discrete(PointerAxis.SCROLL_VERTICAL)
+	if has_horizontal:
+		horizontal = value(PointerAxis.SCROLL_HORIZONTAL)
+		if discrete is not None:
+			horizontal_discrete = discrete(PointerAxis.SCROLL_HORIZONTAL)
+	return (lib.libinput_event_pointer_get_time_usec(handle), source,
+		has_vertical, has_horizontal, vertical, horizontal,
+		vertical_discrete, horizontal_discrete)
+
+
+def _touch(event, type_):
+
+	lib, handle = event._libinput, event._handle
+	slot = seat_slot = -1
+	x = y = 0.0
+	if type_ != EventType.TOUCH_FRAME:
+		slot = lib.libinput_event_touch_get_slot(handle)
+		seat_slot = lib.libinput_event_touch_get_seat_slot(handle)
+	if type_ in {EventType.TOUCH_DOWN, EventType.TOUCH_MOTION}:
+		x = lib.libinput_event_touch_get_x(handle)
+		y = lib.libinput_event_touch_get_y(handle)
+	return (lib.libinput_event_touch_get_time_usec(handle),
+		slot, seat_slot, x, y)
+
+
+_gesture_updates = {EventType.GESTURE_SWIPE_UPDATE,
+	EventType.GESTURE_PINCH_UPDATE}
+_gesture_ends = {EventType.GESTURE_SWIPE_END, EventType.GESTURE_PINCH_END,
+	EventType.GESTURE_HOLD_END}
+_gesture_pinches = {EventType.GESTURE_PINCH_BEGIN,
+	EventType.GESTURE_PINCH_UPDATE, EventType.GESTURE_PINCH_END}
+
+
+def _gesture(event, type_):
+
+	lib, handle = event._libinput, event._handle
+	cancelled = False
+	dx = dy = dx_unaccelerated = dy_unaccelerated = angle_delta = 0.0
+	scale = 1.0
+	if type_ in _gesture_ends:
+		cancelled = lib.libinput_event_gesture_get_cancelled(handle)
+	if type_ in _gesture_updates:
+		dx = lib.libinput_event_gesture_get_dx(handle)
+		dy = lib.libinput_event_gesture_get_dy(handle)
+		dx_unaccelerated = lib.libinput_event_gesture_get_dx_unaccelerated(
+			handle)
+		dy_unaccelerated = lib.libinput_event_gesture_get_dy_unaccelerated(
+			handle)
+	if type_ in _gesture_pinches:
+		scale = lib.libinput_event_gesture_get_scale(handle)
+	if type_ == EventType.GESTURE_PINCH_UPDATE:
+		angle_delta = lib.libinput_event_gesture_get_angle_delta(handle)
+	return (lib.libinput_event_gesture_get_time_usec(handle),
+		lib.libinput_event_gesture_get_finger_count(handle), cancelled,
+		dx, dy, dx_unaccelerated, dy_unaccelerated, scale, angle_delta)
+
+
+_tablet_tool_changes = (
+	('libinput_event_tablet_tool_x_has_changed', TabletToolAxis.X.value),
+	('libinput_event_tablet_tool_y_has_changed', TabletToolAxis.Y.value),
+	('libinput_event_tablet_tool_pressure_has_changed',
+		TabletToolAxis.PRESSURE.value),
+	('libinput_event_tablet_tool_distance_has_changed',
+		TabletToolAxis.DISTANCE.value),
+	('libinput_event_tablet_tool_tilt_x_has_changed',
+		TabletToolAxis.TILT_X.value),
+	('libinput_event_tablet_tool_tilt_y_has_changed',
+		TabletToolAxis.TILT_Y.value),
+	('libinput_event_tablet_tool_rotation_has_changed',
+		TabletToolAxis.ROTATION.value),
+	('libinput_event_tablet_tool_slider_has_changed',
+		TabletToolAxis.SLIDER.value),
+	('libinput_event_tablet_tool_wheel_has_changed',
+		TabletToolAxis.WHEEL.value))
+
+
+def _tablet_tool(event, type_):
+
+	lib, handle = event._libinput, event._handle
+	tool = TabletTool(
+		lib.libinput_event_tablet_tool_get_tool(handle), lib)
+	changed = 0
+	for function, bit in _tablet_tool_changes:
+		if getattr(lib, function)(handle):
+			changed |= bit
+	button = button_state = seat_button_count = 0
+	if type_ == EventType.TABLET_TOOL_BUTTON:
+		button = lib.libinput_event_tablet_tool_get_button(handle)
+		button_state = lib.libinput_event_tablet_tool_get_button_state(
+			handle).value
+		seat_button_count = lib \
+			.libinput_event_tablet_tool_get_seat_button_count(handle)
+	return (lib.libinput_event_tablet_tool_get_time_usec(handle),
+		tool.type.value, tool.serial, tool.tool_id,
+		lib.libinput_event_tablet_tool_get_x(handle),
+		lib.libinput_event_tablet_tool_get_y(handle),
+		lib.libinput_event_tablet_tool_get_dx(handle),
+		lib.libinput_event_tablet_tool_get_dy(handle),
+		lib.libinput_event_tablet_tool_get_pressure(handle),
+		lib.libinput_event_tablet_tool_get_distance(handle),
+		lib.libinput_event_tablet_tool_get_tilt_x(handle),
+		lib.libinput_event_tablet_tool_get_tilt_y(handle),
+		lib.libinput_event_tablet_tool_get_rotation(handle),
+		lib.libinput_event_tablet_tool_get_slider_position(handle),
+		lib.libinput_event_tablet_tool_get_wheel_delta(handle),
+		lib.libinput_event_tablet_tool_get_wheel_delta_discrete(handle),
+		changed,
+		lib.libinput_event_tablet_tool_get_proximity_state(handle).value,
+		lib.libinput_event_tablet_tool_get_tip_state(handle).value,
+		button, button_state, seat_button_count)
+
+
+def _tablet_pad(event, type_):
+
+	lib, handle = event._libinput, event._handle
+	number = source = button = button_state = 0
+	position = 0.0
+	if type_ == EventType.TABLET_PAD_RING:
+		number = lib.libinput_event_tablet_pad_get_ring_number(handle)
+		position = lib.libinput_event_tablet_pad_get_ring_position(handle)
+		source = lib.libinput_event_tablet_pad_get_ring_source(handle).value
+	elif type_ == EventType.TABLET_PAD_STRIP:
+		number = lib.libinput_event_tablet_pad_get_strip_number(handle)
+		position = lib.libinput_event_tablet_pad_get_strip_position(handle)
+		source = lib.libinput_event_tablet_pad_get_strip_source(handle).value
+	elif type_ == EventType.TABLET_PAD_BUTTON:
+		button = lib.libinput_event_tablet_pad_get_button_number(handle)
+		button_state = lib.libinput_event_tablet_pad_get_button_state(
+			handle).value
+	return (lib.libinput_event_tablet_pad_get_time_usec(handle),
+		number, position, source, button, button_state,
+		lib.libinput_event_tablet_pad_get_mode(handle))
+
+
+def _switch(event, type_):
+
+	lib, handle = event._libinput, event._handle
+	return (lib.libinput_event_switch_get_time_usec(handle),
+		lib.libinput_event_switch_get_switch(handle).value,
+		lib.libinput_event_switch_get_switch_state(handle).value)
+
+
+DeviceRecord = _Family('DeviceRecord', ('sysname',), '32s',
+	_device, _device_convert)
+KeyboardRecord = _Family('KeyboardRecord',
+	('key', 'key_state', 'seat_key_count'), 'IBI', _keyboard)
+PointerMotionRecord = _Family('PointerMotionRecord',
+	('dx', 'dy', 'dx_unaccelerated', 'dy_unaccelerated'), '4d',
+	_pointer_motion)
+PointerAbsoluteRecord = _Family('PointerAbsoluteRecord', ('x', 'y'), '2d',
+	_pointer_absolute)
+PointerButtonRecord = _Family('PointerButtonRecord',
+	('button', 'button_state', 'seat_button_count'), 'IBI', _pointer_button)
+PointerAxisRecord = _Family('PointerAxisRecord',
+	('source', 'has_vertical', 'has_horizontal', 'vertical', 'horizontal',
+		'vertical_discrete', 'horizontal_discrete'), 'B??4d', _pointer_axis)
+TouchRecord = _Family('TouchRecord', ('slot', 'seat_slot', 'x', 'y'),
+	'ii2d', _touch)
+GestureRecord = _Family('GestureRecord',
+	('finger_count', 'cancelled', 'dx', 'dy', 'dx_unaccelerated',
+		'dy_unaccelerated', 'scale', 'angle_delta'), 'B?6d', _gesture)
+TabletToolRecord = _Family('TabletToolRecord',
+	('tool_type', 'tool_serial', 'tool_id', 'x', 'y', 'dx', 'dy', 'pressure',
+		'distance', 'tilt_x', 'tilt_y', 'rotation', 'slider_position',
+		'wheel_delta', 'wheel_delta_discrete', 'changed', 'proximity_state',
+		'tip_state', 'button', 'button_state', 'seat_button_count'),
+	'BQQ11diHBBIBI', _tablet_tool)
+TabletPadRecord = _Family('TabletPadRecord',
+	('number', 'position', 'source', 'button', 'button_state', 'mode'),
+	'IdBIBI', _tablet_pad)
+SwitchRecord = _Family('SwitchRecord', ('switch', 'switch_state'), 'BB',
+	_switch)
+
+
+_families = {}
+for _family, _predicate in (
+		(DeviceRecord, EventType.is_device),
+		(KeyboardRecord, EventType.is_keyboard),
+		(TouchRecord, EventType.is_touch),
+		(GestureRecord, EventType.is_gesture),
+		(TabletToolRecord, EventType.is_tablet_tool),
+		(TabletPadRecord, EventType.is_tablet_pad),
+		(SwitchRecord, EventType.is_switch)):
+	for _event_type in EventType:
+		if _predicate(_event_type):
+			_families[_event_type] = _family
+_families[EventType.POINTER_MOTION] = PointerMotionRecord
+_families[EventType.POINTER_MOTION_ABSOLUTE] = PointerAbsoluteRecord
+_families[EventType.POINTER_BUTTON] = PointerButtonRecord
+for _event_type in (EventType.POINTER_AXIS, EventType.POINTER_SCROLL_WHEEL,
+		EventType.POINTER_SCROLL_FINGER, EventType.POINTER_SCROLL_CONTINUOUS):
+	_families[_event_type] = PointerAxisRecord
+# Records are built with tuple.__new__, which skips the argument parsing of
+# the named tuple constructor.
+_decoders = dict((_event_type.value, ((_event_type,),
+	_family.struct.unpack_from, _family.record, _family.struct.size,
+	_family.convert)) for _event_type, _family in _families.items())
+_new = tuple.__new__
+
+#: The size in bytes of the largest record.
+max_size = max(family.struct.size for family in _families.values())
+
+
+class Encoder(object):
+	"""Packs events into fixed-layout binary records.
+
+	Every record starts with the event type, a device id and the event time
+	in microseconds, followed by a payload whose layout depends on the event
+	type. Records are decoded with :func:`decode` into named tuples such as
+	:attr:`PointerMotionRecord.record`.
+
+	Device ids are small integers assigned by the encoder to every device it
+	sees, the device's sysname is carried by
+	:attr:`~libinput.constant.EventType.DEVICE_ADDED` and
+	:attr:`~libinput.constant.EventType.DEVICE_REMOVED` records.
+	"""
+
+	def __init__(self):
+
+		self._devices = {}
+		self._next_device = 1
+
+	def _device_id(self, event, type_):
+
+		hdevice = event._libinput.libinput_event_get_device(event._hevent)
+		if type_ == EventType.DEVICE_REMOVED:
+			device = self._devices.pop(hdevice, None)
+		else:
+			device = self._devices.get(hdevice)
+		if device is None:
+			device = self._next_device
+			self._next_device += 1
+			if type_ != EventType.DEVICE_REMOVED:
+				self._devices[hdevice] = device
+		return device
+
+	def size(self, event):
+		"""Return the size of the record an event is packed into.
+
+		Args:
+			event (~libinput.event.Event): Any event.
+		Returns:
+			int: The record size in bytes.
+		"""
+
+		return _families[event.type].struct.size
+
+	def _pack(self, buffer, offset, event, type_):
+
+		family = _families[type_]
+		family.struct.pack_into(buffer, offset, type_.value,
+			self._device_id(event, type_), *family.extract(event, type_))
+		return family.struct.size
+
+	def pack_into(self, buffer, offset, event):
+		"""Pack an event into a writable buffer.
+
+		Args:
+			buffer: A writable buffer, e.g. :class:`bytearray`.
+			offset (int): The offset to write at.
+			event (~libinput.event.Event): Any event.
+		Returns:
+			int: The number of bytes written.
+		"""
+
+		return self._pack(buffer, offset, event, event.type)
+
+	def encode(self, event):
+		"""Pack an event into a new record.
+
+		Args:
+			event (~libinput.event.Event): Any event.
+		Returns:
+			bytes: The record.
+		"""
+
+		type_ = event.type
+		family = _families[type_]
+		return family.struct.pack(type_.value,
+			self._device_id(event, type_), *family.extract(event, type_))
+
+	def pack_many(self, buffer, offset, events):
+		"""Pack events back to back into a writable buffer.
+
+		Args:
+			buffer: A writable buffer large enough for all records.
+			offset (int): The offset to start writing at.
+			events (~collections.abc.Iterable): Any events.
+		Returns:
+			int: The number of bytes written.
+		"""
+
+		start = offset
+		pack = self._pack
+		for event in events:
+			offset += pack(buffer, offset, event, event.type)
+		return offset - start
+
+	def encode_many(self, events):
+		"""Pack events back to back into a new buffer.
+
+		The buffer is sized once for all records, which makes this
+		considerably faster than joining the results of :meth:`encode`.
+
+		Args:
+			events (~collections.abc.Iterable): Any events.
+		Returns:
+			bytearray: The records, decode them with :func:`decode_many`.
+		"""
+
+		events = [(event, event.type) for event in events]
+		buffer = bytearray(sum(
+			_families[type_].struct.size for _, type_ in events))
+		offset = 0
+		pack = self._pack
+		for event, type_ in events:
+			offset += pack(buffer, offset, event, type_)
+		return buffer
+
+
+def decode(buffer, offset=0):
+	"""Unpack a record.
+
+	Args:
+		buffer: A buffer holding the record.
+		offset (int): The offset the record starts at.
+	Returns:
+		(tuple, int): The record as a named tuple whose ``type`` is
+		an :class:`~libinput.constant.EventType` and the record size
+		in bytes.
+	Raises:
+		ValueError
+	"""
+
+	value = _type.unpack_from(buffer, offset)[0]
+	try:
+		head, unpack, record, size, convert = _decoders[value]
+	except KeyError:
+		raise ValueError('Unknown event type {}'.format(value))
+	values = unpack(buffer, offset)
+	if convert is not None:
+		values = convert(values)
+	return _new(record, head + values[1:]), size
+
+
+def decode_many(buffer, offset=0, end=None):
+	"""Unpack records stored back to back.
+
+	Args:
+		buffer: A buffer holding the records, e.g. as returned by
+			:meth:`Encoder.encode_many`.
+		offset (int): The offset the first record starts at.
+		end (int): The offset the last record ends at, defaults to the end
+			of the buffer.
+	Returns:
+		list: Records as returned by :func:`decode`.
+	Raises:
+		ValueError
+	"""
+
+	if end is None:
+		end = len(buffer)
+	records = []
+	append = records.append
+	unpack_type = _type.unpack_from
+	decoders = _decoders
+	while offset < end:
+		value = unpack_type(buffer, offset)[0]
+		try:
+			head, unpack, record, size, convert = decoders[value]
+		except KeyError:
+			raise ValueError('Unknown event type {}'.format(value))
+		values = unpack(buffer, offset)
+		if convert is not None:
+			values = convert(values)
+		append(_new(record, head + values[1:]))
+		offset += size
+	return records
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import os
+import fcntl
+from errno import ENOENT, ESRCH
+from struct import Struct
+from tempfile import gettempdir
+from time import sleep
+from multiprocessing.shared_memory import SharedMemory
+from .constant import EventType, OverflowPolicy
+from .record import DeviceRecord, Encoder, decode, max_size
+
+
+_magic = b'LIRING02'
+_header = Struct('<8sIIIII')
+_u64 = Struct('<Q')
+_entry = Struct('<QQ')
+# The sequence number of the DEVICE_ADDED record plus one, 0 for a free
+# entry, the device id and the sysname.
+_device = Struct('<QQ32s')
+_head_offset = _header.size
+_dropped_offset = _head_offset + _u64.size
+_generation_offset = _dropped_offset + _u64.size
+_table_offset = _generation_offset + _u64.size
+# The segments created by publishers of this process.
+_published = set()
+
+
+def _alive(pid):
+
+	try:
+		os.kill(pid, 0)
+	except OSError as error:
+		return error.errno != ESRCH
+	return True
+
+
+def _attach(name):
+
+	try:
+		return SharedMemory(name, track=False)
+	except TypeError:
+		pass
+	# Before Python 3.13 every process attaching to a segment registers it
+	# with the resource tracker, which unlinks it when that process exits.
+	# The registration of a segment published by this process is the
+	# publisher's own and stays.
+	from multiprocessing import resource_tracker
+	shm = SharedMemory(name)
+	if shm._name not in _published:
+		resource_tracker.unregister(shm._name, 'shared_memory')
+	return shm
+
+
+def _lock_path(name):
+
+	return os.path.join(
+		gettempdir(), 'libinput-ring-{}.lock'.format(name.lstrip('/')))
+
+
+class RingPublisher(object):
+	"""Publishes events into a shared memory ring buffer.
+
+	Every event is packed with :class:`~libinput.record.Encoder` into
+	a fixed-size slot tagged with a sequence number. There is a single
+	writer and no locks, any number of :class:`RingReader` instances in other
+	processes (up to ``max_readers``) consume the buffer independently.
+
+	When a reader falls a full ring behind the writer, ``policy`` decides
+	what happens: with :attr:`~libinput.constant.OverflowPolicy.OVERWRITE`
+	the writer carries on and the reader skips the lost events, with
+	:attr:`~libinput.constant.OverflowPolicy.SKIP` the writer discards new
+	events until the slowest reader catches up. Readers whose process has
+	exited are forgotten.
+
+	The devices added and not yet removed are also kept in a table of up
+	to ``max_devices`` entries, so readers attaching late still learn the
+	sysname of every device id, see :class:`RingReader`.
+
+	Requires Python 3.8 or newer.
+	"""
+
+	def __init__(self, name=None, capacity=4096,
+			policy=OverflowPolicy.OVERWRITE, max_readers=16, max_devices=64):
+		"""Create the shared memory segment.
+
+		Args:
+			name (str): The segment name, a random name is generated if
+				:obj:`None`.
+			capacity (int): The number of slots in the ring.
+			policy (~libinput.constant.OverflowPolicy): What to do when
+				a reader falls behind.
+			max_readers (int): The maximum number of attached readers.
+			max_devices (int): The maximum number of devices in the device
+				table, further devices are only announced by their records.
+		Raises:
+			ValueError: If the policy is not supported by the ring.
+		"""
+
+		if policy not in (OverflowPolicy.OVERWRITE, OverflowPolicy.SKIP):
+			raise ValueError('Unsupported overflow policy {}'.format(policy))
+		self._capacity = capacity
+		self._policy = policy
+		self._max_readers = max_readers
+		self._max_devices = max_devices
+		slot_size = (max_size + 7) & ~7
+		self._stride = _u64.size + slot_size
+		self._devices = _table_offset + _entry.size * max_readers
+		self._slots = self._devices + _device.size * max_devices
+		self._shm = SharedMemory(
+			name, create=True, size=self._slots + capacity * self._stride)
+		_published.add(self._shm._name)
+		self._buffer = self._shm.buf
+		self._buffer[:self._slots] = bytes(self._slots)
+		_header.pack_into(self._buffer, 0, _magic, slot_size, capacity,
+			max_readers, max_devices, policy.value)
+		self._encoder = Encoder()
+		self._head = 0
+		self._dropped = 0
+		self._cursor = 0
+
+	@property
+	def name(self):
+		"""The name of the shared memory segment, pass it to
+		:class:`RingReader`.
+
+		Returns:
+			str: Segment name.
+		"""
+
+		return self._shm.name
+
+	@property
+	def published(self):
+		"""The number of events written into the ring.
+
+		Returns:
+			int: Number of events.
+		"""
+
+		return self._head
+
+	@property
+	def dropped(self):
+		"""The number of events discarded by
+		:attr:`~libinput.constant.OverflowPolicy.SKIP`.
+
+		Returns:
+			int: Number of events.
+		"""
+
+		return self._dropped
+
+	@property
+	def readers(self):
+		"""The attached readers.
+
+		Returns:
+			dict: A mapping of reader process ids to the number of events
+			they have yet to read.
+		"""
+
+		readers = {}
+		for index in range(self._max_readers):
+			pid, cursor = _entry.unpack_from(
+				self._buffer, _table_offset + _entry.size * index)
+			if pid:
+				readers[pid] = max(0, self._head - cursor)
+		return readers
+
+	def _slowest(self):
+
+		slowest = self._head
+		for index in range(self._max_readers):
+			offset = _table_offset + _entry.size * index
+			pid, cursor = _entry.unpack_from(self._buffer, offset)
+			if not pid:
+				continue
+			if not _alive(pid):
+				_entry.pack_into(self._buffer, offset, 0, 0)
+				continue
+			slowest = min(slowest, cursor)
+		return slowest
+
+	def publish(self, event):
+		"""Write an event into the ring.
+
+		Args:
+			event (~libinput.event.Event): Any event.
+		Returns:
+			bool: :obj:`True` if the event was written, :obj:`False` if it
+			was discarded.
+		"""
+
+		head = self._head
+		if (self._policy == OverflowPolicy.SKIP
+				and head - self._cursor >= self._capacity):
+			self._cursor = self._slowest()
+			if head - self._cursor >= self._capacity:
+				self._dropped += 1
+				_u64.pack_into(self._buffer, _dropped_offset, self._dropped)
+				return False
+		buffer = self._buffer
+		offset = self._slots + (head % self._capacity) * self._stride
+		# An odd sequence marks a slot being written, readers that see it
+		# change while decoding discard what they read.
+		_u64.pack_into(buffer, offset, 2 * head + 1)
+		self._encoder.pack_into(buffer, offset + _u64.size, event)
+		_u64.pack_into(buffer, offset, 2 * head + 2)
+		if event.type in (EventType.DEVICE_ADDED, EventType.DEVICE_REMOVED):
+			self._update_device(decode(buffer, offset + _u64.size)[0], head)
+		self._head = head + 1
+		_u64.pack_into(buffer, _head_offset, self._head)
+		return True
+
+	def _update_device(self, record, sequence):
+
+		buffer = self._buffer
+		free = found = None
+		for index in range(self._max_devices):
+			offset = self._devices + _device.size * index
+			added, device, _ = _device.unpack_from(buffer, offset)
+			if added and device == record.device:
+				found = offset
+				break
+			if not added and free is None:
+				free = offset
+		if record.type == EventType.DEVICE_ADDED:
+			found, values = free, (
+				sequence + 1, record.device, record.sysname.encode())
+		else:
+			values = (0, 0, b'')
+		if found is None:
+			return
+		# Readers copy the table while the generation is even and unchanged.
+		generation = _u64.unpack_from(buffer, _generation_offset)[0]
+		_u64.pack_into(buffer, _generation_offset, generation + 1)
+		_device.pack_into(buffer, found, *values)
+		_u64.pack_into(buffer, _generation_offset, generation + 2)
+
+	def run(self, li):
+		"""Publish every event of a context, forever.
+
+		Args:
+			li (~libinput.LibInput): The context to pump.
+		"""
+
+		publish = self.publish
+		for event in li.events:
+			publish(event)
+
+	def close(self, unlink=True):
+		"""Detach from the shared memory segment.
+
+		Args:
+			unlink (bool): Also destroy the segment, attached readers keep
+				their mapping but receive no more events.
+		"""
+
+		self._buffer = None
+		self._shm.close()
+		if unlink:
+			_published.discard(self._shm._name)
+			self._shm.unlink()
+			try:
+				os.unlink(_lock_path(self._shm.name))
+			except OSError as error:
+				if error.errno != ENOENT:
+					raise
+
+
+class RingReader(object):
+	"""Reads events published by a :class:`RingPublisher`.
+
+	Records are decoded with :func:`~libinput.record.decode` straight out of
+	shared memory. A reader starts with the next event published after it
+	attaches, preceded by a
+	:attr:`~libinput.constant.EventType.DEVICE_ADDED` record with time 0 for
+	every device in the publisher's device table that was added before.
+
+	Requires Python 3.8 or newer.
+	"""
+
+	def __init__(self, name):
+		"""Attach to a ring.
+
+		Args:
+			name (str): The segment name, see :attr:`RingPublisher.name`.
+		Raises:
+			ValueError
+			RuntimeError
+		"""
+
+		self._shm = _attach(name)
+		self._buffer = self._shm.buf
+		magic, slot_size, capacity, max_readers, max_devices, _ = \
+			_header.unpack_from(self._buffer, 0)
+		if magic != _magic:
+			self._buffer = None
+			self._shm.close()
+			raise ValueError('{} is not an event ring'.format(name))
+		self._capacity = capacity
+		self._max_devices = max_devices
+		self._stride = _u64.size + slot_size
+		self._devices = _table_offset + _entry.size * max_readers
+		self._slots = self._devices + _device.size * max_devices
+		self._lost = 0
+		self._entry = None
+		# Readers claim a table entry under an advisory lock on a file of
+		# their own, the writer never takes it.
+		lock = os.open(_lock_path(name),
+			os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW | os.O_CLOEXEC, 0o600)
+		try:
+			fcntl.flock(lock, fcntl.LOCK_EX)
+			for index in range(max_readers):
+				offset = _table_offset + _entry.size * index
+				pid = _entry.unpack_from(self._buffer, offset)[0]
+				if not pid or not _alive(pid):
+					self._cursor = _u64.unpack_from(
+						self._buffer, _head_offset)[0]
+					_entry.pack_into(
+						self._buffer, offset, os.getpid(), self._cursor)
+					self._entry = offset
+					break
+		finally:
+			os.close(lock)
+		if self._entry is None:
+			self._buffer = None
+			self._shm.close()
+			raise RuntimeError('Too many readers attached to {}'.format(name))
+		self._added = [DeviceRecord.record(EventType.DEVICE_ADDED, device, 0,
+			sysname) for device, sysname in sorted(self._table(self._cursor))]
+
+	def _table(self, cursor):
+
+		buffer = self._buffer
+		start, end = self._devices, self._slots
+		while True:
+			generation = _u64.unpack_from(buffer, _generation_offset)[0]
+			if generation & 1:
+				sleep(0)
+				continue
+			table = bytes(buffer[start:end])
+			if _u64.unpack_from(buffer, _generation_offset)[0] == generation:
+				break
+		devices = []
+		for index in range(self._max_devices):
+			added, device, sysname = _device.unpack_from(
+				table, _device.size * index)
+			# Devices added after the cursor are announced by their record.
+			if added and added <= cursor:
+				devices.append((device, sysname.rstrip(b'\0').decode()))
+		return devices
+
+	@property
+	def devices(self):
+		"""The devices currently in the publisher's device table.
+
+		Returns:
+			dict: A mapping of device ids to sysnames.
+		"""
+
+		return dict(self._table(
+			_u64.unpack_from(self._buffer, _head_offset)[0]))
+
+	@property
+	def lost(self):
+		"""The number of events overwritten before this reader got to them.
+
+		Returns:
+			int: Number of events.
+		"""
+
+		return self._lost
+
+	@property
+	def dropped(self):
+		"""The number of events discarded by the publisher.
+
+		Returns:
+			int: Number of events.
+		"""
+
+		return _u64.unpack_from(self._buffer, _dropped_offset)[0]
+
+	def read(self, limit=None):
+		"""Return the events published since the last call,
+		without blocking.
+
+		Args:
+			limit (int): Return at most this many events.
+		Returns:
+			list: Records as returned by :func:`~libinput.record.decode`,
+			oldest first.
+		"""
+
+		records = self._added[:limit]
+		del self._added[:len(records)]
+		if limit is not None:
+			limit -= len(records)
+		buffer = self._buffer
+		capacity = self._capacity
+		head = _u64.unpack_from(buffer, _head_offset)[0]
+		cursor = self._cursor
+		if head - cursor > capacity:
+			self._lost += head - capacity - cursor
+			cursor = head - capacity
+		end = head if limit is None else min(head, cursor + limit)
+		while cursor < end:
+			offset = self._slots + (cursor % capacity) * self._stride
+			sequence = 2 * cursor + 2
+			if _u64.unpack_from(buffer, offset)[0] == sequence:
+				try:
+					record = decode(buffer, offset + _u64.size)[0]
+				except ValueError:
+					record = None
+				if (record is not None
+						and _u64.unpack_from(buffer, offset)[0] == sequence):
+					records.append(record)
+					cursor += 1
+					continue
+			# The writer lapped us, resume at the oldest slot
+			# it cannot be writing.
+			head = _u64.unpack_from(buffer, _head_offset)[0]
+			resume = max(cursor + 1, head - capacity + 1)
+			self._lost += resume - cursor
+			cursor = resume
+		self._cursor = cursor
+		_u64.pack_into(buffer, self._entry + _u64.size, cursor)
+		return records
+
+	def records(self, interval=0.001):
+		"""Yield published events as they arrive, forever.
+
+		Args:
+			interval (float): Seconds to sleep when the ring is empty.
+		Yields:
+			tuple: Records as returned by :func:`~libinput.record.decode`.
+		"""
+
+		while True:
+			records = self.read()
+			if not records:
+				sleep(interval)
+			for record in records:
+				yield record
+
+	def close(self):
+		"""Detach from the ring.
+		"""
+
+		_entry.pack_into(self._buffer, self._entry, 0, 0)
+		self._buffer = None
+		self._shm.close()
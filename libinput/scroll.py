@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from collections import namedtuple
+from .constant import EventType, PointerAxis
+
+
+class ScrollSteps(namedtuple('ScrollSteps', ('device', 'source', 'dx', 'dy',
+		'lines_x', 'lines_y', 'pages_x', 'pages_y', 'stopped'))):
+	"""The scrolling done by a device within a frame.
+
+	Attributes:
+		device (str): The system name of the device.
+		source (~libinput.constant.EventType): The type of the last scroll
+			event, e.g.
+			:attr:`~libinput.constant.EventType.POINTER_SCROLL_WHEEL`.
+		dx, dy (float): The summed scroll values, see
+			:meth:`~libinput.event.PointerEvent.get_scroll_value`.
+		lines_x, lines_y (int): Whole lines scrolled, positive being right
+			or down.
+		pages_x, pages_y (int): Whole pages scrolled.
+		stopped (bool): Whether a scroll stop was seen, i.e. the fingers
+			were lifted and kinetic scrolling may start.
+	"""
+
+	__slots__ = ()
+
+
+class _Axis(object):
+
+	__slots__ = ('value', 'source', 'remainder', 'lines', 'line_remainder',
+		'stopped')
+
+	def __init__(self):
+
+		self.value = 0.0
+		self.source = None
+		self.remainder = 0
+		self.lines = 0
+		self.line_remainder = 0
+		self.stopped = False
+
+
+def _steps(total, unit):
+
+	# Truncate towards zero so that reversing direction undoes the remainder.
+	steps = abs(total) // unit
+	return steps if total >= 0 else -steps
+
+
+class ScrollAccumulator(object):
+	"""Turns scroll events into whole line and page steps.
+
+	Wheel movement is accumulated in integer 1/120ths of a click (see
+	:meth:`~libinput.event.PointerEvent.get_scroll_value_v120`) and turned
+	into lines as soon as it adds up to one, e.g. 40/120 of a click is one
+	line at 3 lines per click, so high resolution wheels scroll smoothly and
+	exactly ``lines_per_click`` lines per click no matter how many events
+	a click is split into. Finger and continuous scrolling is summed as
+	floats and only truncated to whole lines, so sub-line remainders are
+	not dropped, though unlike wheel clicks they are subject to floating
+	point rounding. Remainders carry over between frames, per device and
+	axis.
+
+	Events are coalesced until :meth:`take` is called, e.g. once per frame of
+	the user interface, which returns one :class:`ScrollSteps` per device
+	that scrolled. Only the
+	:attr:`~libinput.constant.EventType.POINTER_SCROLL_WHEEL`,
+	:attr:`~libinput.constant.EventType.POINTER_SCROLL_FINGER` and
+	:attr:`~libinput.constant.EventType.POINTER_SCROLL_CONTINUOUS` events
+	of libinput 1.19 and later are used, the legacy
+	:attr:`~libinput.constant.EventType.POINTER_AXIS` events describe the same
+	movement and are ignored.
+	"""
+
+	def __init__(self, lines_per_click=3, line_height=15.0, lines_per_page=30):
+		"""Initialize an accumulator.
+
+		Args:
+			lines_per_click (int): Lines scrolled per wheel click.
+			line_height (float): Finger and continuous scroll distance per
+				line, in the units of
+				:meth:`~libinput.event.PointerEvent.get_scroll_value`.
+			lines_per_page (int): Lines per page.
+		"""
+
+		self._lines_per_click = lines_per_click
+		self._line_height = float(line_height)
+		self._lines_per_page = lines_per_page
+		self._devices = {}
+		self._pending = {}
+
+	def feed(self, event):
+		"""Accumulate an event.
+
+		Args:
+			event (~libinput.event.Event): Any event.
+		Returns:
+			bool: :obj:`True` if the event was a scroll event.
+		"""
+
+		type_ = event.type
+		if type_ == EventType.DEVICE_REMOVED:
+			hdevice = event._libinput.libinput_event_get_device(event._hevent)
+			self._devices.pop(hdevice, None)
+			self._pending.pop(hdevice, None)
+			return False
+		if type_ not in {EventType.POINTER_SCROLL_WHEEL,
+				EventType.POINTER_SCROLL_FINGER,
+				EventType.POINTER_SCROLL_CONTINUOUS}:
+			return False
+		libinput, handle = event._libinput, event._handle
+		hdevice = libinput.libinput_event_get_device(event._hevent)
+		state = self._devices.get(hdevice)
+		if state is None:
+			state = self._devices[hdevice] = (
+				event.device.sysname, _Axis(), _Axis())
+		self._pending[hdevice] = type_
+		for axis, accumulator in ((PointerAxis.SCROLL_HORIZONTAL, state[1]),
+				(PointerAxis.SCROLL_VERTICAL, state[2])):
+			if not libinput.libinput_event_pointer_has_axis(handle, axis):
+				continue
+			# Includes the values of events merged by a LoadShedder.
+			value = event.get_scroll_value(axis)
+			accumulator.value += value
+			if accumulator.source != type_:
+				# Wheel and finger remainders are kept in different units.
+				accumulator.source = type_
+				accumulator.remainder = 0
+			if type_ == EventType.POINTER_SCROLL_WHEEL:
+				# The remainder is kept in 1/120ths of a line.
+				accumulator.remainder += self._lines_per_click * int(
+					event.get_scroll_value_v120(axis))
+				lines = _steps(accumulator.remainder, 120)
+				accumulator.remainder -= lines * 120
+			else:
+				if value == 0:
+					accumulator.stopped = True
+					accumulator.remainder = 0
+				accumulator.remainder += value
+				lines = int(accumulator.remainder / self._line_height)
+				accumulator.remainder -= lines * self._line_height
+			accumulator.lines += lines
+		return True
+
+	def take(self):
+		"""Return and reset the scrolling accumulated since the last call.
+
+		Returns:
+			list: A :class:`ScrollSteps` for every device that scrolled.
+		"""
+
+		steps = []
+		for hdevice, source in self._pending.items():
+			sysname, horizontal, vertical = self._devices[hdevice]
+			pages = []
+			for accumulator in (horizontal, vertical):
+				accumulator.line_remainder += accumulator.lines
+				page = _steps(accumulator.line_remainder, self._lines_per_page)
+				accumulator.line_remainder -= page * self._lines_per_page
+				pages.append(page)
+			steps.append(ScrollSteps(sysname, source,
+				horizontal.value, vertical.value,
+				horizontal.lines, vertical.lines, pages[0], pages[1],
+				horizontal.stopped or vertical.stopped))
+			for accumulator in (horizontal, vertical):
+				accumulator.value = 0.0
+				accumulator.lines = 0
+				accumulator.stopped = False
+		self._pending.clear()
+		return steps
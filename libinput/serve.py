@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import os
+import stat
+import socket
+from argparse import ArgumentParser
+from struct import Struct
+try:
+	from selectors import DefaultSelector, EVENT_READ, EVENT_WRITE
+except ImportError:
+	from selectors34 import DefaultSelector, EVENT_READ, EVENT_WRITE
+from . import LibInput
+from .constant import ContextType, EventType
+from .record import Encoder, decode, decode_many
+
+
+_frame = Struct('<I')
+_count = Struct('<H')
+# Stay below IOV_MAX, larger batches are joined into a single buffer.
+_max_buffers = 1024
+
+
+def default_path():
+	"""Return the socket path used when none is given.
+
+	Returns:
+		str: ``libinput.sock`` in ``$XDG_RUNTIME_DIR``, a directory only the
+		user can access.
+	Raises:
+		RuntimeError: If ``$XDG_RUNTIME_DIR`` is not set.
+	"""
+
+	directory = os.environ.get('XDG_RUNTIME_DIR')
+	if not directory:
+		raise RuntimeError('XDG_RUNTIME_DIR is not set, pass a socket path')
+	return os.path.join(directory, 'libinput.sock')
+
+
+class _Subscriber(object):
+
+	def __init__(self, sock):
+
+		self.socket = sock
+		self.types = None
+		self.incoming = b''
+		self.outgoing = []
+		self.pending = 0
+
+
+class Server(object):
+	"""Streams the events of a single context to local subscribers over
+	a Unix domain socket.
+
+	All events read by one dispatch are sent to a subscriber as one frame:
+	the payload size as a little endian 32 bit unsigned integer followed by
+	the events packed as :mod:`libinput.record` records. Each frame is
+	written with a single :meth:`~socket.socket.sendmsg` call.
+
+	A subscriber receives every event unless it sends a filter: a little
+	endian 16 bit count followed by that many 16 bit
+	:class:`~libinput.constant.EventType` values, a count of 0 selects every
+	event again. On connect, a subscriber receives a
+	:attr:`~libinput.constant.EventType.DEVICE_ADDED` record for every device
+	currently present. Subscribers that fall more than ``max_pending`` bytes
+	behind are disconnected.
+
+	See :class:`Client` for the receiving end. Requires Python 3.3 or newer.
+	"""
+
+	def __init__(self, path=None, li=None, seat='seat0', max_pending=1 << 20):
+		"""Create the listening socket.
+
+		Args:
+			path (str): The socket path, see :func:`default_path`.
+				It must not exist, the socket is created accessible to
+				the user only.
+			li (~libinput.LibInput): The context to serve, a udev context
+				is created if :obj:`None`.
+			seat (str): The seat assigned to the created udev context.
+			max_pending (int): The number of unsent bytes after which
+				a subscriber is disconnected.
+		Raises:
+			OSError: If the path exists, a stale socket is never replaced.
+		"""
+
+		if li is None:
+			li = LibInput(ContextType.UDEV)
+			li.assign_seat(seat)
+		self._li = li
+		self._path = path or default_path()
+		self._max_pending = max_pending
+		self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		# No one else may connect before the permissions are set.
+		umask = os.umask(0o177)
+		try:
+			self._listener.bind(self._path)
+		except OSError:
+			self._listener.close()
+			raise
+		finally:
+			os.umask(umask)
+		status = os.stat(self._path)
+		self._inode = status.st_dev, status.st_ino
+		self._listener.listen(16)
+		self._listener.setblocking(False)
+		self._selector = DefaultSelector()
+		self._selector.register(self._listener, EVENT_READ)
+		self._selector.register(li, EVENT_READ)
+		self._subscribers = {}
+		self._encoder = Encoder()
+		self._devices = {}
+
+	@property
+	def path(self):
+		"""The path of the listening socket.
+
+		Returns:
+			str: Socket path.
+		"""
+
+		return self._path
+
+	@property
+	def subscribers(self):
+		"""The number of connected subscribers.
+
+		Returns:
+			int: Number of subscribers.
+		"""
+
+		return len(self._subscribers)
+
+	def serve_forever(self):
+		"""Serve subscribers until interrupted.
+		"""
+
+		while True:
+			self.serve_once()
+
+	def serve_once(self, timeout=None):
+		"""Wait for and handle a single round of socket and device activity.
+
+		Args:
+			timeout (float): Seconds to wait, :obj:`None` waits indefinitely.
+		"""
+
+		for key, mask in self._selector.select(timeout):
+			if key.fileobj is self._listener:
+				self._accept()
+			elif key.fileobj is self._li:
+				self._broadcast(self._li.dispatch())
+			else:
+				if mask & EVENT_WRITE:
+					self._flush(key.data)
+				if mask & EVENT_READ:
+					self._receive(key.data)
+
+	def _accept(self):
+
+		try:
+			sock, _ = self._listener.accept()
+		except (BlockingIOError, InterruptedError):
+			return
+		sock.setblocking(False)
+		subscriber = _Subscriber(sock)
+		self._subscribers[sock.fileno()] = subscriber
+		self._selector.register(sock, EVENT_READ, subscriber)
+		if self._devices:
+			self._send(subscriber, list(self._devices.values()))
+
+	def _drop(self, subscriber):
+
+		if self._subscribers.pop(subscriber.socket.fileno(), None) is None:
+			return
+		self._selector.unregister(subscriber.socket)
+		subscriber.socket.close()
+
+	def _receive(self, subscriber):
+
+		try:
+			data = subscriber.socket.recv(4096)
+		except (BlockingIOError, InterruptedError):
+			return
+		except OSError:
+			data = b''
+		if not data:
+			self._drop(subscriber)
+			return
+		incoming = subscriber.incoming + data
+		while len(incoming) >= _count.size:
+			count = _count.unpack_from(incoming)[0]
+			end = _count.size * (count + 1)
+			if len(incoming) < end:
+				break
+			types = Struct('<{}H'.format(count)).unpack_from(
+				incoming, _count.size)
+			subscriber.types = frozenset(types) if count else None
+			incoming = incoming[end:]
+		subscriber.incoming = incoming
+
+	def _broadcast(self, events):
+
+		records = []
+		for event in events:
+			if event is None:
+				continue
+			type_ = event.type
+			data = self._encoder.encode(event)
+			if type_ == EventType.DEVICE_ADDED:
+				self._devices[decode(data)[0].device] = data
+			elif type_ == EventType.DEVICE_REMOVED:
+				self._devices.pop(decode(data)[0].device, None)
+			records.append((type_.value, data))
+		if not records:
+			return
+		everything = [data for _, data in records]
+		for subscriber in list(self._subscribers.values()):
+			if subscriber.types is None:
+				batch = everything
+			else:
+				batch = [data for type_, data in records
+					if type_ in subscriber.types]
+			if batch:
+				self._send(subscriber, batch)
+
+	def _send(self, subscriber, batch):
+
+		size = sum(len(data) for data in batch)
+		buffers = [_frame.pack(size)] + batch
+		if len(buffers) > _max_buffers:
+			buffers = [b''.join(buffers)]
+		total = _frame.size + size
+		if subscriber.outgoing:
+			sent = 0
+		else:
+			try:
+				sent = subscriber.socket.sendmsg(buffers)
+			except (BlockingIOError, InterruptedError):
+				sent = 0
+			except OSError:
+				self._drop(subscriber)
+				return
+		if sent == total:
+			return
+		subscriber.outgoing.append(b''.join(buffers)[sent:])
+		subscriber.pending += total - sent
+		if subscriber.pending > self._max_pending:
+			self._drop(subscriber)
+		elif len(subscriber.outgoing) == 1:
+			self._selector.modify(
+				subscriber.socket, EVENT_READ | EVENT_WRITE, subscriber)
+
+	def _flush(self, subscriber):
+
+		data = b''.join(subscriber.outgoing)
+		try:
+			sent = subscriber.socket.send(data)
+		except (BlockingIOError, InterruptedError):
+			return
+		except OSError:
+			self._drop(subscriber)
+			return
+		subscriber.pending -= sent
+		if sent < len(data):
+			subscriber.outgoing = [data[sent:]]
+		else:
+			subscriber.outgoing = []
+			self._selector.modify(subscriber.socket, EVENT_READ, subscriber)
+
+	def close(self):
+		"""Disconnect all subscribers and remove the socket.
+		"""
+
+		for subscriber in list(self._subscribers.values()):
+			self._drop(subscriber)
+		self._selector.close()
+		self._listener.close()
+		# Only remove the socket if it is still the one bound here.
+		try:
+			status = os.stat(self._path)
+			if (stat.S_ISSOCK(status.st_mode)
+					and (status.st_dev, status.st_ino) == self._inode):
+				os.unlink(self._path)
+		except OSError:
+			pass
+
+
+class Client(object):
+	"""Receives events from a :class:`Server`.
+	"""
+
+	def __init__(self, path=None, types=None):
+		"""Connect to a server.
+
+		Args:
+			path (str): The socket path, see :func:`default_path`.
+			types (~collections.abc.Iterable): Event types to receive,
+				see :meth:`subscribe`.
+		"""
+
+		self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		self._socket.connect(path or default_path())
+		if types is not None:
+			self.subscribe(types)
+
+	def fileno(self):
+
+		return self._socket.fileno()
+
+	def subscribe(self, types=None):
+		"""Select the event types to receive.
+
+		Args:
+			types (~collections.abc.Iterable):
+				:class:`~libinput.constant.EventType` members, :obj:`None`
+				selects every event.
+		"""
+
+		values = [] if types is None else [EventType(type_).value
+			for type_ in types]
+		self._socket.sendall(_count.pack(len(values))
+			+ Struct('<{}H'.format(len(values))).pack(*values))
+
+	def _receive(self, size):
+
+		data = bytearray(size)
+		view = memoryview(data)
+		received = 0
+		while received < size:
+			count = self._socket.recv_into(view[received:])
+			if not count:
+				return None
+			received += count
+		return data
+
+	def read(self):
+		"""Wait for and return the events of the next frame.
+
+		Returns:
+			list: Records as returned by :func:`~libinput.record.decode_many`
+			or :obj:`None` if the server closed the connection.
+		"""
+
+		header = self._receive(_frame.size)
+		if header is None:
+			return None
+		payload = self._receive(_frame.unpack(header)[0])
+		if payload is None:
+			return None
+		return decode_many(payload)
+
+	def records(self):
+		"""Yield events until the server closes the connection.
+
+		Yields:
+			tuple: Records as returned by :func:`~libinput.record.decode`.
+		"""
+
+		while True:
+			records = self.read()
+			if records is None:
+				return
+			for record in records:
+				yield record
+
+	def close(self):
+		"""Disconnect from the server.
+		"""
+
+		self._socket.close()
+
+
+def main(argv=None):
+
+	parser = ArgumentParser(prog='python -m libinput.serve',
+		description='Stream libinput events to local subscribers.')
+	parser.add_argument('--socket',
+		help='socket path, it must not exist '
+		'(default: libinput.sock in $XDG_RUNTIME_DIR)')
+	parser.add_argument('--seat', default='seat0',
+		help='seat to serve (default: %(default)s)')
+	parser.add_argument('--mode', default='600', type=lambda mode: int(mode, 8),
+		help='octal socket permissions (default: 600)')
+	parser.add_argument('--max-pending', default=1 << 20, type=int,
+		help='bytes a subscriber may fall behind before it is disconnected '
+		'(default: %(default)s)')
+	args = parser.parse_args(argv)
+	try:
+		path = args.socket or default_path()
+	except RuntimeError as error:
+		parser.error(str(error))
+	server = Server(path, seat=args.seat, max_pending=args.max_pending)
+	os.chmod(server.path, args.mode)
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.close()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+try:
+	from time import monotonic
+except ImportError:
+	from monotonic import monotonic
+from .constant import EventType, PointerAxis
+
+
+_motion_events = frozenset((EventType.POINTER_MOTION,
+	EventType.POINTER_MOTION_ABSOLUTE, EventType.TOUCH_MOTION,
+	EventType.TABLET_TOOL_AXIS))
+# The values carried over from a coalesced event, per event type.
+_carried_values = {
+	EventType.POINTER_AXIS: ('get_axis_value', 'get_axis_value_discrete'),
+	EventType.POINTER_SCROLL_WHEEL: (
+		'get_scroll_value', 'get_scroll_value_v120'),
+	EventType.POINTER_SCROLL_FINGER: ('get_scroll_value',),
+	EventType.POINTER_SCROLL_CONTINUOUS: ('get_scroll_value',)}
+_axis_events = frozenset(_carried_values)
+_axes = (PointerAxis.SCROLL_VERTICAL, PointerAxis.SCROLL_HORIZONTAL)
+
+
+def _absorb(previous, event):
+
+	type_ = event.type
+	lib = event._libinput
+	if (lib.libinput_event_get_device(previous._hevent)
+			!= lib.libinput_event_get_device(event._hevent)):
+		return False
+	if (type_ == EventType.POINTER_AXIS
+			and previous.axis_source != event.axis_source):
+		return False
+	axes = [axis for axis in _axes if event.has_axis(axis)]
+	if axes != [axis for axis in _axes if previous.has_axis(axis)]:
+		return False
+	getters = _carried_values[type_]
+	# A zero value ends a finger scroll sequence and has to stay zero.
+	if not any(getattr(event, getters[0])(axis) for axis in axes):
+		return False
+	event._carried = dict(((getter, axis), getattr(previous, getter)(axis))
+		for getter in getters for axis in axes)
+	event.coalesced = previous.coalesced + 1
+	return True
+
+
+class LoadShedder(object):
+	"""Sheds load when the consumer of a context falls behind.
+
+	libinput itself only logs and drops events once its queue overflows.
+	The shedder notices earlier: a context is behind while the events it
+	delivers are older than ``max_age``, or while more than ``max_backlog``
+	events were read since its queue was last empty, as seen by
+	:meth:`~libinput.LibInput.next_event_type`. While behind, events of the
+	types in ``drop`` are discarded and consecutive events of the types in
+	``coalesce`` of the same device and axes are merged into the last one,
+	whose :attr:`~libinput.event.Event.coalesced` counts the merged events
+	and whose axis and scroll values include theirs. All other events,
+	buttons, keys and switches among them, are always delivered in order.
+
+	A shedder is installed with :meth:`~libinput.LibInput.enable_shedding`.
+
+	Attributes:
+		dropped (int): The number of events discarded.
+		coalesced (int): The number of events merged into a later one.
+		lagging (int): The number of events of the types in ``drop`` or
+			``coalesce`` read while behind.
+	"""
+
+	def __init__(self, max_age=0.05, max_backlog=256, drop=_motion_events,
+			coalesce=_axis_events, clock=monotonic):
+		"""Initialize a shedder.
+
+		Args:
+			max_age (float): Seconds after which an event is late.
+			max_backlog (int): The number of events read without the queue
+				running empty after which the consumer is behind.
+			drop (~collections.abc.Iterable): The
+				:class:`~libinput.constant.EventType` discarded while behind,
+				by default pointer, touch and tablet tool motion.
+			coalesce (~collections.abc.Iterable): The
+				:class:`~libinput.constant.EventType` merged while behind,
+				pointer axis and scroll events only. By default all of them.
+			clock (~collections.abc.Callable): Returns ``CLOCK_MONOTONIC``
+				in seconds.
+		"""
+
+		self.max_age = max_age
+		self.max_backlog = max_backlog
+		self.drop = frozenset(drop)
+		self.coalesce = frozenset(coalesce) & _axis_events
+		self._clock = clock
+		self._backlog = 0
+		self._held = []
+		self.dropped = 0
+		self.coalesced = 0
+		self.lagging = 0
+
+	def _behind(self, event):
+
+		return (self._backlog > self.max_backlog
+			or self._clock() - event.time / 1e6 > self.max_age)
+
+	def feed(self, event, pending):
+		"""Pass an event through the shedder.
+
+		Args:
+			event (~libinput.event.Event): Any event.
+			pending (bool): Whether more events are queued.
+		Returns:
+			list: The events to deliver now, in order. Events held back to
+			be merged are delivered at the latest with the last queued
+			event.
+		"""
+
+		self._backlog += 1
+		type_ = event.type
+		ready = []
+		if ((type_ in self.drop or type_ in self.coalesce)
+				and self._behind(event)):
+			self.lagging += 1
+			if type_ in self.drop:
+				self.dropped += 1
+				event = None
+			else:
+				self._hold(event, ready)
+				event = None
+		if event is not None:
+			ready.extend(self._held)
+			ready.append(event)
+			del self._held[:]
+		if not pending:
+			ready.extend(self._held)
+			del self._held[:]
+			self._backlog = 0
+		return ready
+
+	def _hold(self, event, ready):
+
+		held = self._held
+		type_ = event.type
+		for index, previous in enumerate(held):
+			if previous.type == type_:
+				if _absorb(previous, event):
+					del held[index]
+					self.coalesced += 1
+				else:
+					ready.extend(held)
+					del held[:]
+				break
+		held.append(event)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import, division
+
+
+def _distance2(point, start, end):
+
+	x, y = point[0], point[1]
+	x1, y1 = start[0], start[1]
+	dx, dy = end[0] - x1, end[1] - y1
+	length2 = dx * dx + dy * dy
+	if length2:
+		t = ((x - x1) * dx + (y - y1) * dy) / length2
+		if t > 1:
+			x1, y1 = end[0], end[1]
+		elif t > 0:
+			x1 += t * dx
+			y1 += t * dy
+	return (x - x1) * (x - x1) + (y - y1) * (y - y1)
+
+
+class _Simplifier(object):
+
+	def simplify(self, points):
+		"""Simplify a whole path, including the final :meth:`flush`.
+
+		Args:
+			points (~collections.abc.Iterable): Points, see :meth:`feed`.
+		Yields:
+			tuple: Kept points, in order.
+		"""
+
+		feed = self.feed
+		for point in points:
+			for kept in feed(point):
+				yield kept
+		for kept in self.flush():
+			yield kept
+
+
+class RadialSimplifier(_Simplifier):
+	"""Drops points closer than a tolerance to the last kept point.
+
+	Every point is processed in constant time with constant memory. The first
+	and last point of a path are always kept.
+	"""
+
+	def __init__(self, tolerance):
+		"""Initialize a simplifier.
+
+		Args:
+			tolerance (float): The minimum distance between kept points,
+				in the unit of the coordinates, e.g. mm.
+		"""
+
+		self._tolerance2 = tolerance * tolerance
+		self._kept = None
+		self._last = None
+
+	def feed(self, point):
+		"""Process the next point of a path.
+
+		Args:
+			point (tuple): A tuple whose first two items are the x and y
+				coordinates, any further items (e.g. time or pressure) are
+				carried along.
+		Returns:
+			list: The points kept so far that were not returned before.
+		"""
+
+		kept = self._kept
+		if (kept is None or (point[0] - kept[0]) ** 2
+				+ (point[1] - kept[1]) ** 2 >= self._tolerance2):
+			self._kept = point
+			self._last = None
+			return [point]
+		self._last = point
+		return []
+
+	def flush(self):
+		"""End the current path.
+
+		Returns:
+			list: The last point of the path if it was not kept yet.
+		"""
+
+		last = self._last
+		self._kept = self._last = None
+		return [] if last is None else [last]
+
+
+class DouglasPeuckerSimplifier(_Simplifier):
+	"""Simplifies a path with the Ramer-Douglas-Peucker algorithm, a window
+	at a time.
+
+	Points are buffered until ``window`` of them are pending, which are then
+	simplified and released, the last one becoming the start of the next
+	window. Every dropped point lies within ``tolerance`` of the simplified
+	path.
+
+	Memory is bounded by the window size and the cost does not grow with the
+	length of the path, but it is not spread evenly: the point completing
+	a window pays for simplifying all of it, O(window log window) on average
+	and O(window ** 2) for pathological paths, while the others are only
+	appended. That is O(log window) per point amortized, up to O(window) in
+	the worst case, and points are released up to ``window - 1`` points
+	late. Pick a small window where the latency of single points matters.
+	"""
+
+	def __init__(self, tolerance, window=64):
+		"""Initialize a simplifier.
+
+		Args:
+			tolerance (float): The maximum distance of a dropped point from
+				the simplified path, in the unit of the coordinates.
+			window (int): The number of points simplified at once, at
+				least 3.
+		"""
+
+		self._tolerance2 = tolerance * tolerance
+		self._window = max(3, window)
+		self._points = []
+
+	def _simplify(self):
+
+		points = self._points
+		keep = [False] * len(points)
+		keep[0] = keep[-1] = True
+		tolerance2 = self._tolerance2
+		stack = [(0, len(points) - 1)]
+		while stack:
+			first, last = stack.pop()
+			start, end = points[first], points[last]
+			farthest, distance2 = 0, tolerance2
+			for index in range(first + 1, last):
+				current = _distance2(points[index], start, end)
+				if current > distance2:
+					farthest, distance2 = index, current
+			if farthest:
+				keep[farthest] = True
+				stack.append((first, farthest))
+				stack.append((farthest, last))
+		return [point for point, kept in zip(points, keep) if kept]
+
+	def feed(self, point):
+		"""Process the next point of a path.
+
+		Args:
+			point (tuple): A tuple whose first two items are the x and y
+				coordinates, any further items (e.g. time or pressure) are
+				carried along.
+		Returns:
+			list: The points kept so far that were not returned before.
+		"""
+
+		self._points.append(point)
+		if len(self._points) < self._window:
+			return []
+		kept = self._simplify()
+		self._points = [kept[-1]]
+		return kept[:-1]
+
+	def flush(self):
+		"""End the current path.
+
+		Returns:
+			list: The remaining kept points, including the last point of
+			the path.
+		"""
+
+		if len(self._points) < 3:
+			kept = self._points
+		else:
+			kept = self._simplify()
+		self._points = []
+		return kept
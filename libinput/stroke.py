@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from array import array
+from .constant import EventType, TabletToolTipState
+from .define import TabletTool
+from .record import _tablet_tool_changes
+
+
+try:
+	array('Q')
+	_uint64 = 'Q'
+except ValueError:
+	_uint64 = 'L'
+
+#: Names of the axis channels recorded for every sample.
+channels = ('x', 'y', 'pressure', 'distance', 'tilt_x', 'tilt_y', 'rotation',
+	'slider_position', 'wheel_delta')
+_getters = tuple(
+	'libinput_event_tablet_tool_get_' + channel for channel in channels)
+
+
+class Stroke(object):
+	"""The samples of a tablet tool from tip down to tip up.
+
+	Every channel is an :class:`array.array` with one item per sample, so it
+	can be handed to NumPy (``numpy.frombuffer(stroke.pressure)``) or any
+	other consumer of the buffer protocol without copying.
+
+	Attributes:
+		tool (~libinput.define.TabletTool): The tool that drew the stroke.
+		complete (bool): :obj:`False` if the tool left proximity before
+			its tip went up.
+		time (array.array): Sample times in microseconds.
+		changed (array.array): :class:`~libinput.constant.TabletToolAxis`
+			bits of the axes that changed in each sample.
+		x, y, pressure, distance, tilt_x, tilt_y, rotation, slider_position,
+		wheel_delta (array.array): Axis values, see
+			:class:`~libinput.event.TabletToolEvent` for their units.
+	"""
+
+	def __init__(self, tool):
+
+		self.tool = tool
+		self.complete = False
+		self.time = array(_uint64)
+		self.changed = array('H')
+		for channel in channels:
+			setattr(self, channel, array('d'))
+		self._columns = [getattr(self, channel) for channel in channels]
+
+	def __len__(self):
+
+		return len(self.time)
+
+	@property
+	def duration(self):
+		"""The time between the first and the last sample.
+
+		Returns:
+			int: Duration in microseconds.
+		"""
+
+		if not self.time:
+			return 0
+		return self.time[-1] - self.time[0]
+
+
+class StrokeRecorder(object):
+	"""Segments tablet tool events into :class:`Stroke` objects.
+
+	A stroke starts with a :attr:`~libinput.constant.EventType.TABLET_TOOL_TIP`
+	event whose tip went down and ends with the one whose tip went up, every
+	tool is tracked separately. Axis values are read straight from the event
+	with one foreign call per channel instead of going through
+	the :class:`~libinput.event.TabletToolEvent` properties.
+	"""
+
+	def __init__(self, changed_only=False):
+		"""Initialize a recorder with no strokes in progress.
+
+		Args:
+			changed_only (bool): Skip
+				:attr:`~libinput.constant.EventType.TABLET_TOOL_AXIS` samples
+				in which no axis changed.
+		"""
+
+		self._changed_only = changed_only
+		self._strokes = {}
+		self._libinput = None
+
+	@property
+	def active(self):
+		"""The number of strokes in progress.
+
+		Returns:
+			int: Number of strokes.
+		"""
+
+		return len(self._strokes)
+
+	def _bind(self, libinput):
+
+		self._libinput = libinput
+		self._get_time = libinput.libinput_event_tablet_tool_get_time_usec
+		self._get_values = [getattr(libinput, getter) for getter in _getters]
+		self._get_changes = [(getattr(libinput, function), bit)
+			for function, bit in _tablet_tool_changes]
+
+	def _sample(self, stroke, handle, type_):
+
+		changed = 0
+		for has_changed, bit in self._get_changes:
+			if has_changed(handle):
+				changed |= bit
+		if (not changed and self._changed_only
+				and type_ == EventType.TABLET_TOOL_AXIS):
+			return
+		stroke.time.append(self._get_time(handle))
+		stroke.changed.append(changed)
+		for column, get_value in zip(stroke._columns, self._get_values):
+			column.append(get_value(handle))
+
+	def feed(self, event):
+		"""Process an event.
+
+		Events other than tablet tool events are ignored.
+
+		Args:
+			event (~libinput.event.Event): Any event.
+		Returns:
+			Stroke: The stroke ended by this event or :obj:`None`.
+		"""
+
+		type_ = event.type
+		if not type_.is_tablet_tool():
+			return None
+		libinput, handle = event._libinput, event._handle
+		if libinput is not self._libinput:
+			self._bind(libinput)
+		htool = libinput.libinput_event_tablet_tool_get_tool(handle)
+		stroke = self._strokes.get(htool)
+		if stroke is None:
+			if (type_ != EventType.TABLET_TOOL_TIP
+					or libinput.libinput_event_tablet_tool_get_tip_state(
+						handle) != TabletToolTipState.DOWN):
+				return None
+			stroke = self._strokes[htool] = Stroke(
+				TabletTool(htool, libinput))
+		self._sample(stroke, handle, type_)
+		if type_ == EventType.TABLET_TOOL_TIP:
+			if libinput.libinput_event_tablet_tool_get_tip_state(
+					handle) == TabletToolTipState.UP:
+				stroke.complete = True
+				return self._strokes.pop(htool)
+		elif type_ == EventType.TABLET_TOOL_PROXIMITY:
+			return self._strokes.pop(htool)
+		return None
+
+	def strokes(self, events):
+		"""Yield the strokes drawn by a stream of events.
+
+		Args:
+			events (~collections.abc.Iterable): Any events, e.g.
+				:attr:`~libinput.LibInput.events`.
+		Yields:
+			Stroke: Finished strokes.
+		"""
+
+		feed = self.feed
+		for event in events:
+			stroke = feed(event)
+			if stroke is not None:
+				yield stroke
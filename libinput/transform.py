@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import, division
+from collections import namedtuple
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+
+_identity = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+
+
+class Output(namedtuple('Output', ('x', 'y', 'width', 'height'))):
+	"""An output rectangle in screen coordinates, e.g. one monitor of
+	a multi-monitor layout.
+	"""
+
+	__slots__ = ()
+
+
+class Transform(object):
+	"""Maps absolute coordinates in mm to output coordinates in bulk.
+
+	This is the batch equivalent of
+	:meth:`~libinput.event.PointerEvent.transform_absolute_coords`,
+	:meth:`~libinput.event.TouchEvent.transform_coords` and
+	:meth:`~libinput.event.TabletToolEvent.transform_coords`: coordinates
+	are normalized by the device size, multiplied by ``matrix`` and scaled to
+	the output. All three steps are folded into a single affine map that is
+	applied to whole arrays at once, e.g. the ``x`` and ``y`` columns of
+	:class:`~libinput.array.EventArrays`, without calling into libinput.
+
+	Note:
+		libinput applies the calibration matrix of a device before it
+		reports coordinates in mm. Only pass that matrix when transforming
+		coordinates recorded without calibration, otherwise use ``matrix``
+		for additional transformations such as rotating the output.
+	"""
+
+	def __init__(self, size, matrix=_identity):
+		"""Initialize a transform.
+
+		Args:
+			size ((float, float)): The device (width, height) in mm,
+				see :attr:`~libinput.define.Device.size`.
+			matrix ((float, float, float, float, float, float)): The first
+				two rows of a 3x3 matrix applied to normalized coordinates,
+				as described in
+				:meth:`~libinput.define.DeviceConfigCalibration.set_matrix`.
+		"""
+
+		self.size = tuple(size)
+		self.matrix = tuple(matrix)
+
+	@classmethod
+	def from_device(cls, device, calibration=False):
+		"""Create a transform for a device.
+
+		Args:
+			device (~libinput.define.Device): A device with a size.
+			calibration (bool): Use the device's current calibration matrix.
+		Returns:
+			Transform: The transform.
+		Raises:
+			AssertionError
+		"""
+
+		if calibration:
+			return cls(device.size, device.config.calibration.matrix[1])
+		return cls(device.size)
+
+	def coefficients(self, output):
+		"""Return the affine map from mm to an output.
+
+		Args:
+			output (Output): The output rectangle, a (width, height) tuple
+				is taken as an output at the origin.
+		Returns:
+			(float, float, float, float, float, float): ``(a, b, c, d, e, f)``
+			such that ``x' = a * x + b * y + c`` and
+			``y' = d * x + e * y + f``.
+		"""
+
+		if len(output) == 2:
+			output = Output(0, 0, output[0], output[1])
+		a, b, c, d, e, f = self.matrix
+		width, height = self.size
+		return (
+			a * output.width / width, b * output.width / height,
+			c * output.width + output.x,
+			d * output.height / width, e * output.height / height,
+			f * output.height + output.y)
+
+	def apply(self, x, y, output):
+		"""Transform coordinates to an output.
+
+		Args:
+			x: The x coordinates in mm, a NumPy array or any sequence.
+			y: The y coordinates in mm, of the same length as ``x``.
+			output (Output): The output rectangle, a (width, height) tuple
+				is taken as an output at the origin.
+		Returns:
+			(numpy.ndarray, numpy.ndarray): Output (x, y) coordinates. Lists
+			are returned if NumPy is not available.
+		"""
+
+		a, b, c, d, e, f = self.coefficients(output)
+		if numpy is not None:
+			x = numpy.asarray(x, dtype=float)
+			y = numpy.asarray(y, dtype=float)
+			return a * x + b * y + c, d * x + e * y + f
+		return ([a * x_ + b * y_ + c for x_, y_ in zip(x, y)],
+			[d * x_ + e * y_ + f for x_, y_ in zip(x, y)])
+
+	def apply_outputs(self, x, y, outputs):
+		"""Transform coordinates to several outputs.
+
+		Args:
+			x: The x coordinates in mm, see :meth:`apply`.
+			y: The y coordinates in mm.
+			outputs (~collections.abc.Iterable): :class:`Output` rectangles.
+		Returns:
+			list: (x, y) coordinates per output, as returned by :meth:`apply`.
+		"""
+
+		if numpy is not None:
+			x = numpy.asarray(x, dtype=float)
+			y = numpy.asarray(y, dtype=float)
+		return [self.apply(x, y, output) for output in outputs]
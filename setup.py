@@ -37,5 +37,6 @@ setup(
 	package_dir={'libinput': 'libinput'},
 	install_requires=[
 		'aenum;python_version<"3.6"',
-		'selectors34;python_version<"3.4"'])
-		# ~ 'monotonic;python_version<"3.3"'])
+		'selectors34;python_version<"3.4"',
+		'monotonic;python_version<"3.3"'],
+	extras_require={'numpy': ['numpy']})
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import pytest
+from libinput import LibInput
+from .fakelib import FakeLibInput
+
+
+@pytest.fixture
+def fake():
+
+	lib = FakeLibInput()
+	# Not undone, contexts of earlier tests may be collected at any time
+	# and still need some library to release themselves.
+	LibInput._libinput = lib
+	yield lib
+	lib.close()
+
+
+@pytest.fixture
+def li(fake):
+
+	return LibInput()
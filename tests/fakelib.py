@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import os
+from collections import deque
+from itertools import count
+from libinput.constant import ConfigStatus
+
+
+_families = ('tablet_tool_', 'tablet_pad_', 'device_notify_', 'pointer_',
+	'keyboard_', 'touch_', 'gesture_', 'switch_')
+# Handles are unique across fakes, Device caches its descriptors by handle.
+_handles = count(0x1000)
+
+
+def _key(value):
+
+	return getattr(value, 'value', value)
+
+
+class Function(object):
+	"""A foreign function stand-in, accepts argtypes and restype.
+	"""
+
+	def __init__(self, implementation, name):
+
+		self.implementation = implementation
+		self.argtypes = None
+		self.restype = None
+		self.__name__ = name
+
+	def __call__(self, *args):
+
+		return self.implementation(*args)
+
+
+class FakeLibInput(object):
+	"""A stand-in for the libinput library driven by Python data.
+
+	Events are dictionaries of the values returned by their accessors,
+	keyed by the accessor name without its prefix, e.g. ``dx`` for
+	``libinput_event_pointer_get_dx``. Accessors taking an axis or other
+	argument look their value up in a dictionary keyed by that argument.
+
+	Every context has a queue and an always readable file descriptor of its
+	own, and reads the shared :attr:`queue` once its own is empty.
+	"""
+
+	def __init__(self):
+
+		self.queue = deque()
+		self.events = {}
+		self.devices = {}
+		self.calls = []
+		self._contexts = {}
+
+	def close(self):
+
+		for _, read, write in self._contexts.values():
+			os.close(read)
+			os.close(write)
+
+	def _create_context(self, *args):
+
+		handle = next(_handles)
+		read, write = os.pipe()
+		os.write(write, b'\0')
+		self._contexts[handle] = (deque(), read, write)
+		return handle
+
+	def _queue(self, li):
+
+		queue = self._contexts[li][0]
+		return queue if queue else self.queue
+
+	def add_device(self, sysname='event0', name='Device', id_vendor=1,
+			id_product=1, capabilities=(), size=None, seat='seat0',
+			logical_seat='default', keys=(), buttons=(), config=None):
+
+		handle = next(_handles)
+		self.devices[handle] = dict(sysname=sysname, name=name,
+			id_vendor=id_vendor, id_product=id_product,
+			capabilities=set(_key(cap) for cap in capabilities), size=size,
+			seat=seat, logical_seat=logical_seat, keys=set(keys),
+			buttons=set(buttons), config=dict(config or {}))
+		return handle
+
+	def push(self, type_, device=None, time=0, li=None, **fields):
+		"""Queue an event, for the context ``li`` only if given.
+		"""
+
+		handle = next(_handles)
+		fields.update(type=type_, device=device, time=time)
+		self.events[handle] = fields
+		if li is None:
+			self.queue.append(handle)
+		else:
+			self._contexts[li._li][0].append(handle)
+		return handle
+
+	def implement(self, name, implementation):
+
+		function = Function(implementation, name)
+		object.__setattr__(self, name, function)
+		return function
+
+	def __getattr__(self, name):
+
+		if name.startswith('_'):
+			raise AttributeError(name)
+		return self.implement(name, self._implementation(name))
+
+	def _implementation(self, name):
+
+		events, devices = self.events, self.devices
+		context = {
+			'libinput_path_create_context': self._create_context,
+			'libinput_udev_create_context': self._create_context,
+			'libinput_get_event': lambda li:
+				self._queue(li).popleft() if self._queue(li) else None,
+			'libinput_next_event_type': lambda li:
+				_key(events[self._queue(li)[0]]['type'])
+				if self._queue(li) else 0,
+			'libinput_get_fd': lambda li: self._contexts[li][1],
+			'libinput_event_get_type': lambda h: events[h]['type'],
+			'libinput_event_get_device': lambda h: events[h]['device'],
+			'libinput_device_get_sysname':
+				lambda h: devices[h]['sysname'].encode(),
+			'libinput_device_get_name': lambda h: devices[h]['name'].encode(),
+			'libinput_device_get_id_vendor': lambda h: devices[h]['id_vendor'],
+			'libinput_device_get_id_product':
+				lambda h: devices[h]['id_product'],
+			'libinput_device_get_seat': lambda h: h,
+			'libinput_seat_get_physical_name':
+				lambda h: devices[h]['seat'].encode(),
+			'libinput_seat_get_logical_name':
+				lambda h: devices[h]['logical_seat'].encode(),
+			'libinput_device_has_capability':
+				lambda h, cap: _key(cap) in devices[h]['capabilities'],
+			'libinput_device_keyboard_has_key':
+				lambda h, code: int(code in devices[h]['keys']),
+			'libinput_device_pointer_has_button':
+				lambda h, code: int(code in devices[h]['buttons']),
+			'libinput_device_get_size': self._size}
+		if name in context:
+			return context[name]
+		if name.startswith('libinput_event_get_') and name.endswith('_event'):
+			return lambda h: h
+		if name.endswith('_get_time_usec'):
+			return lambda h: events[h]['time']
+		if name.endswith('_get_time'):
+			return lambda h: events[h]['time'] // 1000
+		if name.startswith('libinput_event_'):
+			field = name[len('libinput_event_'):]
+			for family in _families:
+				if field.startswith(family):
+					field = field[len(family):]
+					break
+			if field.startswith('get_'):
+				field = field[len('get_'):]
+			return lambda h, *args: self._field(events[h], field, args)
+		if name.startswith('libinput_device_config_'):
+			return self._config(name[len('libinput_device_config_'):])
+		return lambda *args: 0
+
+	def _field(self, values, field, args):
+
+		value = values.get(field, 0)
+		if args and isinstance(value, dict):
+			return value.get(_key(args[0]), 0)
+		return value
+
+	def _size(self, handle, width, height):
+
+		size = self.devices[handle]['size']
+		if size is None:
+			return -1
+		width._obj.value, height._obj.value = size
+		return 0
+
+	def _config(self, field):
+
+		def setter(handle, *args):
+
+			self.calls.append((field, args))
+			config = self.devices[handle]['config']
+			config[field.replace('_set_', '_get_', 1)] = args[-1]
+			return ConfigStatus.SUCCESS
+
+		if '_set_' in field or field.startswith('set_'):
+			return setter
+		return lambda handle, *args: self.devices[handle]['config'].get(
+			field, 0)
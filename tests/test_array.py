@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from collections import namedtuple
+import pytest
+from libinput.constant import EventType, KeyState
+from libinput.record import Encoder, PointerMotionRecord, decode_many
+
+numpy = pytest.importorskip('numpy')
+from libinput.array import EventArrays, dtypes, _dtype
+
+
+def test_dtypes_match_the_record_layout():
+
+	for name, dtype in dtypes().items():
+		assert dtype.itemsize == EventArrays()[name].itemsize
+	assert dtypes()['pointer_motion'].names == ('type', 'device', 'time',
+		'dx', 'dy', 'dx_unaccelerated', 'dy_unaccelerated')
+
+
+def test_dtypes_accept_bytes_formats():
+
+	# Struct.format is bytes before Python 3.7.
+	struct = namedtuple('Struct', ('format',))(
+		PointerMotionRecord.struct.format.encode())
+	family = namedtuple('Family', ('record', 'struct'))(
+		PointerMotionRecord.record, struct)
+	assert _dtype(family) == dtypes()['pointer_motion']
+
+
+def test_arrays_grow_and_match_records(fake, li):
+
+	device = fake.add_device()
+	for time in range(5):
+		fake.push(EventType.POINTER_MOTION, device, time, dx=float(time),
+			dy=-1.0)
+	fake.push(EventType.KEYBOARD_KEY, device, 5, key=30,
+		key_state=KeyState.PRESSED)
+	events = li.events
+	events = [next(events) for _ in range(6)]
+	arrays = EventArrays(capacity=2)
+	arrays.extend(events)
+	assert len(arrays) == 6
+	motion = arrays['pointer_motion']
+	assert list(motion['time']) == list(range(5))
+	assert list(motion['dx']) == [0.0, 1.0, 2.0, 3.0, 4.0]
+	records = decode_many(Encoder().encode_many(events))
+	assert tuple(motion[4])[2:] == records[4][2:]
+	assert list(arrays['keyboard']['key']) == [30]
+	assert sorted(arrays.arrays()) == ['keyboard', 'pointer_motion']
+	assert len(arrays['touch']) == 0
+	arrays.clear()
+	assert len(arrays) == 0
+	assert len(arrays['pointer_motion']) == 0
+
+
+def test_dispatch_arrays_reads_pending_events(fake, li):
+
+	device = fake.add_device()
+	fake.push(EventType.POINTER_MOTION, device, 7, dx=2.0)
+	arrays = li.dispatch_arrays()
+	assert list(arrays['pointer_motion']['dx']) == [2.0]
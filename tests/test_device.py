@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import gc
+import pytest
+from libinput.constant import AccelProfile, ConfigStatus, DeviceCapability
+from libinput.constant import TapState
+from libinput.device import CodeBitmap, Device
+
+
+def _counting(fake, name):
+
+	calls = []
+	function = getattr(fake, name)
+	fake.implement(name, lambda *args: calls.append(args) or function(*args))
+	return calls
+
+
+def test_descriptor_is_read_once_per_device(fake):
+
+	handle = fake.add_device('event7', 'Mouse', 2, 3,
+		[DeviceCapability.POINTER], size=(10.0, 20.0))
+	calls = _counting(fake, 'libinput_device_get_sysname')
+	first, second = Device(handle, fake), Device(handle, fake)
+	assert (first.sysname, first.name, first.id_vendor, first.id_product) \
+		== ('event7', 'Mouse', 2, 3)
+	assert second.size == (10.0, 20.0)
+	assert second.capabilities == (DeviceCapability.POINTER,)
+	assert first.descriptor is second.descriptor
+	assert len(calls) == 1
+	first.invalidate()
+	assert second.sysname == 'event7'
+	assert len(calls) == 2
+	del first, second
+	gc.collect()
+	assert handle not in Device._descriptors
+	assert handle not in Device._wrappers
+	assert Device(handle, fake).sysname == 'event7'
+	assert len(calls) == 3
+
+
+def test_bitmaps_are_probed_once_and_dropped_with_the_device(fake):
+
+	handle = fake.add_device(keys=[1, 30, 0x2ff], buttons=[0x110, 0x112])
+	calls = _counting(fake, 'libinput_device_keyboard_has_key')
+	device = Device(handle, fake)
+	keys = device.keyboard.keys
+	assert list(keys) == [1, 30, 0x2ff]
+	probes = len(calls)
+	assert Device(handle, fake).keyboard.keys is keys
+	assert len(calls) == probes
+	assert list(device.pointer.buttons) == [0x110, 0x112]
+	del device
+	gc.collect()
+	assert handle not in Device._bitmaps
+
+
+def test_code_bitmap_set_operations():
+
+	first = CodeBitmap.from_codes([1, 3, 5])
+	second = CodeBitmap.from_codes([3, 4])
+	assert list(first & second) == [3]
+	assert list(first | second) == [1, 3, 4, 5]
+	assert list(first - second) == [1, 5]
+	assert len(first) == 3 and int(second) == 0b11000
+	assert 5 in first and 2 not in first and -1 not in first
+	assert first == CodeBitmap(0b101010) and first != second
+	assert first.contains([1, 2, -1]) == [True, False, False]
+	data = CodeBitmap.from_codes([0, 9]).to_bytes()
+	assert data[:2] == b'\x01\x02' and len(data) == 96
+
+
+def test_code_bitmap_contains_arrays():
+
+	numpy = pytest.importorskip('numpy')
+	bitmap = CodeBitmap.from_codes([2, 767])
+	assert bitmap.contains(numpy.array([2, 3, 767, 768, -1])).tolist() == [
+		True, False, True, False, False]
+
+
+def _configurable(fake):
+
+	return Device(fake.add_device(config={
+		'accel_is_available': 1, 'accel_get_speed': 0.25,
+		'accel_get_profile': AccelProfile.ADAPTIVE,
+		'tap_get_finger_count': 3, 'tap_get_enabled': TapState.DISABLED,
+		'tap_get_default_enabled': TapState.ENABLED}), fake)
+
+
+def test_snapshot_names_enumerations(fake):
+
+	snapshot = _configurable(fake).config.snapshot()
+	assert sorted(snapshot) == [
+		'accel', 'click', 'scroll', 'send_events', 'tap']
+	assert snapshot['tap']['enabled'] == 'DISABLED'
+	assert snapshot['tap']['default_enabled'] == 'ENABLED'
+	assert snapshot['accel']['profile'] == 'ADAPTIVE'
+	assert snapshot['accel']['speed'] == 0.25
+
+
+def test_apply_sets_only_changed_settings(fake):
+
+	config = _configurable(fake).config
+	snapshot = config.snapshot()
+	snapshot['tap']['enabled'] = 'ENABLED'
+	snapshot['accel']['speed'] = 0.25 + 1e-9
+	snapshot['accel']['profile'] = 'FLAT'
+	statuses = config.apply(snapshot)
+	assert statuses == {'tap': {'enabled': ConfigStatus.SUCCESS},
+		'accel': {'profile': ConfigStatus.SUCCESS}}
+	assert [field for field, _ in fake.calls] == [
+		'accel_set_profile', 'tap_set_enabled']
+	assert config.apply(snapshot) == {}
+
+
+def test_apply_rejects_unknown_names_before_setting_anything(fake):
+
+	config = _configurable(fake).config
+	with pytest.raises(ValueError, match=r'tap\.drag_enabled'):
+		config.apply({'accel': {'speed': 0.5},
+			'tap': {'drag_enabled': 'SOMETIMES'}})
+	assert fake.calls == []
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import pytest
+from libinput.constant import EventType, TabletToolProximityState
+from libinput.filter import DeadZone, ExponentialMovingAverage, Filter
+from libinput.filter import FilterPipeline, OneEuroFilter, VelocityClamp
+
+
+def _run(filter_, samples, relative, dt=0.01):
+
+	state = filter_.allocate(2)
+	results = []
+	for index, sample in enumerate(samples):
+		values = list(sample)
+		filter_.apply(state, dt if index else 0, values, relative)
+		results.append(tuple(values))
+	return results
+
+
+def test_filters_must_implement_apply():
+
+	with pytest.raises(TypeError):
+		Filter()
+
+
+def test_exponential_moving_average():
+
+	assert _run(ExponentialMovingAverage(0.5),
+		[(0.0, 4.0), (4.0, 0.0), (4.0, 0.0)], False) == [
+		(0.0, 4.0), (2.0, 2.0), (3.0, 1.0)]
+
+
+def test_one_euro_smooths_jitter_and_passes_steady_values():
+
+	results = _run(OneEuroFilter(min_cutoff=1.0),
+		[(10.0, 10.0), (11.0, 9.0), (10.0, 10.0)], False)
+	assert results[0] == (10.0, 10.0)
+	assert 10.0 < results[1][0] < 10.2
+	assert _run(OneEuroFilter(), [(5.0, 5.0)] * 3, False)[-1] == (5.0, 5.0)
+
+
+def test_dead_zone_accumulates_relative_motion():
+
+	assert _run(DeadZone(1.0), [(0.4, 0.0)] * 3 + [(0.1, 0.0)], True) == [
+		(0.0, 0.0), (0.0, 0.0), pytest.approx((1.2, 0.0)), (0.0, 0.0)]
+
+
+def test_dead_zone_holds_positions():
+
+	assert _run(DeadZone(1.0), [(0.0, 0.0), (0.5, 0.5), (2.0, 0.0)],
+		False) == [(0.0, 0.0), (0.0, 0.0), (2.0, 0.0)]
+
+
+def test_velocity_clamp_shortens_fast_movements():
+
+	assert _run(VelocityClamp(100.0), [(3.0, 4.0)], True, 0.01) == [
+		(3.0, 4.0)]
+	assert _run(VelocityClamp(100.0), [(0.0, 0.0), (3.0, 4.0)], False)[-1] \
+		== pytest.approx((0.6, 0.8))
+
+
+def test_pipeline_sets_filtered_values(fake, li):
+
+	device = fake.add_device()
+	fake.push(EventType.POINTER_MOTION, device, 0, dx=2.0, dy=0.0)
+	fake.push(EventType.POINTER_MOTION, device, 1000, dx=4.0, dy=2.0)
+	fake.push(EventType.KEYBOARD_KEY, device, 2000)
+	pipeline = FilterPipeline(pointer=[ExponentialMovingAverage(0.5)])
+	events = li.events
+	filtered = [event.filtered for event in pipeline.events(
+		next(events) for _ in range(3))]
+	assert filtered == [(2.0, 0.0), (3.0, 1.0), None]
+
+
+def test_pipeline_drops_state_of_finished_streams(fake, li):
+
+	device = fake.add_device()
+	fake.push(EventType.POINTER_MOTION, device, 0, dx=1.0)
+	fake.push(EventType.TOUCH_DOWN, device, 0, slot=0, x=1.0)
+	fake.push(EventType.TOUCH_DOWN, device, 0, slot=1, x=1.0)
+	fake.push(EventType.TOUCH_UP, device, 10, slot=0)
+	fake.push(EventType.TABLET_TOOL_PROXIMITY, device, 0, tool=7,
+		proximity_state=TabletToolProximityState.IN)
+	fake.push(EventType.TABLET_TOOL_PROXIMITY, device, 10, tool=7,
+		proximity_state=TabletToolProximityState.OUT)
+	fake.push(EventType.DEVICE_REMOVED, device)
+	average = ExponentialMovingAverage()
+	pipeline = FilterPipeline([average], [average], [average])
+	events = li.events
+	sizes = []
+	for _ in range(7):
+		pipeline.feed(next(events))
+		sizes.append(len(pipeline._states))
+	assert sizes == [1, 2, 3, 2, 3, 2, 0]
+
+
+def test_pipeline_drops_tools_in_proximity_of_removed_devices(fake, li):
+
+	device = fake.add_device()
+	fake.push(EventType.TABLET_TOOL_PROXIMITY, device, 0, tool=7,
+		proximity_state=TabletToolProximityState.IN)
+	fake.push(EventType.TABLET_TOOL_AXIS, device, 10, tool=7, x=1.0)
+	fake.push(EventType.DEVICE_REMOVED, device)
+	pipeline = FilterPipeline(tablet=[ExponentialMovingAverage()])
+	events = li.events
+	sizes = []
+	for _ in range(3):
+		pipeline.feed(next(events))
+		sizes.append(len(pipeline._states))
+	assert sizes == [1, 1, 0]
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from libinput.constant import EventType
+from libinput.gesture import GestureAggregator
+
+
+def _summaries(li, aggregator, count):
+
+	events = li.events
+	return list(aggregator.summaries(next(events) for _ in range(count)))
+
+
+def test_pinch_is_summarized_when_it_ends(fake, li):
+
+	device = fake.add_device()
+	fake.push(EventType.GESTURE_PINCH_BEGIN, device, 100, finger_count=2,
+		scale=1.0)
+	for time, scale in ((110, 1.2), (120, 1.5)):
+		fake.push(EventType.GESTURE_PINCH_UPDATE, device, time,
+			finger_count=2, dx=1.0, dy=-0.5, dx_unaccelerated=2.0,
+			scale=scale, angle_delta=10.0)
+	fake.push(EventType.GESTURE_PINCH_END, device, 150, finger_count=2,
+		scale=1.75, cancelled=0)
+	aggregator = GestureAggregator()
+	summary, = _summaries(li, aggregator, 4)
+	assert summary.type == EventType.GESTURE_PINCH_BEGIN
+	assert (summary.finger_count, summary.finished, summary.cancelled) == (
+		2, True, 0)
+	assert (summary.time, summary.duration, summary.updates) == (100, 50, 2)
+	assert (summary.dx, summary.dy, summary.dx_unaccelerated) == (
+		2.0, -1.0, 4.0)
+	assert (summary.scale, summary.angle) == (1.75, 20.0)
+	assert aggregator.active == 0
+
+
+def test_progress_snapshots_are_rate_limited(fake, li):
+
+	device = fake.add_device()
+	fake.push(EventType.GESTURE_SWIPE_BEGIN, device, 0, finger_count=3)
+	for time in range(1000, 6000, 1000):
+		fake.push(EventType.GESTURE_SWIPE_UPDATE, device, time, dx=1.0)
+	fake.push(EventType.GESTURE_SWIPE_END, device, 6000, cancelled=1)
+	summaries = _summaries(li, GestureAggregator(progress=0.002), 7)
+	assert [(summary.finished, summary.updates)
+		for summary in summaries] == [
+		(False, 2), (False, 4), (True, 5)]
+	assert summaries[-1].cancelled
+	assert summaries[-1].scale == 1.0
+
+
+def test_devices_are_tracked_separately(fake, li):
+
+	first, second = fake.add_device('event1'), fake.add_device('event2')
+	fake.push(EventType.GESTURE_HOLD_BEGIN, first, 0, finger_count=1)
+	fake.push(EventType.GESTURE_HOLD_BEGIN, second, 5, finger_count=2)
+	fake.push(EventType.GESTURE_HOLD_END, first, 10)
+	aggregator = GestureAggregator()
+	summary, = _summaries(li, aggregator, 3)
+	assert (summary.finger_count, summary.duration) == (1, 10)
+	assert aggregator.active == 1
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from libinput.constant import EventType
+from libinput.hotplug import HotplugAggregator
+
+
+class Clock(object):
+
+	def __init__(self):
+
+		self.now = 100.0
+
+	def __call__(self):
+
+		return self.now
+
+
+def _feed(li, aggregator, count):
+
+	events = li.events
+	for _ in range(count):
+		aggregator.feed(next(events))
+
+
+def test_bursts_are_delivered_once_quiet(fake, li):
+
+	clock = Clock()
+	aggregator = HotplugAggregator(window=0.25, max_delay=None, clock=clock)
+	mouse, keyboard, transient = (fake.add_device('event1', 'Mouse'),
+		fake.add_device('event2', 'Keyboard'),
+		fake.add_device('event3', 'Transient'))
+	old_mouse = fake.add_device('event0', 'Mouse')
+	fake.push(EventType.DEVICE_ADDED, old_mouse)
+	_feed(li, aggregator, 1)
+	clock.now += 1
+	assert [device.sysname for device in aggregator.poll().added] == [
+		'event0']
+	assert not aggregator.pending and aggregator.timeout() is None
+	fake.push(EventType.DEVICE_REMOVED, old_mouse)
+	fake.push(EventType.DEVICE_ADDED, mouse)
+	fake.push(EventType.DEVICE_ADDED, keyboard)
+	fake.push(EventType.DEVICE_ADDED, transient)
+	fake.push(EventType.DEVICE_REMOVED, transient)
+	fake.push(EventType.KEYBOARD_KEY, keyboard)
+	_feed(li, aggregator, 6)
+	assert aggregator.pending
+	clock.now += 0.1
+	assert aggregator.poll() is None
+	assert abs(aggregator.timeout() - 0.15) < 1e-9
+	clock.now += 0.15
+	delta = aggregator.poll()
+	assert [device.sysname for device in delta.added] == ['event2']
+	assert delta.removed == []
+	(old, new), = delta.replaced
+	assert (old.sysname, new.sysname) == ('event0', 'event1')
+
+
+def test_max_delay_bounds_a_continuous_burst(fake, li):
+
+	clock = Clock()
+	aggregator = HotplugAggregator(window=0.25, max_delay=1.0, clock=clock)
+	for index in range(6):
+		fake.push(EventType.DEVICE_ADDED,
+			fake.add_device('event{}'.format(index)))
+	for _ in range(5):
+		_feed(li, aggregator, 1)
+		assert aggregator.poll() is None
+		clock.now += 0.2
+	assert aggregator.timeout() == 0.0
+	assert len(aggregator.poll().added) == 5
+	_feed(li, aggregator, 1)
+	assert len(aggregator.flush().added) == 1
+	assert aggregator.flush() is None
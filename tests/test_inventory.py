@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from libinput.constant import DeviceCapability, EventType
+
+
+def _read(li, count):
+
+	events = li.events
+	for _ in range(count):
+		next(events)
+
+
+def test_inventory_follows_device_events(fake, li):
+
+	keyboard = fake.add_device('event1', 'Keyboard', 0x46d, 0xc31c,
+		[DeviceCapability.KEYBOARD], keys=[30])
+	touchpad = fake.add_device('event2', 'Touchpad', 0x46d, 0x4011,
+		[DeviceCapability.POINTER, DeviceCapability.GESTURE],
+		size=(100.0, 60.0), seat='seat1', buttons=[0x110])
+	fake.push(EventType.DEVICE_ADDED, keyboard)
+	fake.push(EventType.DEVICE_ADDED, touchpad)
+	_read(li, 2)
+	devices = li.devices
+	assert len(devices) == 2
+	assert 'event1' in devices
+	entry = devices.get('event2')
+	assert (entry.name, entry.seat, entry.size) == (
+		'Touchpad', 'seat1', (100.0, 60.0))
+	assert entry.has_capability(DeviceCapability.GESTURE)
+	assert entry.has_button(0x110) and not entry.has_button(0x111)
+	assert not entry.has_key(30)
+	assert devices.get('event1').has_key(30)
+	assert devices.entry(entry.device) is entry
+	fake.push(EventType.DEVICE_REMOVED, keyboard)
+	_read(li, 1)
+	assert 'event1' not in devices
+	assert [entry.sysname for entry in devices] == ['event2']
+	assert devices.find(id_vendor=0x46d, id_product=0xc31c) == []
+
+
+def test_find_intersects_criteria(fake, li):
+
+	first = fake.add_device('event1', id_vendor=1, id_product=1,
+		capabilities=[DeviceCapability.POINTER])
+	second = fake.add_device('event2', id_vendor=1, id_product=2,
+		capabilities=[DeviceCapability.POINTER, DeviceCapability.TOUCH])
+	third = fake.add_device('event3', id_vendor=2, id_product=1,
+		capabilities=[DeviceCapability.TOUCH], seat='seat1')
+	for device in (first, second, third):
+		fake.push(EventType.DEVICE_ADDED, device)
+	_read(li, 3)
+	devices = li.devices
+
+	def find(**criteria):
+
+		return sorted(entry.sysname for entry in devices.find(**criteria))
+
+	assert find() == ['event1', 'event2', 'event3']
+	assert find(capability=DeviceCapability.POINTER) == ['event1', 'event2']
+	assert find(id_vendor=1) == ['event1', 'event2']
+	assert find(id_vendor=1, id_product=2) == ['event2']
+	assert find(capability=DeviceCapability.TOUCH, seat='seat0') == [
+		'event2']
+	assert find(capability=DeviceCapability.KEYBOARD) == []
+	devices.clear()
+	assert find() == []
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import gc
+try:
+	from time import monotonic
+except ImportError:
+	from monotonic import monotonic
+from libinput import LibInput
+from libinput.constant import ContextType, EventType, DeviceCapability
+from libinput.event import Event
+
+
+def _keyboard(fake):
+
+	return fake.add_device(sysname='event1', name='Keyboard',
+		capabilities=[DeviceCapability.KEYBOARD])
+
+
+def test_timings_record_every_stage(fake, li):
+
+	device = _keyboard(fake)
+	for time in range(3):
+		fake.push(EventType.KEYBOARD_KEY, device, time, key=30)
+	li.enable_timings()
+	events = li.events
+	for _ in range(3):
+		next(events)
+	timings = li.timings
+	assert timings['select'].count == 1
+	assert timings['wrap'].count == 3
+	assert timings['consumer'].count == 2
+	li.enable_timings(False)
+	assert li.timings is None
+
+
+def test_latency_is_tracked_per_device_and_type(fake, li):
+
+	device = _keyboard(fake)
+	now = int(monotonic() * 1e6)
+	fake.push(EventType.DEVICE_ADDED, device)
+	fake.push(EventType.KEYBOARD_KEY, device, now - 20000, key=30)
+	fake.push(EventType.KEYBOARD_KEY, device, now - 10000, key=30)
+	li.enable_latency()
+	events = li.events
+	for _ in range(3):
+		next(events)
+	histogram = li.latency['event1', EventType.KEYBOARD_KEY]
+	assert histogram.count == 2
+	assert histogram.min >= 10000
+	assert histogram.max >= 20000
+	snapshot = li.latency_snapshot()
+	assert list(snapshot) == ['event1']
+	assert snapshot['event1']['KEYBOARD_KEY']['count'] == 2
+	li.enable_latency(False)
+	assert li.latency_snapshot() is None
+
+
+def test_metrics_count_events_and_live_objects(fake, li):
+
+	device = _keyboard(fake)
+	fake.push(EventType.DEVICE_ADDED, device)
+	fake.push(EventType.KEYBOARD_KEY, device, 1, key=30)
+	assert Event._live is None
+	li.enable_metrics()
+	events = li.events
+	added = next(events)
+	key = next(events)
+	metrics = li.metrics
+	assert metrics['libinput_events_total'].get(
+		('KEYBOARD_KEY', 'event1')) == 1
+	assert metrics['libinput_live_objects'].get(('event',)) == 2
+	del added, key
+	events.close()
+	assert metrics['libinput_live_objects'].get(('event',)) == 0
+	li.enable_metrics(False)
+	assert Event._live is None
+	assert metrics['libinput_live_objects'].get(('event',)) == 0
+	assert 'libinput_live_objects{kind="tool"} 0' in metrics.render()
+
+
+def test_deleted_udev_contexts_stop_tracking_live_objects(fake):
+
+	li = LibInput(ContextType.UDEV)
+	li.enable_metrics()
+	assert Event._live is not None
+	del li
+	gc.collect()
+	assert Event._live is None
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from libinput.constant import EventType, LogPriority
+from libinput.log import LogQueue
+
+
+def test_rate_limit_notes_suppressed_messages():
+
+	queue = LogQueue(rate=0, burst=2)
+	for number in range(5):
+		queue.put(LogPriority.ERROR, 'a', 'a {}\n'.format(number).encode())
+	assert queue.put(LogPriority.INFO, 'b', b'b\n')
+	assert queue.suppressed == 3
+	assert list(queue.drain()) == [
+		(LogPriority.ERROR, 'a 0\n'), (LogPriority.ERROR, 'a 1\n'),
+		(LogPriority.INFO, 'b\n')]
+
+
+def test_full_queue_drops_oldest():
+
+	queue = LogQueue(size=2)
+	for number in range(3):
+		queue.put(LogPriority.INFO, number, str(number).encode())
+	assert queue.dropped == 1
+	assert [message for _, message in queue.drain()] == ['1', '2']
+
+
+def test_invalid_utf8_is_replaced():
+
+	queue = LogQueue()
+	queue.put(LogPriority.INFO, 'a', b'\xff\n')
+	assert list(queue.drain()) == [(LogPriority.INFO, u'�\n')]
+
+
+def test_messages_are_flushed_after_dispatch(fake, li):
+
+	messages = []
+	li.log_handler = lambda priority, message: messages.append(message)
+	li.enable_log_queue()
+	fake.implement('libinput_dispatch', lambda context: li.log_queue.put(
+		LogPriority.ERROR, 'fmt', b'dispatched\n'))
+	device = fake.add_device()
+	fake.push(EventType.KEYBOARD_KEY, device, 1)
+	next(li.events)
+	assert messages[:1] == ['dispatched\n']
+	del messages[:]
+	fake.push(EventType.KEYBOARD_KEY, device, 2)
+	li.dispatch()
+	assert messages[:1] == ['dispatched\n']
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from collections import namedtuple
+from itertools import islice
+from libinput import LibInput
+from libinput.constant import EventType
+from libinput.merge import ContextMerger, merge
+
+
+Item = namedtuple('Item', ('name', 'time'))
+
+
+def _names(items):
+
+	return [item.name for item in items]
+
+
+def test_merge_orders_sources_by_time():
+
+	first = [Item('a', 1000), Item('c', 3000), Item('e', 5000)]
+	second = [Item('b', 2000), Item('d', 4000)]
+	assert _names(merge([first, second])) == ['a', 'b', 'c', 'd', 'e']
+	assert _names(merge([first, []])) == ['a', 'c', 'e']
+
+
+def test_merge_reorders_within_the_window():
+
+	source = [Item('b', 2000), Item('a', 1000), Item('d', 12000),
+		Item('c', 3000)]
+	assert _names(merge([source], window=0.002)) == ['a', 'b', 'c', 'd']
+	assert _names(merge([source], window=0)) == ['b', 'a', 'd', 'c']
+
+
+def test_merge_keeps_untimed_items_in_place():
+
+	first = [Item('a', 1000), Item('added', 0), Item('c', 3000)]
+	second = [Item('b', 2000)]
+	assert _names(merge([first, second], window=0)) == [
+		'a', 'added', 'b', 'c']
+
+
+class Clock(object):
+
+	def __init__(self):
+
+		self.now = 0.0
+
+	def __call__(self):
+
+		return self.now
+
+
+def test_context_merger_holds_events_for_the_window(fake):
+
+	first, second = LibInput(), LibInput()
+	clock = Clock()
+	merger = ContextMerger([first, second], window=0.005, clock=clock)
+	fake.push(EventType.KEYBOARD_KEY, time=2000, li=first, key=2)
+	fake.push(EventType.KEYBOARD_KEY, time=1000, li=second, key=1)
+	clock.now = 0.004
+	assert merger.dispatch() == []
+	assert merger.pending == 2
+	clock.now = 0.0065
+	assert [event.key for event in merger.dispatch()] == [1]
+	fake.push(EventType.KEYBOARD_KEY, time=500, li=second, key=3)
+	clock.now = 0.01
+	assert [event.key for event in merger.dispatch()] == [3, 2]
+	assert merger.late == 1
+	fake.push(EventType.KEYBOARD_KEY, time=9000, li=first, key=4)
+	merger.dispatch()
+	assert [event.key for event in merger.flush()] == [4]
+	merger.close()
+
+
+def test_contexts_combine_with_recordings(fake):
+
+	li = LibInput()
+	clock = Clock()
+	merger = ContextMerger([li], window=0, clock=clock)
+	fake.push(EventType.KEYBOARD_KEY, time=2000, li=li, key=2)
+	fake.push(EventType.KEYBOARD_KEY, time=4000, li=li, key=4)
+	clock.now = 1.0
+	recording = [Item(1, 1000), Item(3, 3000)]
+	items = merge([merger.events(), recording], window=0)
+	assert [getattr(item, 'key', getattr(item, 'name', None))
+		for item in islice(items, 4)] == [1, 2, 3, 4]
+	merger.close()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import pytest
+from libinput.metric import Histogram, Registry
+
+
+def test_small_values_are_exact():
+
+	histogram = Histogram(significant_bits=4)
+	for value in range(16):
+		histogram.record(value)
+	assert histogram.count == 16
+	assert histogram.min == 0
+	assert histogram.max == 15
+	assert histogram.percentile(50) == 7
+	assert histogram.mean == 7.5
+
+
+def test_large_values_keep_relative_error():
+
+	histogram = Histogram(significant_bits=7)
+	for value in (1000, 123456, 9876543):
+		histogram.record(value)
+		upper = histogram.percentile(100)
+		assert value <= upper <= value * (1 + 1 / 64.0)
+		histogram.reset()
+
+
+def test_bucket_bounds_cover_every_value():
+
+	histogram = Histogram(significant_bits=3)
+	for value in range(2000):
+		low, high = histogram._bounds(histogram._index(value))
+		assert low <= value <= high
+
+
+def test_negative_values_are_clamped():
+
+	histogram = Histogram()
+	histogram.record(-5)
+	assert histogram.min == 0
+
+
+def test_merge_and_snapshot():
+
+	first, second = Histogram(), Histogram()
+	for value in range(100):
+		first.record(value)
+		second.record(value + 100)
+	first.merge(second)
+	summary = first.snapshot((50, 99.9))
+	assert summary['count'] == 200
+	assert summary['min'] == 0
+	assert summary['max'] == 199
+	assert 99 <= summary['p50'] <= 101
+	assert summary['p99_9'] == 199
+	with pytest.raises(ValueError):
+		first.merge(Histogram(significant_bits=3))
+
+
+def test_empty_histogram():
+
+	histogram = Histogram()
+	assert histogram.percentile(50) is None
+	assert histogram.mean is None
+
+
+def test_registry_renders_prometheus_text():
+
+	registry = Registry()
+	counter = registry.counter('events_total', 'Events.', ('type',))
+	counter.inc(('KEY',))
+	counter.inc(('KEY',), 2)
+	gauge = registry.gauge('live', 'Live "objects".')
+	gauge.set_function(lambda: 7)
+	summary = registry.summary('sizes', 'Sizes.', quantiles=(0.5,))
+	for value in (1, 2, 3):
+		summary.observe(value)
+	assert registry.render().splitlines() == [
+		'# HELP events_total Events.',
+		'# TYPE events_total counter',
+		'events_total{type="KEY"} 3',
+		'# HELP live Live "objects".',
+		'# TYPE live gauge',
+		'live 7',
+		'# HELP sizes Sizes.',
+		'# TYPE sizes summary',
+		'sizes{quantile="0.5"} 2',
+		'sizes_sum 6',
+		'sizes_count 3']
+	with pytest.raises(ValueError):
+		registry.counter('live', 'Again.')
+
+
+def test_registry_reset_keeps_functions():
+
+	registry = Registry()
+	gauge = registry.gauge('value', 'A value.', ('kind',))
+	gauge.set(3, ('set',))
+	gauge.set_function(lambda: 5, ('function',))
+	registry.reset()
+	assert registry.snapshot() == {'value': {('function',): 5}}
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from libinput.constant import EventType
+from libinput.multiseat import SeatManager
+
+
+def test_ready_seats_are_interleaved_round_robin(fake):
+
+	manager = SeatManager(['seat0', 'seat1'], quantum=2)
+	contexts = manager.contexts
+	assert sorted(contexts) == ['seat0', 'seat1']
+
+	def push(seat, time):
+
+		fake.push(EventType.KEYBOARD_KEY, time=time, li=contexts[seat])
+
+	for time in range(5):
+		push('seat0', time)
+	push('seat1', 100)
+	order = [(seat, event.time) for seat, event in manager.dispatch()]
+	assert sorted(order) == sorted([('seat0', time) for time in range(5)]
+		+ [('seat1', 100)])
+	first = order[0][0]
+	if first == 'seat0':
+		assert [seat for seat, _ in order[:3]] == ['seat0', 'seat0', 'seat1']
+	else:
+		assert [seat for seat, _ in order[:3]] == ['seat1', 'seat0', 'seat0']
+	for seat in ('seat0', 'seat1'):
+		push(seat, 200)
+	assert manager.dispatch()[0][0] != first
+	manager.close()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import logging
+import pytest
+from libinput.constant import ConfigStatus, DeviceCapability, EventType
+from libinput.constant import TapState
+from libinput.profile import ProfileEngine, Rule
+
+
+def _touchpad(fake, sysname='event8'):
+
+	return fake.add_device(sysname, 'Synaptics Touchpad', 2, 7,
+		[DeviceCapability.POINTER], config={'tap_get_finger_count': 3,
+			'tap_get_enabled': TapState.DISABLED,
+			'tap_get_default_enabled': TapState.DISABLED})
+
+
+@pytest.mark.parametrize('config', [
+	{'tap': {'enabled': 'SOMETIMES'}},
+	{'tap': {'colour': 'red'}},
+	{'tapping': {'enabled': 'ENABLED'}},
+	{'accel': {'speed': 'fast'}},
+	{'tap': 'ENABLED'}])
+def test_invalid_configs_are_rejected(config):
+
+	engine = ProfileEngine()
+	with pytest.raises(ValueError):
+		engine.add(Rule(config))
+	assert engine.rules == ()
+
+
+def test_matching_rules_are_merged_and_applied(fake, li):
+
+	engine = ProfileEngine([
+		Rule({'tap': {'enabled': 'ENABLED', 'drag_enabled': 'ENABLED'}},
+			name='*Touchpad*', capabilities=[DeviceCapability.POINTER]),
+		Rule({'tap': {'drag_enabled': 'DISABLED'}}, id_vendor=2,
+			id_product=7),
+		Rule({'tap': {'button_map': 'LMR'}}, id_vendor=3, id_product=7)])
+	li.profiles = engine
+	device = _touchpad(fake)
+	fake.push(EventType.DEVICE_ADDED, device)
+	next(li.events)
+	assert engine.applied == {
+		'event8': {'tap': {'enabled': ConfigStatus.SUCCESS}}}
+	fake.push(EventType.DEVICE_REMOVED, device)
+	next(li.events)
+	assert engine.applied == {}
+
+
+def test_failures_are_logged_per_device(fake, li, caplog):
+
+	def fail(*args):
+
+		raise OSError('gone')
+
+	engine = ProfileEngine([Rule({'tap': {'enabled': 'ENABLED'}})])
+	li.profiles = engine
+	fake.implement('libinput_device_config_tap_set_enabled', fail)
+	fake.push(EventType.DEVICE_ADDED, _touchpad(fake, 'event8'))
+	fake.push(EventType.KEYBOARD_KEY, fake.add_device())
+	events = li.events
+	with caplog.at_level(logging.ERROR, 'libinput.profile'):
+		assert next(events).type == EventType.DEVICE_ADDED
+	assert next(events).type == EventType.KEYBOARD_KEY
+	assert engine.applied == {'event8': {}}
+	assert 'event8' in caplog.text
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from libinput.constant import EventType, DeviceCapability
+
+
+def test_calls_are_attributed_to_events_and_properties(fake, li):
+
+	device = fake.add_device(capabilities=[DeviceCapability.KEYBOARD])
+	fake.push(EventType.KEYBOARD_KEY, device, 1, key=30)
+	li.enable_profiling()
+	event, = li.dispatch()
+	assert event.key == 30
+	profiler = li.profiler
+	names = [name for name, _, _ in profiler.functions()]
+	assert 'libinput_dispatch' in names
+	assert 'libinput_event_keyboard_get_key' in names
+	by_type = profiler.by_event_type()
+	assert 'libinput_event_keyboard_get_key' in [
+		name for name, _, _ in by_type[EventType.KEYBOARD_KEY]]
+	calls = dict((name, calls) for name, calls, _ in
+		profiler.by_property()['KeyboardEvent.key'])
+	assert calls == {'libinput_event_keyboard_get_key': 1}
+	assert 'KeyboardEvent.key' in profiler.report()
+
+
+def test_disabling_restores_the_library(fake, li):
+
+	li.enable_profiling()
+	li.enable_profiling(False)
+	assert li.profiler is None
+	assert li._libinput is fake
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import threading
+import pytest
+from libinput.constant import EventType, KeyState, OverflowPolicy
+from libinput.pump import EventPump
+from libinput.record import PointerMotionRecord, TouchRecord, KeyboardRecord
+
+
+def _motion(dx, device=1):
+
+	return PointerMotionRecord.record(
+		EventType.POINTER_MOTION, device, 0, dx, 0, dx, 0)
+
+
+def _touch(slot, x, device=1):
+
+	return TouchRecord.record(EventType.TOUCH_MOTION, device, 0, slot, slot,
+		x, 0)
+
+
+def _frame(device=1):
+
+	return TouchRecord.record(EventType.TOUCH_FRAME, device, 0, 0, 0, 0, 0)
+
+
+def _key(key):
+
+	return KeyboardRecord.record(EventType.KEYBOARD_KEY, 1, 0, key, 1, 1)
+
+
+@pytest.fixture
+def pump(li):
+
+	pump = EventPump(li, size=3, policy=OverflowPolicy.COALESCE)
+	yield pump
+	pump.close()
+
+
+def test_pump_delivers_dispatched_events(fake, li):
+
+	fake.push(EventType.KEYBOARD_KEY, time=1000, key=30,
+		key_state=KeyState.PRESSED)
+	fake.push(EventType.KEYBOARD_KEY, time=2000, key=31,
+		key_state=KeyState.PRESSED)
+	pump = EventPump(li)
+	try:
+		records = []
+		while len(records) < 2:
+			records.extend(pump.get(1))
+	finally:
+		pump.close()
+	assert [record.key for record in records] == [30, 31]
+
+
+def test_coalesce_sums_pointer_motion(pump):
+
+	pump._put([_key(1), _key(2), _motion(1), _motion(2), _motion(3)])
+	records = pump.get()
+	assert [record.type for record in records] == [EventType.KEYBOARD_KEY,
+		EventType.KEYBOARD_KEY, EventType.POINTER_MOTION]
+	assert records[-1].dx == 6
+	assert pump.coalesced == 2
+
+
+def test_coalesce_replaces_the_last_touch_frame(pump):
+
+	pump._put([_touch(0, 1), _touch(1, 1), _frame()])
+	pump._put([_touch(1, 2), _frame(), _touch(0, 3), _touch(1, 3), _frame()])
+	records = pump.get()
+	assert [(record.slot, record.x) for record in records[:-1]] == [
+		(0, 3), (1, 3)]
+	assert records[-1].type == EventType.TOUCH_FRAME
+	assert pump.coalesced == 5
+
+
+def test_coalesce_keeps_frames_moving_other_touch_points(pump):
+
+	pump._put([_key(1), _touch(0, 1), _frame()])
+	# The new frame waits for space as with OverflowPolicy.BLOCK.
+	thread = threading.Thread(target=pump._put,
+		args=([_touch(1, 2), _frame()],))
+	thread.start()
+	records = []
+	while len(records) < 5:
+		records.extend(pump.get(1))
+	thread.join()
+	records = records[1:]
+	assert [(record.type, record.x) for record in records] == [
+		(EventType.TOUCH_MOTION, 1), (EventType.TOUCH_FRAME, 0),
+		(EventType.TOUCH_MOTION, 2), (EventType.TOUCH_FRAME, 0)]
+	assert pump.coalesced == 0
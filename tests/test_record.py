@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import pytest
+from libinput.constant import EventType, KeyState, Switch, SwitchState
+from libinput.record import Encoder, decode, decode_many
+
+
+def _read(fake, li, count):
+
+	events = li.events
+	return [next(events) for _ in range(count)]
+
+
+def test_records_round_trip(fake, li):
+
+	device = fake.add_device(sysname='event5')
+	fake.push(EventType.DEVICE_ADDED, device)
+	fake.push(EventType.KEYBOARD_KEY, device, 10, key=30,
+		key_state=KeyState.PRESSED, seat_key_count=1)
+	fake.push(EventType.POINTER_MOTION, device, 20, dx=1.5, dy=-2.0,
+		dx_unaccelerated=0.75, dy_unaccelerated=-1.0)
+	fake.push(EventType.TOUCH_DOWN, device, 30, slot=1, seat_slot=2,
+		x=10.0, y=20.0)
+	fake.push(EventType.TOUCH_FRAME, device, 40)
+	fake.push(EventType.GESTURE_PINCH_UPDATE, device, 50, finger_count=2,
+		dx=1.0, dy=2.0, scale=1.5, angle_delta=-3.0)
+	fake.push(EventType.SWITCH_TOGGLE, device, 60, switch=Switch.LID,
+		switch_state=SwitchState.ON)
+	records = decode_many(Encoder().encode_many(_read(fake, li, 7)))
+	added, key, motion, down, frame, pinch, toggle = records
+	assert (added.type, added.sysname) == (EventType.DEVICE_ADDED, 'event5')
+	assert set(record.device for record in records) == set([added.device])
+	assert (key.time, key.key, key.key_state, key.seat_key_count) == (
+		10, 30, KeyState.PRESSED.value, 1)
+	assert motion[2:] == (20, 1.5, -2.0, 0.75, -1.0)
+	assert down[2:] == (30, 1, 2, 10.0, 20.0)
+	assert frame[2:] == (40, -1, -1, 0.0, 0.0)
+	assert (pinch.finger_count, pinch.dx, pinch.scale, pinch.angle_delta) \
+		== (2, 1.0, 1.5, -3.0)
+	assert (toggle.switch, toggle.switch_state) == (
+		Switch.LID.value, SwitchState.ON.value)
+
+
+def test_bulk_and_single_encoding_agree(fake, li):
+
+	device = fake.add_device()
+	for time in range(3):
+		fake.push(EventType.KEYBOARD_KEY, device, time,
+			key_state=KeyState.RELEASED)
+	events = _read(fake, li, 3)
+	single = Encoder()
+	data = b''.join(single.encode(event) for event in events)
+	assert bytes(Encoder().encode_many(events)) == data
+	buffer = bytearray(len(data) + 4)
+	assert Encoder().pack_many(buffer, 4, events) == len(data)
+	assert decode_many(buffer, 4) == decode_many(data)
+	record, size = decode(data)
+	assert size == len(data) // 3
+	assert record.time == 0
+
+
+def test_device_ids_are_reassigned_after_removal(fake, li):
+
+	first, second = fake.add_device('event1'), fake.add_device('event2')
+	fake.push(EventType.DEVICE_ADDED, first)
+	fake.push(EventType.DEVICE_REMOVED, first)
+	fake.push(EventType.DEVICE_ADDED, second)
+	added, removed, other = decode_many(
+		Encoder().encode_many(_read(fake, li, 3)))
+	assert added.device == removed.device
+	assert other.device != added.device
+
+
+def test_unknown_types_are_rejected():
+
+	with pytest.raises(ValueError):
+		decode(b'\xff\xff' + bytes(64))
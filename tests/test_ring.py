@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import os
+import pytest
+from libinput.constant import EventType, KeyState, OverflowPolicy
+from libinput.ring import RingPublisher, RingReader, _lock_path
+
+
+def _events(fake, li, count):
+
+	events = li.events
+	return [next(events) for _ in range(count)]
+
+
+@pytest.fixture
+def publisher():
+
+	publisher = RingPublisher(capacity=4)
+	yield publisher
+	publisher.close()
+
+
+def test_records_round_trip(fake, li, publisher):
+
+	reader = RingReader(publisher.name)
+	device = fake.add_device(sysname='event3')
+	fake.push(EventType.DEVICE_ADDED, device)
+	fake.push(EventType.KEYBOARD_KEY, device, 1500, key=30,
+		key_state=KeyState.PRESSED, seat_key_count=1)
+	for event in _events(fake, li, 2):
+		assert publisher.publish(event)
+	added, key = reader.read()
+	assert added.type == EventType.DEVICE_ADDED
+	assert added.sysname == 'event3'
+	assert key.type == EventType.KEYBOARD_KEY
+	assert key.device == added.device
+	assert (key.time, key.key, key.key_state) == (1500, 30, 1)
+	assert reader.read() == []
+	assert publisher.readers == {os.getpid(): 0}
+	reader.close()
+
+
+def test_late_reader_learns_existing_devices(fake, li, publisher):
+
+	first, second = fake.add_device('event1'), fake.add_device('event2')
+	fake.push(EventType.DEVICE_ADDED, first)
+	fake.push(EventType.DEVICE_ADDED, second)
+	fake.push(EventType.DEVICE_REMOVED, first)
+	for event in _events(fake, li, 3):
+		publisher.publish(event)
+	reader = RingReader(publisher.name)
+	assert list(reader.devices.values()) == ['event2']
+	records = reader.read()
+	assert [(record.type, record.sysname, record.time)
+		for record in records] == [(EventType.DEVICE_ADDED, 'event2', 0)]
+	assert reader.read() == []
+	fake.push(EventType.DEVICE_ADDED, first)
+	publisher.publish(_events(fake, li, 1)[0])
+	assert [record.sysname for record in reader.read()] == ['event1']
+	assert sorted(reader.devices.values()) == ['event1', 'event2']
+	reader.close()
+
+
+def test_skip_discards_events_for_slow_readers(fake, li):
+
+	publisher = RingPublisher(capacity=2, policy=OverflowPolicy.SKIP)
+	reader = RingReader(publisher.name)
+	device = fake.add_device()
+	for time in range(3):
+		fake.push(EventType.KEYBOARD_KEY, device, time,
+			key_state=KeyState.PRESSED)
+	assert [publisher.publish(event)
+		for event in _events(fake, li, 3)] == [True, True, False]
+	assert reader.dropped == publisher.dropped == 1
+	assert [record.time for record in reader.read()] == [0, 1]
+	reader.close()
+	publisher.close()
+
+
+def test_overwrite_counts_lost_events(fake, li, publisher):
+
+	reader = RingReader(publisher.name)
+	device = fake.add_device()
+	for time in range(6):
+		fake.push(EventType.KEYBOARD_KEY, device, time,
+			key_state=KeyState.PRESSED)
+	for event in _events(fake, li, 6):
+		publisher.publish(event)
+	assert [record.time for record in reader.read()] == [2, 3, 4, 5]
+	assert reader.lost == 2
+	reader.close()
+
+
+def test_blocking_policies_are_rejected():
+
+	with pytest.raises(ValueError):
+		RingPublisher(policy=OverflowPolicy.BLOCK)
+
+
+def test_close_removes_the_lock_file():
+
+	publisher = RingPublisher(capacity=1)
+	RingReader(publisher.name).close()
+	path = _lock_path(publisher.name)
+	assert os.path.exists(path)
+	publisher.close()
+	assert not os.path.exists(path)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from libinput.constant import EventType, PointerAxis
+from libinput.scroll import ScrollAccumulator
+
+
+_vertical = PointerAxis.SCROLL_VERTICAL.value
+
+
+def _feed(li, accumulator, count):
+
+	events = li.events
+	for _ in range(count):
+		accumulator.feed(next(events))
+
+
+def _wheel(fake, device, v120, time=0):
+
+	fake.push(EventType.POINTER_SCROLL_WHEEL, device, time,
+		has_axis={_vertical: 1}, scroll_value={_vertical: v120 / 8.0},
+		scroll_value_v120={_vertical: v120})
+
+
+def _finger(fake, device, value, time=0):
+
+	fake.push(EventType.POINTER_SCROLL_FINGER, device, time,
+		has_axis={_vertical: 1}, scroll_value={_vertical: value})
+
+
+def test_high_resolution_wheels_scroll_partial_clicks(fake, li):
+
+	device = fake.add_device(sysname='event6')
+	accumulator = ScrollAccumulator(lines_per_click=3)
+	for _ in range(2):
+		_wheel(fake, device, 30)
+	_feed(li, accumulator, 2)
+	steps, = accumulator.take()
+	assert (steps.device, steps.source) == (
+		'event6', EventType.POINTER_SCROLL_WHEEL)
+	assert (steps.dy, steps.lines_y, steps.lines_x) == (7.5, 1, 0)
+	for _ in range(2):
+		_wheel(fake, device, 30)
+	_feed(li, accumulator, 2)
+	assert accumulator.take()[0].lines_y == 2
+	_wheel(fake, device, -120)
+	_feed(li, accumulator, 1)
+	assert accumulator.take()[0].lines_y == -3
+	assert accumulator.take() == []
+
+
+def test_finger_scrolling_rounds_only_whole_lines(fake, li):
+
+	device = fake.add_device()
+	accumulator = ScrollAccumulator(line_height=10.0, lines_per_page=2)
+	for _ in range(30):
+		_finger(fake, device, 0.1)
+	_feed(li, accumulator, 30)
+	assert accumulator.take()[0].lines_y == 0
+	for _ in range(70):
+		_finger(fake, device, 0.1)
+	_finger(fake, device, 25.0)
+	_finger(fake, device, 0.0)
+	_feed(li, accumulator, 72)
+	steps, = accumulator.take()
+	assert (steps.lines_y, steps.pages_y, steps.stopped) == (3, 1, True)
+
+
+def test_tiny_finger_movements_add_up(fake, li):
+
+	device = fake.add_device()
+	accumulator = ScrollAccumulator(line_height=0.5)
+	for _ in range(1024):
+		_finger(fake, device, 1 / 2048.0)
+	_feed(li, accumulator, 1024)
+	assert accumulator.take()[0].lines_y == 1
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import os
+import stat
+import pytest
+from libinput.constant import ButtonState, EventType, KeyState
+from libinput.serve import Client, Server, default_path
+
+
+def test_default_path_requires_a_runtime_directory(monkeypatch):
+
+	monkeypatch.setenv('XDG_RUNTIME_DIR', '/run/user/1000')
+	assert default_path() == '/run/user/1000/libinput.sock'
+	monkeypatch.delenv('XDG_RUNTIME_DIR')
+	with pytest.raises(RuntimeError):
+		default_path()
+
+
+def test_socket_is_private_and_existing_paths_are_kept(li, tmp_path):
+
+	path = str(tmp_path / 'libinput.sock')
+	server = Server(path, li)
+	assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+	with pytest.raises(OSError):
+		Server(path, li)
+	server.close()
+	assert not os.path.exists(path)
+	open(path, 'w').close()
+	with pytest.raises(OSError):
+		Server(path, li)
+	assert os.path.exists(path)
+
+
+def test_close_keeps_a_replaced_socket(li, tmp_path):
+
+	path = str(tmp_path / 'libinput.sock')
+	server = Server(path, li)
+	os.unlink(path)
+	other = Server(path, li)
+	server.close()
+	assert os.path.exists(path)
+	other.close()
+
+
+def test_subscribers_receive_present_devices_and_events(fake, li, tmp_path):
+
+	path = str(tmp_path / 'libinput.sock')
+	server = Server(path, li)
+	device = fake.add_device(sysname='event4')
+	fake.push(EventType.DEVICE_ADDED, device)
+	server.serve_once(0)
+	client = Client(path, [EventType.KEYBOARD_KEY])
+	# Accept, then read the filter.
+	server.serve_once(0)
+	server.serve_once(0)
+	added, = client.read()
+	assert (added.type, added.sysname) == (EventType.DEVICE_ADDED, 'event4')
+	fake.push(EventType.POINTER_BUTTON, device, 1,
+		button_state=ButtonState.PRESSED)
+	fake.push(EventType.KEYBOARD_KEY, device, 2, key=30,
+		key_state=KeyState.PRESSED)
+	server.serve_once(0)
+	key, = client.read()
+	assert (key.type, key.device, key.key) == (
+		EventType.KEYBOARD_KEY, added.device, 30)
+	client.close()
+	server.close()
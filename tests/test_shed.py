@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+try:
+	from time import monotonic
+except ImportError:
+	from monotonic import monotonic
+from libinput.constant import EventType, KeyState, PointerAxis
+from libinput.record import Encoder, decode_many
+from libinput.scroll import ScrollAccumulator
+
+
+_vertical = PointerAxis.SCROLL_VERTICAL.value
+
+
+def _now():
+
+	return int(monotonic() * 1e6)
+
+
+def _wheel(fake, device, v120, time=0):
+
+	fake.push(EventType.POINTER_SCROLL_WHEEL, device, time,
+		has_axis={_vertical: 1}, scroll_value={_vertical: v120 / 8.0},
+		scroll_value_v120={_vertical: v120})
+
+
+def _motion(fake, device, time=0):
+
+	fake.push(EventType.POINTER_MOTION, device, time, dx=1.0, dy=1.0)
+
+
+def _key(fake, device, key, time=0):
+
+	fake.push(EventType.KEYBOARD_KEY, device, time, key=key,
+		key_state=KeyState.PRESSED)
+
+
+def test_coalesced_wheel_events_keep_their_sum(fake, li):
+
+	device = fake.add_device(sysname='event3')
+	li.enable_shedding()
+	for _ in range(3):
+		_wheel(fake, device, 120)
+	event, = li.dispatch()
+	assert event.coalesced == 2
+	assert event.get_scroll_value(PointerAxis.SCROLL_VERTICAL) == 45
+	assert event.get_scroll_value_v120(PointerAxis.SCROLL_VERTICAL) == 360
+	assert li.shedder.coalesced == 2
+	record, = decode_many(Encoder().encode_many([event]))
+	assert (record.vertical, record.vertical_discrete) == (45, 360)
+	assert not record.has_horizontal
+	accumulator = ScrollAccumulator(lines_per_click=3)
+	accumulator.feed(event)
+	steps, = accumulator.take()
+	assert (steps.dy, steps.lines_y) == (45, 9)
+
+
+def test_wheel_events_of_other_devices_are_not_coalesced(fake, li):
+
+	first, second = fake.add_device('event3'), fake.add_device('event4')
+	li.enable_shedding()
+	for device in (first, second, first):
+		_wheel(fake, device, 120)
+	events = li.dispatch()
+	assert [event.coalesced for event in events] == [0, 0, 0]
+	assert li.shedder.coalesced == 0
+
+
+def test_late_motion_is_dropped_and_keys_delivered(fake, li):
+
+	device = fake.add_device()
+	li.enable_shedding(max_age=60)
+	_motion(fake, device)
+	_key(fake, device, 30)
+	_motion(fake, device)
+	_motion(fake, device, _now())
+	events = li.dispatch()
+	assert [event.type for event in events] == [
+		EventType.KEYBOARD_KEY, EventType.POINTER_MOTION]
+	assert (li.shedder.dropped, li.shedder.lagging) == (2, 2)
+
+
+def test_backlog_sheds_motion_until_the_queue_runs_empty(fake, li):
+
+	device = fake.add_device()
+	li.enable_shedding(max_age=60, max_backlog=1)
+	for _ in range(3):
+		_motion(fake, device, _now())
+	assert len(li.dispatch()) == 1
+	assert li.shedder.dropped == 2
+	_motion(fake, device, _now())
+	assert len(li.dispatch()) == 1
+	assert li.shedder.dropped == 2
+
+
+def test_dispatch_counts_shed_events(fake, li):
+
+	device = fake.add_device()
+	li.enable_metrics()
+	li.enable_shedding(max_age=60)
+	_motion(fake, device)
+	for _ in range(3):
+		_wheel(fake, device, 120)
+	li.dispatch()
+	metrics = li.metrics
+	assert metrics['libinput_events_dropped_total'].get(('shed',)) == 1
+	assert metrics['libinput_events_coalesced_total'].get(()) == 2
+	assert metrics['libinput_events_lagging_total'].get(()) == 4
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from libinput.simplify import DouglasPeuckerSimplifier, RadialSimplifier
+from libinput.simplify import _distance2
+
+
+def test_radial_keeps_first_last_and_distant_points():
+
+	points = [(0.0, 0.0, 'a'), (0.5, 0.0, 'b'), (1.0, 0.0, 'c'),
+		(1.2, 0.0, 'd'), (1.4, 0.0, 'e')]
+	kept = list(RadialSimplifier(1.0).simplify(points))
+	assert [point[2] for point in kept] == ['a', 'c', 'e']
+
+
+def test_radial_flush_starts_a_new_path():
+
+	simplifier = RadialSimplifier(1.0)
+	assert simplifier.feed((0.0, 0.0)) == [(0.0, 0.0)]
+	assert simplifier.feed((0.1, 0.0)) == []
+	assert simplifier.flush() == [(0.1, 0.0)]
+	assert simplifier.flush() == []
+	assert simplifier.feed((0.2, 0.0)) == [(0.2, 0.0)]
+
+
+def test_douglas_peucker_keeps_corners_within_tolerance():
+
+	path = [(float(x), 0.0) for x in range(10)] \
+		+ [(9.0, float(y)) for y in range(1, 10)]
+	for window in (3, 5, 64):
+		kept = list(DouglasPeuckerSimplifier(0.5, window).simplify(path))
+		assert kept[0] == (0.0, 0.0)
+		assert kept[-1] == (9.0, 9.0)
+		assert (9.0, 0.0) in kept
+		for point in path:
+			assert min(_distance2(point, start, end)
+				for start, end in zip(kept, kept[1:])) <= 0.25
+	assert list(DouglasPeuckerSimplifier(0.5).simplify(path)) == [
+		(0.0, 0.0), (9.0, 0.0), (9.0, 9.0)]
+
+
+def test_douglas_peucker_releases_points_a_window_at_a_time():
+
+	simplifier = DouglasPeuckerSimplifier(0.1, window=4)
+	released = [simplifier.feed((float(x), float(x % 2))) for x in range(7)]
+	assert [len(points) for points in released] == [0, 0, 0, 3, 0, 0, 3]
+	assert simplifier.flush() == [(6.0, 0.0)]
+	assert simplifier.flush() == []
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+from libinput.constant import EventType, TabletToolAxis, TabletToolTipState
+from libinput.stroke import StrokeRecorder
+
+
+_down, _up = TabletToolTipState.DOWN, TabletToolTipState.UP
+
+
+def _strokes(fake, li, recorder, count):
+
+	events = li.events
+	return list(recorder.strokes(next(events) for _ in range(count)))
+
+
+def test_stroke_spans_tip_down_to_tip_up(fake, li):
+
+	device = fake.add_device()
+	fake.push(EventType.TABLET_TOOL_AXIS, device, 0, tool=1, x=0.5,
+		tip_state=_up)
+	fake.push(EventType.TABLET_TOOL_TIP, device, 10, tool=1, x=1.0,
+		pressure=0.25, tip_state=_down, pressure_has_changed=1)
+	fake.push(EventType.TABLET_TOOL_AXIS, device, 20, tool=1, x=2.0,
+		pressure=0.5, tip_state=_down, x_has_changed=1,
+		pressure_has_changed=1)
+	fake.push(EventType.TABLET_TOOL_AXIS, device, 30, tool=1, x=2.0,
+		pressure=0.5, tip_state=_down)
+	fake.push(EventType.TABLET_TOOL_TIP, device, 40, tool=1, x=3.0,
+		tip_state=_up)
+	recorder = StrokeRecorder()
+	stroke, = _strokes(fake, li, recorder, 5)
+	assert stroke.complete
+	assert len(stroke) == 4
+	assert stroke.duration == 30
+	assert list(stroke.x) == [1.0, 2.0, 2.0, 3.0]
+	assert list(stroke.pressure) == [0.25, 0.5, 0.5, 0.0]
+	assert list(stroke.changed) == [TabletToolAxis.PRESSURE.value,
+		TabletToolAxis.X.value | TabletToolAxis.PRESSURE.value, 0, 0]
+	assert recorder.active == 0
+
+
+def test_changed_only_skips_idle_samples(fake, li):
+
+	device = fake.add_device()
+	fake.push(EventType.TABLET_TOOL_TIP, device, 10, tool=1, tip_state=_down)
+	fake.push(EventType.TABLET_TOOL_AXIS, device, 20, tool=1,
+		tip_state=_down)
+	fake.push(EventType.TABLET_TOOL_TIP, device, 30, tool=1, tip_state=_up)
+	stroke, = _strokes(fake, li, StrokeRecorder(changed_only=True), 3)
+	assert list(stroke.time) == [10, 30]
+
+
+def test_tools_are_tracked_separately(fake, li):
+
+	device = fake.add_device()
+	fake.push(EventType.TABLET_TOOL_TIP, device, 10, tool=1, tip_state=_down)
+	fake.push(EventType.TABLET_TOOL_TIP, device, 20, tool=2, tip_state=_down)
+	fake.push(EventType.TABLET_TOOL_PROXIMITY, device, 30, tool=2,
+		tip_state=_down)
+	fake.push(EventType.KEYBOARD_KEY, device, 35)
+	fake.push(EventType.TABLET_TOOL_TIP, device, 40, tool=1, tip_state=_up)
+	recorder = StrokeRecorder()
+	incomplete, complete = _strokes(fake, li, recorder, 5)
+	assert not incomplete.complete
+	assert list(incomplete.time) == [20, 30]
+	assert complete.complete
+	assert list(complete.time) == [10, 40]
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+from __future__ import absolute_import
+import libinput.transform
+from libinput.constant import EventType
+from libinput.transform import Output, Transform
+
+
+def _pairs(x, y):
+
+	return [(float(x_), float(y_)) for x_, y_ in zip(x, y)]
+
+
+def test_identity_scales_to_the_output():
+
+	transform = Transform((100.0, 50.0))
+	x, y = transform.apply([0.0, 50.0, 100.0], [0.0, 25.0, 50.0],
+		(1920, 1080))
+	assert _pairs(x, y) == [(0.0, 0.0), (960.0, 540.0), (1920.0, 1080.0)]
+
+
+def test_matrix_and_output_offset_are_folded_in():
+
+	# Rotate by 90 degrees clockwise in normalized coordinates.
+	transform = Transform((100.0, 50.0), (0.0, -1.0, 1.0, 1.0, 0.0, 0.0))
+	x, y = transform.apply([100.0, 0.0], [0.0, 50.0],
+		Output(1920, 0, 1280, 1024))
+	assert _pairs(x, y) == [(3200.0, 1024.0), (1920.0, 0.0)]
+	(first, second), = [_pairs(*pair) for pair in transform.apply_outputs(
+		[100.0, 0.0], [0.0, 50.0], [Output(1920, 0, 1280, 1024)])]
+	assert [first, second] == _pairs(x, y)
+
+
+def test_lists_are_returned_without_numpy(monkeypatch):
+
+	monkeypatch.setattr(libinput.transform, 'numpy', None)
+	x, y = Transform((10.0, 10.0)).apply((5.0,), (10.0,), (100, 200))
+	assert (x, y) == ([50.0], [200.0])
+
+
+def test_from_device_uses_the_device_size(fake, li):
+
+	device = fake.add_device(size=(200.0, 100.0))
+	fake.push(EventType.DEVICE_ADDED, device)
+	event = next(li.events)
+	transform = Transform.from_device(event.device)
+	assert transform.coefficients((400, 400)) == (
+		2.0, 0.0, 0.0, 0.0, 4.0, 0.0)